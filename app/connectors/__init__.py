@@ -0,0 +1,20 @@
+"""数据源拉取连接器模块"""
+from .base import PullConnector
+from .github import GitHubEventsConnector
+from .calendar import CalendarConnector
+from .screen import ScreenTimeConnector
+
+# 连接器类型到实现类的映射
+CONNECTOR_TYPES = {
+    GitHubEventsConnector.kind: GitHubEventsConnector,
+    CalendarConnector.kind: CalendarConnector,
+    ScreenTimeConnector.kind: ScreenTimeConnector,
+}
+
+__all__ = [
+    "PullConnector",
+    "GitHubEventsConnector",
+    "CalendarConnector",
+    "ScreenTimeConnector",
+    "CONNECTOR_TYPES",
+]
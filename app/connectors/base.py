@@ -0,0 +1,166 @@
+"""拉取连接器基类"""
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, ClassVar, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from ..models.connector import ConnectorConfig, ConnectorKind, ConnectorStatus
+
+# 单次轮询最多跟随的分页数
+MAX_PAGES = 10
+
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """解析 ISO 时间 (兼容 Z 后缀与 {"dateTime": ...} 结构)，统一为本地无时区时间"""
+    if isinstance(value, dict):
+        value = value.get("dateTime") or value.get("date")
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def format_time(value: datetime) -> str:
+    """格式化为带 UTC 偏移的 RFC 3339 时间 (无时区的时间按本地时间处理)"""
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class PullConnector(ABC):
+    """
+    拉取连接器基类
+
+    每次轮询只获取增量数据 (游标参数与 ETag/Last-Modified 条件请求)，
+    合并到滚动窗口缓存后汇总为对应的数据输入模型；
+    全部分页成功后才合并数据并更新游标与条件请求头，任一页失败时下次轮询完整重试
+    """
+
+    kind: ClassVar[ConnectorKind]
+    # 对应 CognitiveLoadAggregator.update_<source>_data
+    source: ClassVar[str]
+
+    def __init__(self, config: ConnectorConfig):
+        self.config = config
+        self.cursor: Optional[str] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.poll_interval = config.interval_seconds
+        self.polls = 0
+        self.not_modified = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_polled_at: Optional[datetime] = None
+        self.last_success_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def window(self) -> timedelta:
+        return timedelta(hours=self.config.window_hours)
+
+    @abstractmethod
+    def request_params(self, now: datetime) -> Dict[str, str]:
+        """本次轮询的增量查询参数"""
+
+    def next_page_params(self, payload: Any) -> Optional[Dict[str, str]]:
+        """下一页的查询参数，没有更多分页时返回 None"""
+        return None
+
+    @abstractmethod
+    def ingest(self, payload: Any, now: datetime) -> None:
+        """将一页增量数据合并到缓存并推进游标"""
+
+    @abstractmethod
+    def summarize(self, now: datetime) -> BaseModel:
+        """汇总滚动窗口内的数据"""
+
+    @property
+    @abstractmethod
+    def cached_items(self) -> int:
+        """缓存中的条目数"""
+
+    def observe_headers(self, headers: httpx.Headers) -> None:
+        """根据响应头调整轮询节奏 (默认不处理)"""
+
+    def reset_cursor(self) -> bool:
+        """
+        增量游标已失效 (410 Gone) 时调用
+
+        返回 True 表示已放弃游标与缓存，由本次轮询改为完整同步；默认不处理
+        """
+        return False
+
+    async def poll(self, client: httpx.AsyncClient, now: datetime) -> BaseModel:
+        """轮询一次数据源，返回滚动窗口汇总 (304 时仅根据缓存重新汇总)"""
+        self.polls += 1
+        self.last_polled_at = now
+
+        headers = {"Accept": "application/json"}
+        if self.config.token:
+            headers["Authorization"] = f"Bearer {self.config.token}"
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        base_params = {**self.config.params, **self.request_params(now)}
+        params: Optional[Dict[str, str]] = base_params
+        pages: List[Any] = []
+        etag, last_modified = self.etag, self.last_modified
+        while params is not None and len(pages) < MAX_PAGES:
+            response = await client.get(self.config.url, params=params, headers=headers)
+            if response.status_code == 304:
+                self.not_modified += 1
+                break
+            if response.status_code == 410 and not pages and self.reset_cursor():
+                # 游标失效，不带条件请求头完整重新同步
+                headers.pop("If-None-Match", None)
+                headers.pop("If-Modified-Since", None)
+                etag = last_modified = None
+                base_params = {**self.config.params, **self.request_params(now)}
+                params = base_params
+                continue
+            response.raise_for_status()
+            if not pages:
+                etag = response.headers.get("etag", etag)
+                last_modified = response.headers.get("last-modified", last_modified)
+                self.observe_headers(response.headers)
+                # 条件请求头只用于首页
+                headers.pop("If-None-Match", None)
+                headers.pop("If-Modified-Since", None)
+            payload = response.json()
+            pages.append(payload)
+            next_params = self.next_page_params(payload)
+            params = {**base_params, **next_params} if next_params is not None else None
+
+        # 分页未取完时不保存条件请求头，避免下次轮询因 304 漏掉剩余分页
+        if params is None:
+            self.etag, self.last_modified = etag, last_modified
+        for payload in pages:
+            self.ingest(payload, now)
+        self.consecutive_failures = 0
+        self.last_success_at = now
+        return self.summarize(now)
+
+    def record_failure(self, error: str) -> None:
+        """记录一次失败"""
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+
+    def get_status(self) -> ConnectorStatus:
+        """获取配置及轮询状态"""
+        return ConnectorStatus(
+            **self.config.model_dump(),
+            cursor=self.cursor,
+            etag=self.etag,
+            cached_items=self.cached_items,
+            polls=self.polls,
+            not_modified=self.not_modified,
+            failures=self.failures,
+            last_polled_at=self.last_polled_at,
+            last_success_at=self.last_success_at,
+            last_error=self.last_error
+        )
@@ -0,0 +1,104 @@
+"""屏幕使用时间连接器"""
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, NamedTuple, Optional
+
+from ..models.connector import ConnectorKind
+from ..models.data_input import ScreenTimeData
+from .base import PullConnector, format_time, parse_time
+
+# 间隔短于该时长的活动视为同一段连续使用
+BREAK_GAP = timedelta(minutes=5)
+# 超过该时长的连续使用计为一次无休息使用
+LONG_SESSION = timedelta(hours=1)
+
+
+class _Interval(NamedTuple):
+    start: datetime
+    end: datetime
+    app: str
+
+
+class ScreenTimeConnector(PullConnector):
+    """
+    屏幕使用活动连接器
+
+    轮询采集端的活动接口: GET url?since=<游标>，响应为
+    {"items": [{"start", "end", "app"}], "cursor": "...", "has_more": false}；
+    游标为服务端返回的不透明字符串，未返回时使用最后一条活动的结束时间
+    """
+
+    kind = ConnectorKind.SCREEN
+    source = "screen"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._intervals: Deque[_Interval] = deque()
+
+    def request_params(self, now: datetime) -> Dict[str, str]:
+        return {"since": self.cursor or format_time(now - self.window)}
+
+    def next_page_params(self, payload: Any) -> Optional[Dict[str, str]]:
+        if payload.get("has_more") and payload.get("cursor"):
+            return {"since": payload["cursor"]}
+        return None
+
+    def ingest(self, payload: Any, now: datetime) -> None:
+        fresh = []
+        for item in payload.get("items", ()):
+            start = parse_time(item.get("start"))
+            end = parse_time(item.get("end"))
+            if start is not None and end is not None and end > start:
+                fresh.append(_Interval(start, end, str(item.get("app", ""))))
+        fresh.sort()
+        self._intervals.extend(fresh)
+
+        cursor = payload.get("cursor")
+        if cursor:
+            self.cursor = str(cursor)
+        elif fresh:
+            self.cursor = format_time(fresh[-1].end)
+
+    def summarize(self, now: datetime) -> ScreenTimeData:
+        window_start = now - self.window
+        while self._intervals and self._intervals[0].end < window_start:
+            self._intervals.popleft()
+
+        intervals = sorted(
+            _Interval(max(i.start, window_start), min(i.end, now), i.app)
+            for i in self._intervals
+            if i.start < now and i.end > window_start
+        )
+        active_seconds = 0.0
+        covered_until = window_start
+        long_sessions = 0
+        app_switches = 0
+        session_start = session_end = None
+        previous_app = None
+        for interval in intervals:
+            # 重叠的活动只计算一次
+            if interval.end > covered_until:
+                active_seconds += (interval.end - max(interval.start, covered_until)).total_seconds()
+                covered_until = interval.end
+            if session_end is None or interval.start - session_end > BREAK_GAP:
+                if session_end is not None and session_end - session_start >= LONG_SESSION:
+                    long_sessions += 1
+                session_start = interval.start
+            session_end = max(session_end or interval.end, interval.end)
+            if previous_app is not None and interval.app != previous_app:
+                app_switches += 1
+            previous_app = interval.app
+        if session_end is not None and session_end - session_start >= LONG_SESSION:
+            long_sessions += 1
+
+        return ScreenTimeData(
+            active_hours=active_seconds / 3600,
+            continuous_sessions=max(1, long_sessions),
+            app_switches=app_switches,
+            period_hours=self.config.window_hours,
+            timestamp=now
+        )
+
+    @property
+    def cached_items(self) -> int:
+        return len(self._intervals)
@@ -1,4 +1,5 @@
 """核心配置模块"""
+from . import clock
 from .config import settings
 
-__all__ = ["settings"]
+__all__ = ["clock", "settings"]
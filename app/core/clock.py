@@ -0,0 +1,85 @@
+"""
+可注入时钟
+
+服务与模型通过 clock.now() / clock.monotonic() 获取时间，而不直接调用 datetime.now()；
+测试与模拟可用 set_clock() 换成 ManualClock，以加速时间推进一整个工作日
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Union
+
+
+class Clock:
+    """系统时钟"""
+
+    def now(self) -> datetime:
+        """当前本地时间 (无时区)"""
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        """单调时间(秒)，用于计算间隔"""
+        return time.monotonic()
+
+
+class ManualClock(Clock):
+    """手动推进的时钟 - 时间只在调用 advance()/set() 时变化"""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self._now = start or datetime.now()
+        self._monotonic = 0.0
+
+    def now(self) -> datetime:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._monotonic
+
+    def advance(self, delta: Union[float, timedelta]) -> datetime:
+        """向前推进 (秒数或 timedelta)，返回推进后的时间"""
+        if not isinstance(delta, timedelta):
+            delta = timedelta(seconds=delta)
+        if delta < timedelta(0):
+            raise ValueError("时钟不能回拨")
+        self._now += delta
+        self._monotonic += delta.total_seconds()
+        return self._now
+
+    def set(self, value: datetime) -> None:
+        """设置为指定时间 (不早于当前时间)"""
+        self.advance(value - self._now)
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    """获取当前时钟"""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """替换当前时钟，返回原时钟"""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """在上下文内使用指定时钟"""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+
+def now() -> datetime:
+    """当前时钟的时间 (可作为模型字段的 default_factory)"""
+    return _clock.now()
+
+
+def monotonic() -> float:
+    """当前时钟的单调时间"""
+    return _clock.monotonic()
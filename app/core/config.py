@@ -1,6 +1,7 @@
 """应用配置模块"""
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -24,15 +25,77 @@ class Settings(BaseSettings):
     fatigue_duration_factor: float = Field(default=0.1, description="持续工作时间疲劳因子")
     fatigue_critical_threshold: float = Field(default=80.0, description="疲劳危险阈值")
     
+    # 评分配置热更新 (JSON 文件，字段同上，修改后自动重载)
+    scoring_config_file: Optional[str] = Field(default=None, description="评分配置文件路径 (为空时不监视)")
+    scoring_watch_interval_seconds: float = Field(default=5.0, gt=0, description="评分配置文件检查间隔(秒)")
+    scoring_refresh_batch: int = Field(default=1000, gt=0, description="配置切换后后台每批重算的用户数")
+    scoring_refresh_interval_seconds: float = Field(default=1.0, gt=0, description="后台重算任务的空闲检查间隔(秒)")
+    
     # Webhook 配置
     webhook_timeout: float = Field(default=10.0, description="Webhook 请求超时时间(秒)")
     webhook_retry_count: int = Field(default=3, description="Webhook 重试次数")
+    circuit_failure_threshold: int = Field(default=5, ge=1, description="熔断器打开前的连续失败次数")
+    circuit_recovery_seconds: float = Field(default=30.0, gt=0, description="熔断器打开后的探测间隔(秒)")
+    circuit_half_open_max_calls: int = Field(default=1, ge=1, description="半开状态允许的探测请求数")
+    
+    # 干预投递通道参数 (按紧急程度 critical/high/medium/low 分通道)
+    delivery_lane_workers: Dict[str, int] = Field(
+        default={"critical": 4, "high": 2, "medium": 2, "low": 1},
+        description="各投递通道的工作协程数量"
+    )
+    delivery_lane_queue_limits: Dict[str, int] = Field(
+        default={"critical": 1000, "high": 1000, "medium": 500, "low": 200},
+        description="各投递通道的队列长度上限"
+    )
+    delivery_critical_slo_ms: float = Field(default=500.0, gt=0, description="critical 通道排队延迟目标(毫秒)")
     
     # 恢复建议参数
     short_break_duration: int = Field(default=5, description="短休息时长(分钟)")
     medium_break_duration: int = Field(default=15, description="中等休息时长(分钟)")
     long_break_duration: int = Field(default=30, description="长休息时长(分钟)")
     
+    # 分布统计参数
+    distribution_bucket_minutes: int = Field(default=60, gt=0, description="分位数草图时间桶长度(分钟)")
+    distribution_retention_buckets: int = Field(default=168, gt=0, description="保留的时间桶数量")
+    distribution_relative_accuracy: float = Field(default=0.01, gt=0, lt=1, description="分位数相对误差")
+    
+    # 历史存储参数
+    history_file: Optional[str] = Field(default=None, description="精力历史 NDJSON 文件路径 (为空时仅保存在内存)")
+    history_max_records: int = Field(default=10000, gt=0, description="内存中保留的历史记录数量")
+    history_flush_interval_seconds: float = Field(default=1.0, gt=0, description="历史文件定期刷新间隔(秒)")
+    history_buffer_bytes: int = Field(default=65536, gt=0, description="历史文件写缓冲大小(字节)")
+    
+    # 状态快照参数
+    snapshot_path: Optional[str] = Field(default=None, description="状态快照文件路径 (为空时不启用快照)")
+    snapshot_interval_seconds: float = Field(default=300.0, gt=0, description="定期快照间隔(秒)")
+    
+    # 数据连接器参数
+    connector_max_connections: int = Field(default=10, gt=0, description="连接器共享连接池的最大连接数")
+    connector_max_keepalive: int = Field(default=5, ge=0, description="连接器共享连接池的最大空闲连接数")
+    connector_timeout: float = Field(default=10.0, gt=0, description="连接器请求超时时间(秒)")
+    
+    # 准入控制参数
+    ingest_rate_per_second: float = Field(default=20.0, gt=0, description="每个采集端的写入速率(次/秒)")
+    ingest_burst: float = Field(default=40.0, ge=1, description="每个采集端允许的突发写入数")
+    max_concurrent_requests: int = Field(default=128, gt=0, description="全局并发请求上限")
+    read_reserved_slots: int = Field(default=32, ge=0, description="为状态查询预留的并发槽位")
+    admission_max_keys: int = Field(default=100000, gt=0, description="追踪的采集端数量上限")
+    ingest_max_clock_skew_seconds: float = Field(default=300.0, ge=0, description="写入记录时间戳允许超前服务端时间的秒数")
+    ingest_max_record_age_seconds: float = Field(default=7 * 86400.0, gt=0, description="写入记录时间戳允许早于服务端时间的秒数")
+    ingest_max_body_bytes: int = Field(default=8 * 1024 * 1024, gt=0, description="写入请求体 (解压后) 的大小上限(字节)")
+    
+    # 原始活动事件参数
+    activity_queue_max_events: int = Field(default=200000, gt=0, description="事件队列中待处理事件数上限")
+    activity_max_batch: int = Field(default=5000, gt=0, description="单次提交的事件数上限")
+    activity_window_minutes: float = Field(default=240.0, gt=0, description="活动计数器的滚动窗口(分钟)")
+    activity_bucket_seconds: float = Field(default=300.0, gt=0, description="滚动计数器的时间桶长度(秒)")
+    
+    # 请求追踪与性能剖析参数
+    trace_sample_rate: float = Field(default=0.0, ge=0, le=1, description="请求追踪采样率 (0 为关闭)")
+    trace_max_traces: int = Field(default=200, gt=0, description="内存中保留的追踪记录数量")
+    trace_slow_ms: float = Field(default=200.0, ge=0, description="慢请求阈值(毫秒)，超过时单独保留")
+    profile_max_seconds: float = Field(default=60.0, gt=0, description="单次 CPU 剖析的最长时间(秒)")
+    
     class Config:
         env_prefix = "BURNOUT_"
         env_file = ".env"
@@ -0,0 +1,6 @@
+"""ASGI 中间件模块"""
+from .admission import AdmissionMiddleware
+from .decompression import DecompressionMiddleware
+from .tracing import TracingMiddleware
+
+__all__ = ["AdmissionMiddleware", "DecompressionMiddleware", "TracingMiddleware"]
@@ -0,0 +1,70 @@
+"""准入控制中间件 - 在解析请求体之前拒绝超额写入"""
+from urllib.parse import parse_qs
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..services.admission import AdmissionController, admission
+
+# 受准入控制的数据写入路径前缀
+INGEST_PREFIXES = ("/api/data/", "/api/events")
+
+# 不占用查询并发槽位的 GET 路径: 健康检查与文档、流式导出及长时间运行的管理接口
+# (它们会在整个响应期间占用槽位，挤占状态查询，且健康检查不应因负载而失败)
+READ_EXEMPT_PATHS = ("/", "/health", "/docs", "/redoc", "/openapi.json")
+READ_EXEMPT_PREFIXES = ("/docs/", "/api/export/", "/api/admin/")
+
+COLLECTOR_HEADER = b"x-collector-id"
+
+
+def _collector_key(scope: Scope) -> str:
+    """识别采集端: 优先使用 X-Collector-Id 请求头，其次 user_id 查询参数，最后客户端地址"""
+    for name, value in scope.get("headers", ()):
+        if name == COLLECTOR_HEADER:
+            return "collector:" + value.decode("latin-1")
+    query = scope.get("query_string", b"")
+    if b"user_id=" in query:
+        user_ids = parse_qs(query.decode("latin-1")).get("user_id")
+        if user_ids:
+            return "user:" + user_ids[0]
+    client = scope.get("client")
+    return "client:" + (client[0] if client else "unknown")
+
+
+class AdmissionMiddleware:
+    """准入控制中间件 - 写入请求限流与并发控制，查询请求优先"""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        if method == "POST" and path.startswith(INGEST_PREFIXES):
+            decision = self.controller.admit_ingest(_collector_key(scope))
+            release = self.controller.release_ingest
+        elif method == "GET" and path not in READ_EXEMPT_PATHS and not path.startswith(READ_EXEMPT_PREFIXES):
+            decision = self.controller.admit_read()
+            release = self.controller.release_read
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.admitted:
+            response = JSONResponse(
+                {"detail": decision.reason},
+                status_code=decision.status_code,
+                headers={"Retry-After": str(decision.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            release()
@@ -0,0 +1,113 @@
+"""请求解压中间件 - 透明解压 gzip/zstd 编码的写入请求体"""
+import zlib
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd 为可选依赖
+    zstandard = None
+
+# 支持解压的路径前缀
+DECOMPRESS_PREFIXES = ("/api/data/", "/api/events")
+
+
+class BodyTooLarge(ValueError):
+    """解压后的请求体超过上限"""
+
+
+def decompress(encoding: str, body: bytes, limit: int) -> bytes:
+    """按 Content-Encoding 解压请求体 (超过 limit 字节时抛出 BodyTooLarge)"""
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(wbits=47)  # 自动识别 gzip/zlib 头
+        data = decompressor.decompress(body, limit + 1)
+        if len(data) > limit or decompressor.unconsumed_tail:
+            raise BodyTooLarge(limit)
+        if not decompressor.eof:
+            raise ValueError("gzip 数据不完整")
+        return data
+    if encoding == "zstd":
+        if zstandard is None:
+            raise LookupError("服务端未安装 zstandard，不支持 zstd 编码")
+        parts = []
+        size = 0
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(body) as reader:
+                while chunk := reader.read(65536):
+                    size += len(chunk)
+                    if size > limit:
+                        raise BodyTooLarge(limit)
+                    parts.append(chunk)
+        except zstandard.ZstdError as e:
+            raise ValueError(str(e)) from e
+        return b"".join(parts)
+    raise LookupError(f"不支持的 Content-Encoding: {encoding}")
+
+
+class DecompressionMiddleware:
+    """
+    请求解压中间件
+
+    对带 Content-Encoding: gzip/zstd 的写入请求先读取并解压请求体，
+    再以未压缩的形式交给路由；解压后超过 ingest_max_body_bytes 时返回 413 (防止压缩炸弹)
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = settings.ingest_max_body_bytes):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(DECOMPRESS_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        headers = []
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                encoding = value.decode("latin-1").strip().lower()
+            elif name != b"content-length":
+                headers.append((name, value))
+        if encoding is None or encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        received = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            received += len(chunk)
+            if received > self.max_body_bytes:
+                await JSONResponse({"detail": "请求体过大"}, status_code=413)(scope, receive, send)
+                return
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+
+        try:
+            body = decompress(encoding, b"".join(chunks), self.max_body_bytes)
+        except BodyTooLarge:
+            await JSONResponse({"detail": "解压后的请求体过大"}, status_code=413)(scope, receive, send)
+            return
+        except LookupError as e:
+            await JSONResponse({"detail": str(e)}, status_code=415)(scope, receive, send)
+            return
+        except (ValueError, zlib.error) as e:
+            await JSONResponse({"detail": f"请求体解压失败: {e}"}, status_code=400)(scope, receive, send)
+            return
+
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        sent = False
+
+        async def receive_decompressed() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app({**scope, "headers": headers}, receive_decompressed, send)
@@ -0,0 +1,48 @@
+"""请求追踪中间件 - 为采样请求建立追踪上下文"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..services.tracing import Tracer, tracer
+
+# 参与追踪的路径前缀
+TRACED_PREFIXES = ("/api/",)
+
+TRACE_HEADER = b"x-trace-id"
+
+
+class TracingMiddleware:
+    """
+    请求追踪中间件
+
+    追踪覆盖请求处理与响应后的后台任务 (如干预检查与 Webhook 发送)，
+    被采样的响应带 X-Trace-Id 请求头，便于在 /api/admin/traces 中查找
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer = tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(TRACED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        trace = self.tracer.start(scope["method"], scope["path"])
+        if trace is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+                trace.response_ms = trace.elapsed_ms()
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (TRACE_HEADER, trace.trace_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        token = self.tracer.activate(trace)
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            self.tracer.finish(trace, token)
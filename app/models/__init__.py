@@ -1,15 +1,49 @@
 """数据模型模块"""
-from .data_input import GitHubData, CalendarData, ScreenTimeData
+from .data_input import GitHubData, CalendarData, ScreenTimeData, DataSource
 from .energy import EnergyState, FatigueIndex
-from .intervention import WebhookConfig, RecoverySchedule, InterventionEvent
+from .intervention import (
+    WebhookConfig,
+    WebhookStatus,
+    CircuitStatus,
+    RecoverySchedule,
+    InterventionEvent,
+    InterventionUrgency,
+    DeliveryLaneStatus,
+)
+from .team import TeamStatus, RollupConsistency, DistributionSummary
+from .connector import ConnectorKind, ConnectorConfig, ConnectorStatus
+from .user import UserOrder, UserStatusEntry, UserList
+from .scoring import ScoringConfig, ScoringConfigUpdate, ScoringConfigStatus
+from .activity import ActivityEventType, ActivityEvent, ActivityEventBatch, ActivityIntensity
 
 __all__ = [
     "GitHubData",
     "CalendarData", 
     "ScreenTimeData",
+    "DataSource",
     "EnergyState",
     "FatigueIndex",
     "WebhookConfig",
+    "WebhookStatus",
+    "CircuitStatus",
     "RecoverySchedule",
     "InterventionEvent",
+    "InterventionUrgency",
+    "DeliveryLaneStatus",
+    "TeamStatus",
+    "RollupConsistency",
+    "DistributionSummary",
+    "ConnectorKind",
+    "ConnectorConfig",
+    "ConnectorStatus",
+    "UserOrder",
+    "UserStatusEntry",
+    "UserList",
+    "ScoringConfig",
+    "ScoringConfigUpdate",
+    "ScoringConfigStatus",
+    "ActivityEventType",
+    "ActivityEvent",
+    "ActivityEventBatch",
+    "ActivityIntensity",
 ]
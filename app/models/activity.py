@@ -0,0 +1,48 @@
+"""原始活动事件模型"""
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from ..core import clock
+
+
+class ActivityEventType(str, Enum):
+    """活动事件类型枚举"""
+    FOCUS = "focus"                    # 焦点切换 (需提供 app)
+    HEARTBEAT = "heartbeat"            # 活跃心跳
+    COMMIT = "commit"                  # 提交
+    PULL_REQUEST = "pull_request"      # 创建 PR
+    CODE_REVIEW = "code_review"        # 代码审查
+    ISSUE_CLOSED = "issue_closed"      # 解决 Issue
+
+
+class ActivityEvent(BaseModel):
+    """原始活动事件模型"""
+    type: ActivityEventType = Field(..., description="事件类型")
+    user_id: str = Field(default="default", min_length=1, description="用户 ID")
+    team_id: Optional[str] = Field(default=None, description="所属团队 ID")
+    timestamp: datetime = Field(default_factory=clock.now, description="事件时间")
+    app: Optional[str] = Field(default=None, description="获得焦点的应用 (焦点切换事件)")
+    count: int = Field(default=1, ge=1, description="事件数量 (如一次推送包含的提交数)")
+
+
+class ActivityEventBatch(BaseModel):
+    """活动事件批量提交模型"""
+    events: List[ActivityEvent] = Field(..., description="事件列表")
+
+
+class ActivityIntensity(BaseModel):
+    """由滚动计数器按需推导的用户活动强度"""
+    user_id: str = Field(..., description="用户 ID")
+    window_minutes: float = Field(..., description="滚动窗口(分钟)")
+    commits_count: int = Field(default=0, ge=0, description="提交数量")
+    pull_requests: int = Field(default=0, ge=0, description="PR 数量")
+    code_reviews: int = Field(default=0, ge=0, description="代码审查数量")
+    issues_resolved: int = Field(default=0, ge=0, description="解决的 Issue 数量")
+    active_hours: float = Field(default=0, ge=0, description="活跃时间(小时)")
+    continuous_sessions: int = Field(default=1, ge=1, description="长时间无休息的连续使用次数")
+    app_switches: int = Field(default=0, ge=0, description="应用切换次数")
+    activity_intensity: float = Field(default=0, description="GitHub 活动强度 (0-100)")
+    screen_intensity: float = Field(default=0, description="屏幕使用强度 (0-100)")
+    last_event_at: Optional[datetime] = Field(default=None, description="最近一次事件时间")
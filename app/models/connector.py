@@ -0,0 +1,42 @@
+"""数据连接器模型"""
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+from uuid import UUID, uuid4
+from ..core import clock
+
+
+class ConnectorKind(str, Enum):
+    """连接器类型枚举"""
+    GITHUB = "github"         # GitHub 用户事件 (Events API)
+    CALENDAR = "calendar"     # 日历事件 (Google Calendar 兼容)
+    SCREEN = "screen"         # 屏幕使用活动
+
+
+class ConnectorConfig(BaseModel):
+    """数据连接器配置模型"""
+    id: UUID = Field(default_factory=uuid4, description="连接器 ID")
+    kind: ConnectorKind = Field(..., description="连接器类型")
+    user_id: str = Field(default="default", min_length=1, description="数据所属用户 ID")
+    team_id: Optional[str] = Field(default=None, description="所属团队 ID")
+    url: str = Field(..., description="数据源 API 地址")
+    token: Optional[str] = Field(default=None, exclude=True, description="访问令牌 (以 Bearer 方式发送，不会在响应中返回)")
+    params: Dict[str, str] = Field(default_factory=dict, description="附加查询参数")
+    interval_seconds: float = Field(default=300.0, ge=1, description="轮询间隔(秒)")
+    window_hours: float = Field(default=24.0, gt=0, description="汇总的滚动时间窗口(小时)")
+    enabled: bool = Field(default=True, description="是否启用")
+    created_at: datetime = Field(default_factory=clock.now, description="创建时间")
+
+
+class ConnectorStatus(ConnectorConfig):
+    """数据连接器配置及轮询状态"""
+    cursor: Optional[str] = Field(default=None, description="增量游标")
+    etag: Optional[str] = Field(default=None, description="最近一次响应的 ETag")
+    cached_items: int = Field(default=0, ge=0, description="滚动窗口内缓存的条目数")
+    polls: int = Field(default=0, ge=0, description="累计请求次数")
+    not_modified: int = Field(default=0, ge=0, description="返回 304 的次数")
+    failures: int = Field(default=0, ge=0, description="累计失败次数")
+    last_polled_at: Optional[datetime] = Field(default=None, description="最近一次轮询时间")
+    last_success_at: Optional[datetime] = Field(default=None, description="最近一次成功时间")
+    last_error: Optional[str] = Field(default=None, description="最近一次失败原因")
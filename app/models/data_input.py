@@ -1,7 +1,65 @@
 """数据输入模型"""
 from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel, Field
 from typing import Optional
+from ..core import clock
+
+
+class DataSource(str, Enum):
+    """数据源枚举"""
+    GITHUB = "github"
+    CALENDAR = "calendar"
+    SCREEN = "screen"
+
+
+def compute_activity_intensity(
+    commits_count: int,
+    pull_requests: int,
+    code_reviews: int,
+    issues_resolved: int,
+    period_hours: float
+) -> float:
+    """计算 GitHub 活动强度 (0-100)"""
+    # 加权计算各项活动的强度
+    base_score = (
+        commits_count * 2 +
+        pull_requests * 5 +
+        code_reviews * 3 +
+        issues_resolved * 2
+    )
+    # 归一化到 0-100，假设每小时 5 个活动单位为满负荷
+    max_expected = period_hours * 5
+    return min(100.0, (base_score / max_expected) * 100) if max_expected > 0 else 0
+
+
+def compute_meeting_intensity(
+    total_meeting_hours: float,
+    back_to_back_meetings: int,
+    period_hours: float
+) -> float:
+    """计算会议强度 (0-100)"""
+    # 会议时间占比
+    time_ratio = (total_meeting_hours / period_hours * 100) if period_hours > 0 else 0
+    # 连续会议惩罚
+    b2b_penalty = back_to_back_meetings * 5
+    return min(100.0, time_ratio + b2b_penalty)
+
+
+def compute_screen_intensity(
+    active_hours: float,
+    continuous_sessions: int,
+    app_switches: int,
+    period_hours: float
+) -> float:
+    """计算屏幕使用强度 (0-100)"""
+    # 使用时间占比
+    time_ratio = (active_hours / period_hours * 100) if period_hours > 0 else 0
+    # 连续使用惩罚 (每次无休息连续使用增加 10%)
+    continuous_penalty = (continuous_sessions - 1) * 10
+    # 频繁切换增加认知负荷
+    switch_penalty = min(20, app_switches / 10)
+    return min(100.0, time_ratio + continuous_penalty + switch_penalty)
 
 
 class GitHubData(BaseModel):
@@ -11,21 +69,15 @@ class GitHubData(BaseModel):
     code_reviews: int = Field(default=0, ge=0, description="代码审查数量")
     issues_resolved: int = Field(default=0, ge=0, description="解决的 Issue 数量")
     period_hours: float = Field(default=24.0, gt=0, description="统计周期(小时)")
-    timestamp: datetime = Field(default_factory=datetime.now, description="数据时间戳")
+    timestamp: datetime = Field(default_factory=clock.now, description="数据时间戳")
     
     @property
     def activity_intensity(self) -> float:
         """计算活动强度 (0-100)"""
-        # 加权计算各项活动的强度
-        base_score = (
-            self.commits_count * 2 +
-            self.pull_requests * 5 +
-            self.code_reviews * 3 +
-            self.issues_resolved * 2
+        return compute_activity_intensity(
+            self.commits_count, self.pull_requests, self.code_reviews,
+            self.issues_resolved, self.period_hours
         )
-        # 归一化到 0-100，假设每小时 5 个活动单位为满负荷
-        max_expected = self.period_hours * 5
-        return min(100.0, (base_score / max_expected) * 100) if max_expected > 0 else 0
 
 
 class CalendarData(BaseModel):
@@ -34,16 +86,14 @@ class CalendarData(BaseModel):
     total_meeting_hours: float = Field(..., ge=0, description="会议总时长(小时)")
     back_to_back_meetings: int = Field(default=0, ge=0, description="连续会议数量")
     period_hours: float = Field(default=24.0, gt=0, description="统计周期(小时)")
-    timestamp: datetime = Field(default_factory=datetime.now, description="数据时间戳")
+    timestamp: datetime = Field(default_factory=clock.now, description="数据时间戳")
     
     @property
     def meeting_intensity(self) -> float:
         """计算会议强度 (0-100)"""
-        # 会议时间占比
-        time_ratio = (self.total_meeting_hours / self.period_hours * 100) if self.period_hours > 0 else 0
-        # 连续会议惩罚
-        b2b_penalty = self.back_to_back_meetings * 5
-        return min(100.0, time_ratio + b2b_penalty)
+        return compute_meeting_intensity(
+            self.total_meeting_hours, self.back_to_back_meetings, self.period_hours
+        )
 
 
 class ScreenTimeData(BaseModel):
@@ -52,15 +102,11 @@ class ScreenTimeData(BaseModel):
     continuous_sessions: int = Field(default=1, ge=1, description="连续使用次数(无休息)")
     app_switches: int = Field(default=0, ge=0, description="应用切换次数")
     period_hours: float = Field(default=24.0, gt=0, description="统计周期(小时)")
-    timestamp: datetime = Field(default_factory=datetime.now, description="数据时间戳")
+    timestamp: datetime = Field(default_factory=clock.now, description="数据时间戳")
     
     @property
     def screen_intensity(self) -> float:
         """计算屏幕使用强度 (0-100)"""
-        # 使用时间占比
-        time_ratio = (self.active_hours / self.period_hours * 100) if self.period_hours > 0 else 0
-        # 连续使用惩罚 (每次无休息连续使用增加 10%)
-        continuous_penalty = (self.continuous_sessions - 1) * 10
-        # 频繁切换增加认知负荷
-        switch_penalty = min(20, self.app_switches / 10)
-        return min(100.0, time_ratio + continuous_penalty + switch_penalty)
+        return compute_screen_intensity(
+            self.active_hours, self.continuous_sessions, self.app_switches, self.period_hours
+        )
@@ -3,6 +3,7 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 from enum import Enum
 from typing import Optional
+from ..core import clock
 
 
 class EnergyLevel(str, Enum):
@@ -14,6 +15,28 @@ class EnergyLevel(str, Enum):
     EXCELLENT = "excellent"    # 充沛 (80-100)
 
 
+_ENERGY_MESSAGES = {
+    EnergyLevel.CRITICAL: "⚠️ 精力严重不足，建议立即休息！",
+    EnergyLevel.LOW: "😟 精力较低，请考虑放慢节奏",
+    EnergyLevel.MODERATE: "😐 精力中等，注意合理安排工作",
+    EnergyLevel.GOOD: "😊 精力良好，继续保持",
+    EnergyLevel.EXCELLENT: "🚀 精力充沛，状态极佳！",
+}
+
+
+def energy_level(value: float) -> EnergyLevel:
+    """根据精力值判断精力等级"""
+    if value <= 20:
+        return EnergyLevel.CRITICAL
+    if value <= 40:
+        return EnergyLevel.LOW
+    if value <= 60:
+        return EnergyLevel.MODERATE
+    if value <= 80:
+        return EnergyLevel.GOOD
+    return EnergyLevel.EXCELLENT
+
+
 class EnergyState(BaseModel):
     """精力槽状态模型"""
     value: float = Field(..., ge=0, le=100, description="精力槽值 (0-100)")
@@ -21,31 +44,15 @@ class EnergyState(BaseModel):
     github_contribution: float = Field(default=0, description="GitHub 负荷贡献")
     calendar_contribution: float = Field(default=0, description="日历负荷贡献")
     screen_contribution: float = Field(default=0, description="屏幕负荷贡献")
-    last_updated: datetime = Field(default_factory=datetime.now, description="最后更新时间")
+    last_updated: datetime = Field(default_factory=clock.now, description="最后更新时间")
     message: str = Field(default="", description="状态提示信息")
     
     @classmethod
     def from_value(cls, value: float, **kwargs) -> "EnergyState":
         """根据精力值创建状态对象"""
         value = max(0, min(100, value))
-        
-        if value <= 20:
-            level = EnergyLevel.CRITICAL
-            message = "⚠️ 精力严重不足，建议立即休息！"
-        elif value <= 40:
-            level = EnergyLevel.LOW
-            message = "😟 精力较低，请考虑放慢节奏"
-        elif value <= 60:
-            level = EnergyLevel.MODERATE
-            message = "😐 精力中等，注意合理安排工作"
-        elif value <= 80:
-            level = EnergyLevel.GOOD
-            message = "😊 精力良好，继续保持"
-        else:
-            level = EnergyLevel.EXCELLENT
-            message = "🚀 精力充沛，状态极佳！"
-        
-        return cls(value=value, level=level, message=message, **kwargs)
+        level = energy_level(value)
+        return cls(value=value, level=level, message=_ENERGY_MESSAGES[level], **kwargs)
 
 
 class FatigueLevel(str, Enum):
@@ -57,45 +64,46 @@ class FatigueLevel(str, Enum):
     SEVERE = "severe"          # 严重 (80-100)
 
 
+_FATIGUE_MESSAGES = {
+    FatigueLevel.NONE: "✨ 状态清醒，精神饱满",
+    FatigueLevel.MILD: "💭 轻微疲劳，建议适时休息",
+    FatigueLevel.MODERATE: "😴 中度疲劳，请安排短暂休息",
+    FatigueLevel.HIGH: "😫 高度疲劳，强烈建议立即休息",
+    FatigueLevel.SEVERE: "🆘 严重疲劳，必须强制休息！",
+}
+
+
+def fatigue_level(value: float) -> FatigueLevel:
+    """根据疲劳值判断疲劳等级"""
+    if value <= 20:
+        return FatigueLevel.NONE
+    if value <= 40:
+        return FatigueLevel.MILD
+    if value <= 60:
+        return FatigueLevel.MODERATE
+    if value <= 80:
+        return FatigueLevel.HIGH
+    return FatigueLevel.SEVERE
+
+
 class FatigueIndex(BaseModel):
     """疲劳指数模型"""
     value: float = Field(..., ge=0, le=100, description="疲劳指数 (0-100)")
     level: FatigueLevel = Field(..., description="疲劳等级")
     continuous_work_hours: float = Field(default=0, ge=0, description="连续工作时长(小时)")
     recovery_needed: bool = Field(default=False, description="是否需要强制恢复")
-    last_updated: datetime = Field(default_factory=datetime.now, description="最后更新时间")
+    last_updated: datetime = Field(default_factory=clock.now, description="最后更新时间")
     message: str = Field(default="", description="疲劳提示信息")
     
     @classmethod
     def from_value(cls, value: float, continuous_hours: float = 0) -> "FatigueIndex":
         """根据疲劳值创建指数对象"""
         value = max(0, min(100, value))
-        
-        if value <= 20:
-            level = FatigueLevel.NONE
-            message = "✨ 状态清醒，精神饱满"
-            recovery_needed = False
-        elif value <= 40:
-            level = FatigueLevel.MILD
-            message = "💭 轻微疲劳，建议适时休息"
-            recovery_needed = False
-        elif value <= 60:
-            level = FatigueLevel.MODERATE
-            message = "😴 中度疲劳，请安排短暂休息"
-            recovery_needed = True
-        elif value <= 80:
-            level = FatigueLevel.HIGH
-            message = "😫 高度疲劳，强烈建议立即休息"
-            recovery_needed = True
-        else:
-            level = FatigueLevel.SEVERE
-            message = "🆘 严重疲劳，必须强制休息！"
-            recovery_needed = True
-        
+        level = fatigue_level(value)
         return cls(
             value=value, 
             level=level, 
-            message=message,
+            message=_FATIGUE_MESSAGES[level],
             continuous_work_hours=continuous_hours,
-            recovery_needed=recovery_needed
+            recovery_needed=level not in (FatigueLevel.NONE, FatigueLevel.MILD)
         )
@@ -2,8 +2,9 @@
 from datetime import datetime, timedelta
 from pydantic import BaseModel, Field, HttpUrl
 from enum import Enum
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID, uuid4
+from ..core import clock
 
 
 class InterventionType(str, Enum):
@@ -17,6 +18,25 @@ class InterventionType(str, Enum):
     EYE_REST = "eye_rest"                 # 眼睛休息
 
 
+class InterventionUrgency(str, Enum):
+    """干预紧急程度枚举 (同时作为投递优先级通道)"""
+    CRITICAL = "critical"      # 危险 (疲劳 80+)
+    HIGH = "high"              # 高 (疲劳 60-80)
+    MEDIUM = "medium"          # 中 (疲劳 40-60)
+    LOW = "low"                # 低 (疲劳 40 以下)
+
+
+def recovery_urgency(fatigue: float) -> InterventionUrgency:
+    """根据疲劳指数判断恢复的紧急程度"""
+    if fatigue >= 80:
+        return InterventionUrgency.CRITICAL
+    if fatigue >= 60:
+        return InterventionUrgency.HIGH
+    if fatigue >= 40:
+        return InterventionUrgency.MEDIUM
+    return InterventionUrgency.LOW
+
+
 class WebhookConfig(BaseModel):
     """Webhook 配置模型"""
     id: UUID = Field(default_factory=uuid4, description="Webhook ID")
@@ -27,8 +47,39 @@ class WebhookConfig(BaseModel):
         description="触发此 Webhook 的干预类型"
     )
     enabled: bool = Field(default=True, description="是否启用")
+    user_ids: Optional[List[str]] = Field(default=None, description="订阅的用户 (为空且未指定团队时订阅全部用户)")
+    team_ids: Optional[List[str]] = Field(default=None, description="订阅的团队")
     headers: dict = Field(default_factory=dict, description="自定义请求头")
-    created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
+    payload_fields: Optional[List[str]] = Field(
+        default=None,
+        description="负载包含的字段 (为空时使用全部默认字段)"
+    )
+    payload_renames: Dict[str, str] = Field(default_factory=dict, description="负载字段重命名")
+    created_at: datetime = Field(default_factory=clock.now, description="创建时间")
+
+
+class CircuitState(str, Enum):
+    """熔断器状态枚举"""
+    CLOSED = "closed"          # 关闭 (正常投递)
+    OPEN = "open"              # 打开 (跳过投递)
+    HALF_OPEN = "half_open"    # 半开 (探测恢复)
+
+
+class CircuitStatus(BaseModel):
+    """熔断器状态与失败统计模型"""
+    state: CircuitState = Field(default=CircuitState.CLOSED, description="熔断器状态")
+    consecutive_failures: int = Field(default=0, ge=0, description="连续失败次数")
+    total_successes: int = Field(default=0, ge=0, description="累计成功次数")
+    total_failures: int = Field(default=0, ge=0, description="累计失败次数")
+    total_skipped: int = Field(default=0, ge=0, description="熔断期间跳过的投递次数")
+    opened_at: Optional[datetime] = Field(default=None, description="最近一次打开时间")
+    last_failure_at: Optional[datetime] = Field(default=None, description="最近一次失败时间")
+    last_error: Optional[str] = Field(default=None, description="最近一次失败原因")
+
+
+class WebhookStatus(WebhookConfig):
+    """Webhook 配置及其熔断器状态"""
+    circuit: CircuitStatus = Field(default_factory=CircuitStatus, description="熔断器状态")
 
 
 class RecoveryActivity(BaseModel):
@@ -47,7 +98,7 @@ class RecoverySchedule(BaseModel):
     energy_level: float = Field(..., ge=0, le=100, description="当前精力槽")
     total_recovery_time: int = Field(..., description="总恢复时间(分钟)")
     activities: List[RecoveryActivity] = Field(default_factory=list, description="恢复活动列表")
-    start_time: datetime = Field(default_factory=datetime.now, description="建议开始时间")
+    start_time: datetime = Field(default_factory=clock.now, description="建议开始时间")
     urgency: str = Field(default="normal", description="紧急程度")
     message: str = Field(default="", description="恢复建议信息")
     
@@ -55,10 +106,10 @@ class RecoverySchedule(BaseModel):
     def generate(cls, fatigue: float, energy: float) -> "RecoverySchedule":
         """根据疲劳和精力状态生成恢复时间表"""
         activities = []
+        urgency = recovery_urgency(fatigue)
         
         # 根据疲劳程度生成不同的恢复计划
-        if fatigue >= 80:
-            urgency = "critical"
+        if urgency == InterventionUrgency.CRITICAL:
             total_time = 60
             activities = [
                 RecoveryActivity(
@@ -92,8 +143,7 @@ class RecoverySchedule(BaseModel):
             ]
             message = "🆘 检测到严重疲劳！请立即执行恢复计划"
             
-        elif fatigue >= 60:
-            urgency = "high"
+        elif urgency == InterventionUrgency.HIGH:
             total_time = 30
             activities = [
                 RecoveryActivity(
@@ -120,8 +170,7 @@ class RecoverySchedule(BaseModel):
             ]
             message = "😫 疲劳程度较高，建议尽快休息"
             
-        elif fatigue >= 40:
-            urgency = "medium"
+        elif urgency == InterventionUrgency.MEDIUM:
             total_time = 15
             activities = [
                 RecoveryActivity(
@@ -142,7 +191,6 @@ class RecoverySchedule(BaseModel):
             message = "😴 中度疲劳，建议短暂休息"
             
         else:
-            urgency = "low"
             total_time = 5
             activities = [
                 RecoveryActivity(
@@ -160,7 +208,7 @@ class RecoverySchedule(BaseModel):
             energy_level=energy,
             total_recovery_time=total_time,
             activities=activities,
-            urgency=urgency,
+            urgency=urgency.value,
             message=message
         )
 
@@ -169,9 +217,27 @@ class InterventionEvent(BaseModel):
     """干预事件模型"""
     id: UUID = Field(default_factory=uuid4, description="事件 ID")
     type: InterventionType = Field(..., description="干预类型")
-    triggered_at: datetime = Field(default_factory=datetime.now, description="触发时间")
+    user_id: Optional[str] = Field(default=None, description="目标用户 ID")
+    triggered_at: datetime = Field(default_factory=clock.now, description="触发时间")
     fatigue_at_trigger: float = Field(..., ge=0, le=100, description="触发时的疲劳指数")
     energy_at_trigger: float = Field(..., ge=0, le=100, description="触发时的精力槽")
+    lane: Optional[InterventionUrgency] = Field(default=None, description="投递通道")
     webhook_notified: List[UUID] = Field(default_factory=list, description="已通知的 Webhook ID 列表")
     success: bool = Field(default=True, description="是否成功")
     message: str = Field(default="", description="事件信息")
+
+
+class DeliveryLaneStatus(BaseModel):
+    """投递通道状态与排队延迟模型"""
+    lane: InterventionUrgency = Field(..., description="投递通道")
+    workers: int = Field(..., ge=0, description="工作协程数量")
+    max_queue: int = Field(..., ge=0, description="队列长度上限")
+    queued: int = Field(default=0, ge=0, description="当前排队的投递任务数")
+    enqueued: int = Field(default=0, ge=0, description="累计入队数")
+    delivered: int = Field(default=0, ge=0, description="累计完成数")
+    dropped: int = Field(default=0, ge=0, description="因队列已满被丢弃的任务数")
+    latency_p50_ms: Optional[float] = Field(default=None, description="近期排队延迟 p50(毫秒)")
+    latency_p99_ms: Optional[float] = Field(default=None, description="近期排队延迟 p99(毫秒)")
+    latency_max_ms: Optional[float] = Field(default=None, description="近期排队延迟最大值(毫秒)")
+    slo_ms: Optional[float] = Field(default=None, description="排队延迟目标(毫秒)")
+    slo_violations: int = Field(default=0, ge=0, description="超出延迟目标的次数")
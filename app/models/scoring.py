@@ -0,0 +1,50 @@
+"""评分配置模型"""
+from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+
+# 权重之和允许的浮点误差
+WEIGHT_SUM_TOLERANCE = 1e-6
+
+
+class ScoringConfig(BaseModel):
+    """评分配置 - 精力与疲劳计算使用的权重与阈值"""
+    github_weight: float = Field(..., ge=0, le=1, description="GitHub 活动权重")
+    calendar_weight: float = Field(..., ge=0, le=1, description="日历会议权重")
+    screen_weight: float = Field(..., ge=0, le=1, description="屏幕时间权重")
+    energy_critical_threshold: float = Field(..., ge=0, le=100, description="精力槽危险阈值")
+    energy_warning_threshold: float = Field(..., ge=0, le=100, description="精力槽警告阈值")
+    fatigue_duration_factor: float = Field(..., ge=0, description="持续工作时间疲劳因子")
+    fatigue_critical_threshold: float = Field(..., ge=0, le=100, description="疲劳危险阈值")
+
+    model_config = {"frozen": True}
+
+    @model_validator(mode="after")
+    def _check_consistency(self) -> "ScoringConfig":
+        total = self.github_weight + self.calendar_weight + self.screen_weight
+        if abs(total - 1.0) > WEIGHT_SUM_TOLERANCE:
+            raise ValueError(f"权重之和必须为 1.0，当前为 {total:g}")
+        if self.energy_critical_threshold > self.energy_warning_threshold:
+            raise ValueError("精力槽危险阈值不能高于警告阈值")
+        return self
+
+
+class ScoringConfigUpdate(BaseModel):
+    """评分配置更新 - 未提供的字段沿用当前配置"""
+    github_weight: Optional[float] = Field(default=None, description="GitHub 活动权重")
+    calendar_weight: Optional[float] = Field(default=None, description="日历会议权重")
+    screen_weight: Optional[float] = Field(default=None, description="屏幕时间权重")
+    energy_critical_threshold: Optional[float] = Field(default=None, description="精力槽危险阈值")
+    energy_warning_threshold: Optional[float] = Field(default=None, description="精力槽警告阈值")
+    fatigue_duration_factor: Optional[float] = Field(default=None, description="持续工作时间疲劳因子")
+    fatigue_critical_threshold: Optional[float] = Field(default=None, description="疲劳危险阈值")
+
+
+class ScoringConfigStatus(BaseModel):
+    """评分配置状态"""
+    version: int = Field(..., description="配置版本号 (每次生效递增)")
+    config: ScoringConfig = Field(..., description="当前生效的配置")
+    source: str = Field(..., description="配置来源 (settings / api / 文件路径)")
+    activated_at: datetime = Field(..., description="生效时间")
+    watch_file: Optional[str] = Field(default=None, description="监视的配置文件")
+    last_error: Optional[str] = Field(default=None, description="最近一次加载失败的原因")
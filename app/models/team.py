@@ -0,0 +1,50 @@
+"""团队与组织汇总模型"""
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from ..core import clock
+from .energy import EnergyLevel, FatigueLevel
+
+
+class TeamStatus(BaseModel):
+    """团队 (或组织) 汇总状态模型"""
+    team_id: Optional[str] = Field(default=None, description="团队 ID (组织汇总时为空)")
+    member_count: int = Field(default=0, ge=0, description="成员数量")
+    average_energy: float = Field(default=0, description="平均精力槽")
+    average_fatigue: float = Field(default=0, description="平均疲劳指数")
+    critical_count: int = Field(default=0, ge=0, description="需要干预的成员数量")
+    energy_distribution: Dict[EnergyLevel, int] = Field(
+        default_factory=dict,
+        description="各精力等级的成员数量"
+    )
+    fatigue_distribution: Dict[FatigueLevel, int] = Field(
+        default_factory=dict,
+        description="各疲劳等级的成员数量"
+    )
+    last_updated: datetime = Field(default_factory=clock.now, description="最后更新时间")
+    scoring_version: int = Field(default=0, ge=0, description="评分配置版本")
+    stale_users: int = Field(default=0, ge=0, description="评分配置切换后尚未重算的用户数量")
+
+
+class RollupConsistency(BaseModel):
+    """增量汇总与全量重算的一致性检查结果"""
+    team_id: Optional[str] = Field(default=None, description="团队 ID (组织汇总时为空)")
+    consistent: bool = Field(..., description="增量汇总是否与全量重算一致")
+    max_deviation: float = Field(default=0, description="平均值的最大偏差")
+    stale_users: int = Field(default=0, ge=0, description="评分配置切换后尚未重算的用户数量")
+    incremental: TeamStatus = Field(..., description="增量维护的汇总")
+    recomputed: TeamStatus = Field(..., description="全量重算的汇总")
+
+
+class DistributionSummary(BaseModel):
+    """精力与疲劳分布摘要模型"""
+    team_ids: Optional[List[str]] = Field(default=None, description="参与合并的团队 (为空表示全组织)")
+    start: Optional[datetime] = Field(default=None, description="时间范围起点")
+    end: Optional[datetime] = Field(default=None, description="时间范围终点")
+    sample_count: int = Field(default=0, ge=0, description="样本数量")
+    relative_accuracy: float = Field(..., description="分位数相对误差")
+    energy: Dict[str, Optional[float]] = Field(default_factory=dict, description="精力槽分位数")
+    fatigue: Dict[str, Optional[float]] = Field(default_factory=dict, description="疲劳指数分位数")
+    scoring_version: int = Field(default=0, ge=0, description="评分配置版本")
+    stale_users: int = Field(default=0, ge=0, description="评分配置切换后尚未重算的用户数量")
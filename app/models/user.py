@@ -0,0 +1,33 @@
+"""用户索引模型"""
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from .energy import EnergyLevel, FatigueLevel
+
+
+class UserOrder(str, Enum):
+    """用户列表排序方式"""
+    ENERGY = "energy"      # 精力值升序 (最疲惫的在前)
+    FATIGUE = "fatigue"    # 疲劳值降序 (最疲劳的在前)
+
+
+class UserStatusEntry(BaseModel):
+    """用户当前状态条目"""
+    user_id: str = Field(..., description="用户 ID")
+    team_id: Optional[str] = Field(default=None, description="所属团队 ID")
+    energy: float = Field(..., description="精力槽值")
+    fatigue: float = Field(..., description="疲劳指数")
+    energy_level: EnergyLevel = Field(..., description="精力等级")
+    fatigue_level: FatigueLevel = Field(..., description="疲劳等级")
+    critical: bool = Field(..., description="是否需要干预")
+
+
+class UserList(BaseModel):
+    """用户列表查询结果"""
+    order_by: UserOrder = Field(..., description="排序方式")
+    count: int = Field(..., ge=0, description="本次返回的用户数量")
+    has_more: bool = Field(..., description="是否还有更多符合条件的用户")
+    scoring_version: int = Field(default=0, ge=0, description="评分配置版本")
+    stale_users: int = Field(default=0, ge=0, description="评分配置切换后尚未重算的用户数量")
+    users: List[UserStatusEntry] = Field(default_factory=list, description="符合条件的用户")
@@ -2,5 +2,21 @@
 from .data import router as data_router
 from .energy import router as energy_router
 from .intervention import router as intervention_router
+from .team import router as team_router
+from .admin import router as admin_router
+from .export import router as export_router
+from .connector import router as connector_router
+from .activity import router as activity_router
+from .user import router as user_router
 
-__all__ = ["data_router", "energy_router", "intervention_router"]
+__all__ = [
+    "data_router",
+    "energy_router",
+    "intervention_router",
+    "team_router",
+    "admin_router",
+    "export_router",
+    "connector_router",
+    "activity_router",
+    "user_router",
+]
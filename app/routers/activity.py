@@ -0,0 +1,53 @@
+"""原始活动事件路由"""
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+from ..core.config import settings
+from ..models.activity import ActivityEventBatch, ActivityIntensity
+from ..services.activity import activity
+
+router = APIRouter(prefix="/api/events", tags=["活动事件"])
+
+
+@router.post("", summary="提交原始活动事件", status_code=202)
+async def submit_events(batch: ActivityEventBatch) -> dict:
+    """
+    批量提交原始活动事件，由服务端增量折叠为滚动计数器
+    
+    - **type**: focus (焦点切换，附带 app) / heartbeat / commit / pull_request / code_review / issue_closed
+    - **user_id** / **team_id**: 事件所属用户及团队，一批事件可包含多个用户
+    - **timestamp**: 事件时间，早于滚动窗口的事件会被丢弃
+    - **count**: 事件数量 (如一次推送包含的提交数)
+    
+    事件进入有界队列后立即返回 202，队列已满时返回 503
+    """
+    if len(batch.events) > settings.activity_max_batch:
+        raise HTTPException(status_code=413, detail=f"单次最多提交 {settings.activity_max_batch} 个事件")
+    if not activity.submit(batch.events):
+        return JSONResponse(
+            {"detail": "事件队列已满，请稍后重试"},
+            status_code=503,
+            headers={"Retry-After": "1"}
+        )
+    return {"status": "accepted", "accepted": len(batch.events)}
+
+
+@router.get("/stats", summary="获取事件接收统计")
+async def get_event_stats() -> dict:
+    """
+    获取事件接收统计
+    
+    - **accepted** / **rejected**: 入队与因队列已满被拒绝的事件数
+    - **processed** / **late_dropped** / **future_dropped**: 已折叠、因过旧及因超前服务端时间被丢弃的事件数
+    - **queued**: 队列中待处理的事件数
+    """
+    return activity.get_stats()
+
+
+@router.get("/intensity", summary="获取滚动窗口活动强度", response_model=ActivityIntensity)
+async def get_activity_intensity(user_id: str = "default") -> ActivityIntensity:
+    """按需从滚动计数器推导用户的 GitHub 活动强度与屏幕使用强度"""
+    intensity = activity.get_intensity(user_id)
+    if intensity is None:
+        raise HTTPException(status_code=404, detail="该用户没有活动事件")
+    return intensity
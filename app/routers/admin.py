@@ -0,0 +1,118 @@
+"""系统管理路由"""
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from pydantic import ValidationError
+
+from ..core.config import settings
+from ..models.scoring import ScoringConfigStatus, ScoringConfigUpdate
+from ..services.admission import admission
+from ..services.profiler import ProfilerBusyError, profiler
+from ..services.scoring import scoring
+from ..services.tracing import tracer
+
+router = APIRouter(prefix="/api/admin", tags=["系统管理"])
+
+
+@router.get("/admission", summary="获取准入控制统计")
+async def get_admission_stats() -> dict:
+    """
+    获取准入控制统计
+    
+    - **ingest_shed_rate_limited**: 因采集端超速被拒绝的写入数 (429)
+    - **ingest_shed_overloaded**: 因并发已满被拒绝的写入数 (503)
+    - **read_shed_overloaded**: 因并发已满被拒绝的查询数 (503)
+    - **in_flight_ingest** / **in_flight_read**: 当前处理中的请求数
+    """
+    return admission.get_stats()
+
+
+@router.get("/traces", summary="获取请求追踪记录")
+async def get_traces(
+    limit: int = Query(default=50, gt=0, le=1000, description="返回的记录数量上限"),
+    slow_only: bool = Query(default=False, description="仅返回慢请求")
+) -> dict:
+    """
+    获取最近被采样的请求追踪 (最新在前)
+    
+    各阶段 (spans):
+    - **parse**: 请求体读取与校验
+    - **aggregate**: 聚合器数据更新
+    - **score**: 精力与疲劳计算
+    - **notify**: 汇总、分布与历史等监听器
+    - **trigger_decision**: 后台干预判断
+    - **webhook**: 单个 Webhook 发送 (含重试)
+    
+    采样率由 `BURNOUT_TRACE_SAMPLE_RATE` 配置，默认关闭
+    """
+    return {
+        **tracer.get_stats(),
+        "traces": [trace.to_dict() for trace in tracer.traces(limit, slow_only)],
+    }
+
+
+@router.get("/profile", summary="采集 CPU 剖析", response_class=PlainTextResponse)
+async def capture_profile(
+    seconds: float = Query(default=5.0, gt=0, le=settings.profile_max_seconds, description="采样时长(秒)"),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000, description="采样间隔(毫秒)")
+) -> PlainTextResponse:
+    """
+    在限定时间内采样运行中进程的调用栈，返回火焰图折叠栈文件
+    
+    输出可直接用于 `flamegraph.pl profile.folded > profile.svg` 或导入 speedscope
+    """
+    if profiler.busy:
+        raise HTTPException(status_code=409, detail="已有剖析正在进行")
+    try:
+        folded = await asyncio.to_thread(profiler.capture, seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": 'attachment; filename="profile.folded"'}
+    )
+
+
+@router.get("/scoring", summary="获取评分配置", response_model=ScoringConfigStatus)
+async def get_scoring_config() -> ScoringConfigStatus:
+    """
+    获取当前生效的评分配置 (权重与阈值) 及其版本号
+    
+    - **source**: 配置来源，`settings` 为环境变量配置，`api` 为接口更新，否则为配置文件路径
+    - **last_error**: 最近一次配置文件加载失败的原因
+    """
+    return scoring.get_status()
+
+
+@router.patch("/scoring", summary="更新评分配置", response_model=ScoringConfigStatus)
+async def update_scoring_config(changes: ScoringConfigUpdate) -> ScoringConfigStatus:
+    """
+    更新评分配置，未提供的字段沿用当前值
+    
+    新配置须满足三项权重之和为 1.0 且危险阈值不高于警告阈值，校验失败时返回 422 并保留当前配置。
+    生效后版本号递增，各用户的精力与疲劳在下次读取时按新配置重新计算
+    """
+    try:
+        scoring.update(changes)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=[err["msg"] for err in e.errors()])
+    return scoring.get_status()
+
+
+@router.post("/scoring/reload", summary="重新加载评分配置文件", response_model=ScoringConfigStatus)
+async def reload_scoring_config() -> ScoringConfigStatus:
+    """立即从 `BURNOUT_SCORING_CONFIG_FILE` 重新加载评分配置，加载失败时返回 422 并保留当前配置"""
+    if scoring.path is None:
+        raise HTTPException(status_code=404, detail="未配置评分配置文件")
+    try:
+        scoring.load_file()
+    except (OSError, ValueError):
+        raise HTTPException(status_code=422, detail=scoring.get_status().last_error)
+    return scoring.get_status()
+
+
+@router.post("/scoring/reset", summary="恢复默认评分配置", response_model=ScoringConfigStatus)
+async def reset_scoring_config() -> ScoringConfigStatus:
+    """恢复为环境变量 (或 `.env`) 中的评分配置"""
+    scoring.reset()
+    return scoring.get_status()
@@ -0,0 +1,63 @@
+"""数据连接器路由"""
+from typing import Dict, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+
+from ..models.connector import ConnectorConfig, ConnectorKind, ConnectorStatus
+from ..services.connectors import connectors
+from ..services.registry import registry
+
+router = APIRouter(prefix="/api", tags=["数据连接器"])
+
+
+class ConnectorRegisterRequest(BaseModel):
+    """连接器注册请求"""
+    kind: ConnectorKind
+    url: str
+    user_id: str = registry.DEFAULT_USER_ID
+    team_id: Optional[str] = None
+    token: Optional[str] = None
+    params: Dict[str, str] = {}
+    interval_seconds: float = Field(default=300.0, ge=1)
+    window_hours: float = Field(default=24.0, gt=0)
+
+
+@router.post("/connectors", summary="注册数据连接器", response_model=ConnectorConfig)
+async def register_connector(request: ConnectorRegisterRequest) -> ConnectorConfig:
+    """
+    注册拉取式数据连接器，按计划轮询数据源并更新用户的认知负荷
+    
+    - **kind**: 连接器类型 (github/calendar/screen)
+    - **url**: 数据源 API 地址 (如 `https://api.github.com/users/{login}/events`)
+    - **token**: 访问令牌，以 `Authorization: Bearer` 发送
+    - **params**: 附加查询参数
+    - **interval_seconds**: 轮询间隔
+    - **window_hours**: 汇总的滚动时间窗口
+    - **user_id** / **team_id**: 数据所属用户及团队
+    """
+    config = ConnectorConfig(**request.model_dump())
+    return connectors.register(config)
+
+
+@router.get("/connectors", summary="列出数据连接器", response_model=List[ConnectorStatus])
+async def list_connectors() -> List[ConnectorStatus]:
+    """列出所有连接器及其游标、ETag 与轮询统计"""
+    return connectors.list_statuses()
+
+
+@router.post("/connectors/{connector_id}/poll", summary="立即轮询", response_model=ConnectorStatus)
+async def poll_connector(connector_id: UUID) -> ConnectorStatus:
+    """立即轮询一次指定连接器"""
+    status = await connectors.poll(connector_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="连接器不存在")
+    return status
+
+
+@router.delete("/connectors/{connector_id}", summary="注销数据连接器")
+async def unregister_connector(connector_id: UUID) -> dict:
+    """注销指定的连接器并停止轮询"""
+    if connectors.unregister(connector_id):
+        return {"status": "success", "message": f"连接器 {connector_id} 已注销"}
+    raise HTTPException(status_code=404, detail="连接器不存在")
@@ -1,26 +1,37 @@
 """数据输入路由"""
-from fastapi import APIRouter, BackgroundTasks
-from ..models.data_input import GitHubData, CalendarData, ScreenTimeData
-from ..services.aggregator import aggregator
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
+from ..models.data_input import GitHubData, CalendarData, ScreenTimeData, DataSource
+from ..services.codec import BINARY_CONTENT_TYPE, RECORD_STRUCTS, decode_batch
+from ..services.registry import registry
 from ..services.scheduler import scheduler
+from ..services.tracing import tracer
 from ..models.intervention import InterventionType
 
 router = APIRouter(prefix="/api/data", tags=["数据输入"])
 
+USER_ID_QUERY = Query(default=registry.DEFAULT_USER_ID, description="用户 ID")
+TEAM_ID_QUERY = Query(default=None, description="所属团队 ID")
 
-async def check_and_trigger_intervention(background_tasks: BackgroundTasks):
+
+async def check_and_trigger_intervention(user_id: str = registry.DEFAULT_USER_ID):
     """检查是否需要触发干预"""
-    if aggregator.needs_intervention():
+    with tracer.span("trigger_decision"):
+        state = registry.get_state(user_id)
+    if state is not None and state.critical:
         await scheduler.trigger_intervention(
             InterventionType.REST_REMINDER,
-            force=True
+            force=True,
+            user_id=user_id
         )
 
 
 @router.post("/github", summary="提交 GitHub 活动数据")
 async def submit_github_data(
     data: GitHubData,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    user_id: str = USER_ID_QUERY,
+    team_id: Optional[str] = TEAM_ID_QUERY
 ) -> dict:
     """
     接收 GitHub 活动数据并更新认知负荷计算
@@ -30,24 +41,30 @@ async def submit_github_data(
     - **code_reviews**: 代码审查数量
     - **issues_resolved**: 解决的 Issue 数量
     - **period_hours**: 统计周期(小时)
+    - **user_id** / **team_id**: 查询参数，指定用户及所属团队
     """
-    aggregator.update_github_data(data)
+    tracer.mark("parse")
+    with tracer.span("aggregate"):
+        registry.get_or_create(user_id, team_id).update_github_data(data)
+    state = registry.commit(user_id)
     
     # 后台检查是否需要干预
-    background_tasks.add_task(check_and_trigger_intervention, background_tasks)
+    background_tasks.add_task(check_and_trigger_intervention, user_id)
     
     return {
         "status": "success",
         "message": "GitHub 数据已更新",
         "activity_intensity": data.activity_intensity,
-        "current_energy": aggregator.calculate_energy().value
+        "current_energy": state.energy
     }
 
 
 @router.post("/calendar", summary="提交日历会议数据")
 async def submit_calendar_data(
     data: CalendarData,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    user_id: str = USER_ID_QUERY,
+    team_id: Optional[str] = TEAM_ID_QUERY
 ) -> dict:
     """
     接收日历会议数据并更新认知负荷计算
@@ -56,24 +73,30 @@ async def submit_calendar_data(
     - **total_meeting_hours**: 会议总时长(小时)
     - **back_to_back_meetings**: 连续会议数量
     - **period_hours**: 统计周期(小时)
+    - **user_id** / **team_id**: 查询参数，指定用户及所属团队
     """
-    aggregator.update_calendar_data(data)
+    tracer.mark("parse")
+    with tracer.span("aggregate"):
+        registry.get_or_create(user_id, team_id).update_calendar_data(data)
+    state = registry.commit(user_id)
     
     # 后台检查是否需要干预
-    background_tasks.add_task(check_and_trigger_intervention, background_tasks)
+    background_tasks.add_task(check_and_trigger_intervention, user_id)
     
     return {
         "status": "success",
         "message": "日历数据已更新",
         "meeting_intensity": data.meeting_intensity,
-        "current_energy": aggregator.calculate_energy().value
+        "current_energy": state.energy
     }
 
 
 @router.post("/screen", summary="提交屏幕使用时间数据")
 async def submit_screen_data(
     data: ScreenTimeData,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    user_id: str = USER_ID_QUERY,
+    team_id: Optional[str] = TEAM_ID_QUERY
 ) -> dict:
     """
     接收屏幕使用时间数据并更新认知负荷计算
@@ -82,15 +105,71 @@ async def submit_screen_data(
     - **continuous_sessions**: 连续使用次数
     - **app_switches**: 应用切换次数
     - **period_hours**: 统计周期(小时)
+    - **user_id** / **team_id**: 查询参数，指定用户及所属团队
     """
-    aggregator.update_screen_data(data)
+    tracer.mark("parse")
+    with tracer.span("aggregate"):
+        registry.get_or_create(user_id, team_id).update_screen_data(data)
+    state = registry.commit(user_id)
     
     # 后台检查是否需要干预
-    background_tasks.add_task(check_and_trigger_intervention, background_tasks)
+    background_tasks.add_task(check_and_trigger_intervention, user_id)
     
     return {
         "status": "success",
         "message": "屏幕使用数据已更新",
         "screen_intensity": data.screen_intensity,
-        "current_energy": aggregator.calculate_energy().value
+        "current_energy": state.energy
+    }
+
+
+@router.post(
+    "/{source}/records",
+    summary="提交二进制记录 (单条或批量)",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {BINARY_CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}}}
+        }
+    }
+)
+async def submit_records(
+    source: DataSource,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    user_id: str = USER_ID_QUERY,
+    team_id: Optional[str] = TEAM_ID_QUERY
+) -> dict:
+    """
+    以紧凑二进制格式提交一条或一批数据，供高频采集端使用
+    
+    - 请求头 `Content-Type: application/x-burnout-records`，请求体为若干条 32 字节定长记录
+    - 可配合 `Content-Encoding: gzip` (或安装 zstandard 后的 `zstd`) 压缩传输
+    - 批量记录按顺序写入聚合器，最后只提交一次状态
+    - **user_id** / **team_id**: 查询参数，指定用户及所属团队
+    """
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip()
+    if content_type != BINARY_CONTENT_TYPE:
+        raise HTTPException(status_code=415, detail=f"仅支持 {BINARY_CONTENT_TYPE}")
+    body = await request.body()
+    try:
+        with tracer.span("decode"):
+            batch = decode_batch(source.value, body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    tracer.mark("parse")
+
+    with tracer.span("aggregate", records=batch.count):
+        registry.get_or_create(user_id, team_id).update_batch(source.value, batch.last, batch.timestamps)
+    state = registry.commit(user_id)
+    
+    # 后台检查是否需要干预
+    background_tasks.add_task(check_and_trigger_intervention, user_id)
+    
+    return {
+        "status": "success",
+        "message": f"已写入 {batch.count} 条记录",
+        "accepted": batch.count,
+        "record_size": RECORD_STRUCTS[source.value].size,
+        "current_energy": state.energy
     }
@@ -1,13 +1,25 @@
 """精力状态路由"""
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from ..models.energy import EnergyState, FatigueIndex
-from ..services.aggregator import aggregator
+from ..services.aggregator import CognitiveLoadAggregator
+from ..services.registry import registry
 
 router = APIRouter(prefix="/api", tags=["精力状态"])
 
+USER_ID_QUERY = Query(default=registry.DEFAULT_USER_ID, description="用户 ID")
+
+
+def _get_aggregator(user_id: str) -> CognitiveLoadAggregator:
+    """获取用户聚合器，不存在时返回 404 (评分配置更新后在此惰性重算)"""
+    agg = registry.get(user_id)
+    if agg is None:
+        raise HTTPException(status_code=404, detail="用户不存在")
+    registry.refresh(user_id)
+    return agg
+
 
 @router.get("/energy", summary="获取当前精力槽状态", response_model=EnergyState)
-async def get_energy_state() -> EnergyState:
+async def get_energy_state(user_id: str = USER_ID_QUERY) -> EnergyState:
     """
     获取当前精力槽状态
     
@@ -19,11 +31,11 @@ async def get_energy_state() -> EnergyState:
     - **screen_contribution**: 屏幕负荷贡献
     - **message**: 状态提示信息
     """
-    return aggregator.calculate_energy()
+    return _get_aggregator(user_id).calculate_energy()
 
 
 @router.get("/fatigue", summary="获取疲劳指数", response_model=FatigueIndex)
-async def get_fatigue_index() -> FatigueIndex:
+async def get_fatigue_index(user_id: str = USER_ID_QUERY) -> FatigueIndex:
     """
     获取当前疲劳指数
     
@@ -34,12 +46,12 @@ async def get_fatigue_index() -> FatigueIndex:
     - **recovery_needed**: 是否需要强制恢复
     - **message**: 疲劳提示信息
     """
-    return aggregator.calculate_fatigue()
+    return _get_aggregator(user_id).calculate_fatigue()
 
 
 @router.get("/status", summary="获取完整状态摘要")
-async def get_status_summary() -> dict:
+async def get_status_summary(user_id: str = USER_ID_QUERY) -> dict:
     """
     获取完整状态摘要，包括精力槽、疲劳指数和数据源状态
     """
-    return aggregator.get_status_summary()
+    return _get_aggregator(user_id).get_status_summary()
@@ -0,0 +1,103 @@
+"""数据导出路由"""
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from ..models.intervention import InterventionType
+from ..services.export import (
+    ExportFormat,
+    MEDIA_TYPES,
+    accepts_gzip,
+    encode_stream,
+    to_local_naive,
+)
+from ..services.history import history
+from ..services.scheduler import scheduler
+
+router = APIRouter(prefix="/api/export", tags=["数据导出"])
+
+INTERVENTION_COLUMNS = (
+    "id", "type", "user_id", "triggered_at", "fatigue_at_trigger",
+    "energy_at_trigger", "success", "message", "webhook_notified",
+)
+ENERGY_COLUMNS = ("timestamp", "user_id", "team_id", "energy", "fatigue")
+
+
+def _streaming_response(chunks, export_format: ExportFormat, gzip: bool, filename: str) -> StreamingResponse:
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[export_format], headers=headers)
+
+
+@router.get("/interventions", summary="流式导出干预事件")
+def export_interventions(
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="导出格式"),
+    start: Optional[datetime] = Query(default=None, description="时间范围起点"),
+    end: Optional[datetime] = Query(default=None, description="时间范围终点"),
+    type: Optional[InterventionType] = Query(default=None, description="干预类型"),
+    user_id: Optional[str] = Query(default=None, description="用户 ID"),
+    accept_encoding: str = Header(default="")
+) -> StreamingResponse:
+    """
+    以 NDJSON 或 CSV 流式导出干预事件 (按时间升序)
+    
+    - 内存占用与导出范围无关
+    - 请求头 `Accept-Encoding: gzip` 时以 gzip 压缩传输
+    """
+    def events():
+        return scheduler.iter_intervention_history(
+            to_local_naive(start), to_local_naive(end), type, user_id
+        )
+
+    chunks = encode_stream(
+        format,
+        ndjson_lines=lambda: (event.model_dump_json() for event in events()),
+        csv_header=INTERVENTION_COLUMNS,
+        csv_rows=lambda: (
+            (
+                event.id, event.type.value, event.user_id or "",
+                event.triggered_at.isoformat(), event.fatigue_at_trigger,
+                event.energy_at_trigger, event.success, event.message,
+                ";".join(str(webhook_id) for webhook_id in event.webhook_notified),
+            )
+            for event in events()
+        ),
+        gzip=accepts_gzip(accept_encoding)
+    )
+    return _streaming_response(chunks, format, accepts_gzip(accept_encoding), "interventions")
+
+
+@router.get("/energy", summary="流式导出精力历史")
+def export_energy(
+    format: ExportFormat = Query(default=ExportFormat.NDJSON, description="导出格式"),
+    start: Optional[datetime] = Query(default=None, description="时间范围起点"),
+    end: Optional[datetime] = Query(default=None, description="时间范围终点"),
+    user_id: Optional[str] = Query(default=None, description="用户 ID"),
+    team_id: Optional[str] = Query(default=None, description="团队 ID"),
+    accept_encoding: str = Header(default="")
+) -> StreamingResponse:
+    """
+    以 NDJSON 或 CSV 流式导出精力历史
+    
+    - 配置 `BURNOUT_HISTORY_FILE` 时从文件逐行读取，否则导出内存中的最近记录
+    - 请求头 `Accept-Encoding: gzip` 时以 gzip 压缩传输
+    """
+    def records():
+        return history.iter_records(to_local_naive(start), to_local_naive(end), user_id, team_id)
+
+    chunks = encode_stream(
+        format,
+        ndjson_lines=lambda: (record.to_json() for record in records()),
+        csv_header=ENERGY_COLUMNS,
+        csv_rows=lambda: (
+            (record.timestamp.isoformat(), record.user_id, record.team_id or "", record.energy, record.fatigue)
+            for record in records()
+        ),
+        gzip=accepts_gzip(accept_encoding)
+    )
+    return _streaming_response(chunks, format, accepts_gzip(accept_encoding), "energy")
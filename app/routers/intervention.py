@@ -1,15 +1,18 @@
 """干预调度路由"""
-from typing import List
+from typing import Dict, List, Optional
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 
 from ..models.intervention import (
     WebhookConfig, 
+    WebhookStatus,
     RecoverySchedule, 
     InterventionEvent,
-    InterventionType
+    InterventionType,
+    DeliveryLaneStatus
 )
+from ..services.registry import registry
 from ..services.scheduler import scheduler
 
 router = APIRouter(prefix="/api", tags=["干预调度"])
@@ -21,12 +24,22 @@ class WebhookRegisterRequest(BaseModel):
     url: str
     intervention_types: List[InterventionType] = [InterventionType.REST_REMINDER]
     headers: dict = {}
+    payload_fields: Optional[List[str]] = None
+    payload_renames: Dict[str, str] = {}
+    user_ids: Optional[List[str]] = None
+    team_ids: Optional[List[str]] = None
+
+
+class WebhookUpdateRequest(BaseModel):
+    """Webhook 更新请求"""
+    enabled: bool
 
 
 class TriggerInterventionRequest(BaseModel):
     """触发干预请求"""
     type: InterventionType = InterventionType.REST_REMINDER
     force: bool = False
+    user_id: Optional[str] = None
 
 
 @router.post("/webhook/register", summary="注册 Webhook", response_model=WebhookConfig)
@@ -38,14 +51,24 @@ async def register_webhook(request: WebhookRegisterRequest) -> WebhookConfig:
     - **url**: Webhook URL
     - **intervention_types**: 触发此 Webhook 的干预类型列表
     - **headers**: 自定义请求头
+    - **payload_fields**: 负载包含的字段 (event_id/type/user_id/triggered_at/fatigue_level/energy_level/message)
+    - **payload_renames**: 负载字段重命名，如 {"fatigue_level": "fatigue"}
+    - **user_ids** / **team_ids**: 订阅范围 (均为空时订阅全部用户)
     """
     config = WebhookConfig(
         name=request.name,
         url=request.url,
         intervention_types=request.intervention_types,
-        headers=request.headers
+        headers=request.headers,
+        payload_fields=request.payload_fields,
+        payload_renames=request.payload_renames,
+        user_ids=request.user_ids,
+        team_ids=request.team_ids
     )
-    return scheduler.register_webhook(config)
+    try:
+        return scheduler.register_webhook(config)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 @router.delete("/webhook/{webhook_id}", summary="注销 Webhook")
@@ -56,10 +79,27 @@ async def unregister_webhook(webhook_id: UUID) -> dict:
     raise HTTPException(status_code=404, detail="Webhook 不存在")
 
 
-@router.get("/webhook", summary="列出所有 Webhook", response_model=List[WebhookConfig])
-async def list_webhooks() -> List[WebhookConfig]:
-    """列出所有已注册的 Webhook"""
-    return scheduler.list_webhooks()
+@router.patch("/webhook/{webhook_id}", summary="启用或停用 Webhook", response_model=WebhookConfig)
+async def update_webhook(webhook_id: UUID, request: WebhookUpdateRequest) -> WebhookConfig:
+    """
+    启用或停用指定的 Webhook
+    
+    - **enabled**: 是否启用
+    """
+    webhook = scheduler.set_webhook_enabled(webhook_id, request.enabled)
+    if webhook is None:
+        raise HTTPException(status_code=404, detail="Webhook 不存在")
+    return webhook
+
+
+@router.get("/webhook", summary="列出所有 Webhook", response_model=List[WebhookStatus])
+async def list_webhooks() -> List[WebhookStatus]:
+    """
+    列出所有已注册的 Webhook
+    
+    - **circuit**: 熔断器状态 (closed/open/half_open) 及成功、失败、跳过次数
+    """
+    return scheduler.list_webhook_statuses()
 
 
 @router.get("/recovery-schedule", summary="获取恢复时间表", response_model=RecoverySchedule)
@@ -85,14 +125,37 @@ async def trigger_intervention(request: TriggerInterventionRequest) -> Intervent
     
     - **type**: 干预类型
     - **force**: 是否强制触发(跳过状态检查)
+    - **user_id**: 目标用户 ID (为空时使用默认用户)
+    
+    按干预类型与用户紧急程度进入对应的投递通道，等待投递完成后返回
     """
+    if request.user_id is not None and registry.get(request.user_id) is None:
+        raise HTTPException(status_code=404, detail="用户不存在")
     event = await scheduler.trigger_intervention(
         intervention_type=request.type,
-        force=request.force
+        force=request.force,
+        user_id=request.user_id,
+        wait=True
     )
     return event
 
 
+@router.get("/intervention/lanes", summary="获取投递通道状态", response_model=List[DeliveryLaneStatus])
+async def get_delivery_lanes() -> List[DeliveryLaneStatus]:
+    """
+    获取各优先级投递通道的状态 (critical/high/medium/low)
+    
+    - **queued** / **max_queue**: 当前排队数与队列上限
+    - **dropped**: 因队列已满被丢弃的投递任务数
+    - **latency_p50_ms** / **latency_p99_ms** / **latency_max_ms**: 近期排队延迟
+    - **slo_ms** / **slo_violations**: critical 通道的排队延迟目标与超标次数
+    
+    干预类型决定默认通道 (锁屏、阻止应用为 critical，休息提醒为 high，冥想、伸展为 medium，
+    补水、眼睛休息为 low)，用户当前的恢复紧急程度更高时提升一级
+    """
+    return scheduler.get_lane_statuses()
+
+
 @router.get("/intervention/history", summary="获取干预历史", response_model=List[InterventionEvent])
 async def get_intervention_history(limit: int = 10) -> List[InterventionEvent]:
     """
@@ -0,0 +1,76 @@
+"""团队汇总路由"""
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from ..models.team import TeamStatus, RollupConsistency, DistributionSummary
+from ..services.registry import registry
+from ..services.rollup import rollups
+from ..services.scoring import scoring
+from ..services.sketch import distributions
+
+router = APIRouter(prefix="/api", tags=["团队汇总"])
+
+
+@router.get("/teams/{team_id}/status", summary="获取团队汇总状态", response_model=TeamStatus)
+async def get_team_status(team_id: str) -> TeamStatus:
+    """
+    获取团队汇总状态 (增量维护，查询耗时与团队规模无关)
+    
+    返回:
+    - **member_count**: 成员数量
+    - **average_energy**: 平均精力槽
+    - **average_fatigue**: 平均疲劳指数
+    - **critical_count**: 需要干预的成员数量
+    - **energy_distribution** / **fatigue_distribution**: 各等级成员数量
+    - **scoring_version** / **stale_users**: 评分配置版本及尚未按该版本重算的用户数 (由后台任务分批重算)
+    """
+    status = rollups.get_team_status(team_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="团队不存在")
+    return status
+
+
+@router.get("/teams/{team_id}/consistency", summary="校验团队汇总一致性", response_model=RollupConsistency)
+async def check_team_consistency(team_id: str) -> RollupConsistency:
+    """对比团队的增量汇总与全量重算结果"""
+    return rollups.check_consistency(team_id)
+
+
+@router.get("/org/status", summary="获取组织汇总状态", response_model=TeamStatus)
+async def get_org_status() -> TeamStatus:
+    """获取全组织汇总状态"""
+    return rollups.get_org_status()
+
+
+@router.get("/org/consistency", summary="校验组织汇总一致性", response_model=RollupConsistency)
+async def check_org_consistency() -> RollupConsistency:
+    """对比全组织的增量汇总与全量重算结果"""
+    return rollups.check_consistency()
+
+
+@router.get("/distribution", summary="获取精力与疲劳分布", response_model=DistributionSummary)
+async def get_distribution(
+    team_id: Optional[List[str]] = Query(default=None, description="团队 ID，可重复指定"),
+    start: Optional[datetime] = Query(default=None, description="时间范围起点"),
+    end: Optional[datetime] = Query(default=None, description="时间范围终点"),
+    quantiles: List[float] = Query(default=[0.5, 0.9, 0.99], description="分位数 (0-1)")
+) -> DistributionSummary:
+    """
+    合并各团队、各时间桶的分位数草图，返回精力与疲劳分布
+    
+    内存占用与样本数量无关，默认返回 p50/p90/p99
+    """
+    if any(q < 0 or q > 1 for q in quantiles):
+        raise HTTPException(status_code=422, detail="分位数必须在 0-1 之间")
+    count, energy, fatigue = distributions.quantiles(quantiles, team_id, start, end)
+    return DistributionSummary(
+        team_ids=team_id,
+        start=start,
+        end=end,
+        sample_count=count,
+        relative_accuracy=distributions.relative_accuracy,
+        energy=energy,
+        fatigue=fatigue,
+        scoring_version=scoring.version,
+        stale_users=registry.stale_count
+    )
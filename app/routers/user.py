@@ -0,0 +1,61 @@
+"""用户索引路由"""
+from typing import Optional
+from fastapi import APIRouter, Query
+from ..models.energy import EnergyLevel, FatigueLevel
+from ..models.user import UserList, UserOrder, UserStatusEntry
+from ..services.registry import registry
+from ..services.scoring import scoring
+from ..services.user_index import user_index
+
+router = APIRouter(prefix="/api", tags=["用户索引"])
+
+
+@router.get("/users", summary="按状态列出用户", response_model=UserList)
+async def list_users(
+    energy_level: Optional[EnergyLevel] = Query(default=None, description="精力等级"),
+    fatigue_level: Optional[FatigueLevel] = Query(default=None, description="疲劳等级"),
+    critical: Optional[bool] = Query(default=None, description="是否需要干预"),
+    max_energy: Optional[float] = Query(default=None, ge=0, le=100, description="精力值上限"),
+    min_fatigue: Optional[float] = Query(default=None, ge=0, le=100, description="疲劳值下限"),
+    team_id: Optional[str] = Query(default=None, description="所属团队 ID"),
+    order_by: Optional[UserOrder] = Query(default=None, description="排序方式 (energy/fatigue)"),
+    limit: int = Query(default=100, gt=0, le=1000, description="返回数量上限")
+) -> UserList:
+    """
+    列出当前处于指定状态的用户，例如 `?energy_level=critical` 或 `?fatigue_level=severe`
+    
+    索引随状态变更增量维护，按等级分桶并按数值排序：
+    - 按精力条件筛选时按精力值升序返回，只按疲劳条件筛选时按疲劳值降序返回
+    - 等级、是否需要干预与阈值条件直接定位有序桶，耗时与返回数量成正比而非用户总数
+    - **team_id** 为附加过滤条件，需要在候选桶中逐个筛选
+    - 评分配置切换后由后台任务分批重算，**stale_users** 为尚未按当前版本重算的用户数
+    """
+    result = user_index.query(
+        energy_level=energy_level,
+        fatigue_level=fatigue_level,
+        critical=critical,
+        max_energy=max_energy,
+        min_fatigue=min_fatigue,
+        team_id=team_id,
+        order_by=order_by,
+        limit=limit
+    )
+    return UserList(
+        order_by=result.order_by,
+        count=len(result.users),
+        has_more=result.has_more,
+        scoring_version=scoring.version,
+        stale_users=registry.stale_count,
+        users=[
+            UserStatusEntry(
+                user_id=user_id,
+                team_id=state.team_id,
+                energy=state.energy,
+                fatigue=state.fatigue,
+                energy_level=state.energy_level,
+                fatigue_level=state.fatigue_level,
+                critical=state.critical
+            )
+            for user_id, state in result.users
+        ]
+    )
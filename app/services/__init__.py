@@ -1,5 +1,41 @@
 """业务服务模块"""
 from .aggregator import CognitiveLoadAggregator
 from .scheduler import InterventionScheduler
+from .registry import UserRegistry, UserState
+from .rollup import TeamRollupService
+from .user_index import UserLevelIndex
+from .sketch import DDSketch, DistributionTracker
+from .history import EnergyRecord, EnergyHistoryStore
+from .snapshot import SnapshotService
+from .admission import AdmissionController
+from .circuit import CircuitBreaker
+from .routing import WebhookRouter
+from .delivery import DeliveryLanes
+from .tracing import Tracer
+from .profiler import SamplingProfiler
+from .connectors import ConnectorManager
+from .activity import ActivityIngestor
+from .scoring import ScoringConfigStore
 
-__all__ = ["CognitiveLoadAggregator", "InterventionScheduler"]
+__all__ = [
+    "CognitiveLoadAggregator",
+    "InterventionScheduler",
+    "UserRegistry",
+    "UserState",
+    "TeamRollupService",
+    "UserLevelIndex",
+    "DDSketch",
+    "DistributionTracker",
+    "EnergyRecord",
+    "EnergyHistoryStore",
+    "SnapshotService",
+    "AdmissionController",
+    "CircuitBreaker",
+    "WebhookRouter",
+    "DeliveryLanes",
+    "Tracer",
+    "SamplingProfiler",
+    "ConnectorManager",
+    "ActivityIngestor",
+    "ScoringConfigStore",
+]
@@ -0,0 +1,361 @@
+"""原始活动事件服务 - 异步队列接收事件，增量折叠为每个用户的滚动计数器"""
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from ..connectors.screen import BREAK_GAP, LONG_SESSION
+from ..core import clock
+from ..core.config import settings
+from ..models.activity import ActivityEvent, ActivityEventType, ActivityIntensity
+from ..models.intervention import InterventionType
+from .codec import GitHubRecord, ScreenTimeRecord
+from .registry import registry
+from .scheduler import scheduler
+
+# 相邻两次活动 (焦点切换/心跳) 间隔不超过该秒数时计为活跃时间
+ACTIVE_GAP_SECONDS = 120.0
+
+_BREAK_GAP_SECONDS = BREAK_GAP.total_seconds()
+_LONG_SESSION_SECONDS = LONG_SESSION.total_seconds()
+
+_COUNTED = {
+    ActivityEventType.COMMIT: 0,
+    ActivityEventType.PULL_REQUEST: 1,
+    ActivityEventType.CODE_REVIEW: 2,
+    ActivityEventType.ISSUE_CLOSED: 3,
+}
+
+
+def _by_time(item) -> float:
+    return item[0]
+
+
+class _Bucket:
+    """一个时间桶内的计数"""
+
+    __slots__ = ("index", "counts", "active_seconds", "switches", "screen_events")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.counts = [0, 0, 0, 0]  # 提交、PR、审查、Issue
+        self.active_seconds = 0.0
+        self.switches = 0
+        self.screen_events = 0  # 焦点切换与心跳
+
+
+class ActivityCounters:
+    """
+    单个用户的滚动计数器
+
+    只为有活动的时间桶分配空间，窗口内的合计随事件加入与时间桶过期增量维护，
+    推导强度时无需遍历事件
+    """
+
+    __slots__ = (
+        "team_id", "buckets", "counts", "active_seconds", "switches", "screen_events",
+        "last_event_ts", "last_ts", "last_app", "stretch_start", "long_stretch_ends",
+    )
+
+    def __init__(self, team_id: Optional[str] = None):
+        self.team_id = team_id
+        self.buckets: Deque[_Bucket] = deque()
+        self.counts = [0, 0, 0, 0]
+        self.active_seconds = 0.0
+        self.switches = 0
+        self.screen_events = 0
+        # 最近一次任意事件 / 最近一次活动 (焦点切换或心跳) 的时间
+        self.last_event_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self.last_app: Optional[str] = None
+        self.stretch_start: Optional[float] = None
+        # 窗口内已结束的长时间连续使用 (结束时间)
+        self.long_stretch_ends: Deque[float] = deque()
+
+    def _bucket(self, index: int) -> _Bucket:
+        buckets = self.buckets
+        if not buckets or buckets[-1].index < index:
+            bucket = _Bucket(index)
+            buckets.append(bucket)
+            return bucket
+        if buckets[-1].index == index:
+            return buckets[-1]
+        # 乱序事件: 从尾部向前查找或插入
+        for position in range(len(buckets) - 1, -1, -1):
+            if buckets[position].index == index:
+                return buckets[position]
+            if buckets[position].index < index:
+                bucket = _Bucket(index)
+                buckets.insert(position + 1, bucket)
+                return bucket
+        bucket = _Bucket(index)
+        buckets.appendleft(bucket)
+        return bucket
+
+    def add(self, event_type: ActivityEventType, ts: float, app: Optional[str], count: int, bucket_seconds: float) -> None:
+        """加入一个事件"""
+        if self.last_event_ts is None or ts > self.last_event_ts:
+            self.last_event_ts = ts
+        bucket = self._bucket(int(ts // bucket_seconds))
+        slot = _COUNTED.get(event_type)
+        if slot is not None:
+            bucket.counts[slot] += count
+            self.counts[slot] += count
+            return
+
+        # 焦点切换与心跳: 累计活跃时间并追踪连续使用
+        bucket.screen_events += 1
+        self.screen_events += 1
+        last_ts = self.last_ts
+        if last_ts is None:
+            self.stretch_start = ts
+        elif ts >= last_ts:
+            gap = ts - last_ts
+            if gap <= ACTIVE_GAP_SECONDS:
+                bucket.active_seconds += gap
+                self.active_seconds += gap
+            if gap > _BREAK_GAP_SECONDS:
+                if last_ts - self.stretch_start >= _LONG_SESSION_SECONDS:
+                    self.long_stretch_ends.append(last_ts)
+                self.stretch_start = ts
+        if last_ts is None or ts > last_ts:
+            self.last_ts = ts
+
+        if event_type == ActivityEventType.FOCUS and app and app != self.last_app:
+            if self.last_app is not None:
+                bucket.switches += 1
+                self.switches += 1
+            self.last_app = app
+
+    def prune(self, window_start: float, bucket_seconds: float) -> None:
+        """移除滚动窗口之外的时间桶"""
+        start_index = int(window_start // bucket_seconds)
+        buckets = self.buckets
+        while buckets and buckets[0].index < start_index:
+            bucket = buckets.popleft()
+            for slot, value in enumerate(bucket.counts):
+                self.counts[slot] -= value
+            self.active_seconds -= bucket.active_seconds
+            self.switches -= bucket.switches
+            self.screen_events -= bucket.screen_events
+        if not buckets:
+            # 窗口清空时归零，避免浮点累积误差残留
+            self.active_seconds = 0.0
+        while self.long_stretch_ends and self.long_stretch_ends[0] < window_start:
+            self.long_stretch_ends.popleft()
+
+    def long_sessions(self) -> int:
+        """窗口内长时间无休息的连续使用次数 (含进行中的一段)"""
+        current = (
+            self.last_ts is not None
+            and self.last_ts - self.stretch_start >= _LONG_SESSION_SECONDS
+        )
+        return len(self.long_stretch_ends) + int(current)
+
+    def has_github_events(self) -> bool:
+        """窗口内是否有 GitHub 类事件 (提交、PR、审查、Issue)"""
+        return any(self.counts)
+
+    def has_screen_events(self) -> bool:
+        """窗口内是否有屏幕类事件 (焦点切换、心跳)"""
+        return self.screen_events > 0
+
+    def github_record(self, period_hours: float, ts: float) -> GitHubRecord:
+        """推导窗口内的 GitHub 活动"""
+        commits, prs, reviews, issues = self.counts
+        return GitHubRecord(commits, prs, reviews, issues, period_hours, ts)
+
+    def screen_record(self, period_hours: float, ts: float) -> ScreenTimeRecord:
+        """推导窗口内的屏幕使用"""
+        return ScreenTimeRecord(
+            max(0.0, self.active_seconds) / 3600,
+            max(1, self.long_sessions()),
+            self.switches,
+            period_hours,
+            ts
+        )
+
+
+class ActivityIngestor:
+    """
+    原始活动事件接收器
+
+    - 提交的事件批次进入有界异步队列，超出上限时拒绝 (内存占用有界)
+    - 单个后台任务按批次取出事件，折叠进各用户的滚动计数器
+    - 每批处理后只为涉及的用户推导一次 GitHub 与屏幕数据，写入聚合器并提交状态；
+      窗口内没有某类事件时不写入该数据源，保留推送接口与连接器写入的负荷
+    """
+
+    def __init__(
+        self,
+        max_queued: int = settings.activity_queue_max_events,
+        window_minutes: float = settings.activity_window_minutes,
+        bucket_seconds: float = settings.activity_bucket_seconds
+    ):
+        self.max_queued = max_queued
+        self.window_seconds = window_minutes * 60
+        self.bucket_seconds = bucket_seconds
+        self._batches: Deque[List[ActivityEvent]] = deque()
+        self._queued = 0
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._counters: Dict[str, ActivityCounters] = {}
+        self._last_sweep = 0.0
+        self._stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "processed": 0,
+            "late_dropped": 0,
+            "future_dropped": 0,
+            "batches": 0,
+        }
+
+    @property
+    def period_hours(self) -> float:
+        return self.window_seconds / 3600
+
+    def submit(self, events: List[ActivityEvent]) -> bool:
+        """将一批事件放入队列，队列已满时返回 False"""
+        if self._queued + len(events) > self.max_queued:
+            self._stats["rejected"] += len(events)
+            return False
+        self._batches.append(events)
+        self._queued += len(events)
+        self._stats["accepted"] += len(events)
+        if self._ready is not None:
+            self._ready.set()
+        return True
+
+    async def drain(self) -> int:
+        """立即处理队列中的全部事件，返回处理的事件数"""
+        processed = 0
+        while self._batches:
+            batch = self._batches.popleft()
+            self._queued -= len(batch)
+            await self._process(batch)
+            processed += len(batch)
+        return processed
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            await self.drain()
+
+    def start(self) -> None:
+        """启动后台处理任务"""
+        if self._task is None:
+            self._ready = asyncio.Event()
+            if self._batches:
+                self._ready.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务并处理剩余事件"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._ready = None
+        await self.drain()
+
+    async def _process(self, batch: List[ActivityEvent]) -> None:
+        """折叠一批事件并更新涉及的用户"""
+        now = clock.now().timestamp()
+        window_start = now - self.window_seconds
+        # 超前服务端时间过多的事件会让计数器与聚合器的工作时间停滞到该时刻，直接丢弃
+        latest = now + settings.ingest_max_clock_skew_seconds
+        bucket_seconds = self.bucket_seconds
+        touched: Dict[str, ActivityCounters] = {}
+        late = 0
+        future = 0
+
+        for ts, event in sorted(((e.timestamp.timestamp(), e) for e in batch), key=_by_time):
+            if ts < window_start:
+                late += 1
+                continue
+            if ts > latest:
+                future += 1
+                continue
+            counters = self._counters.get(event.user_id)
+            if counters is None:
+                counters = self._counters[event.user_id] = ActivityCounters(event.team_id)
+            elif event.team_id is not None:
+                counters.team_id = event.team_id
+            counters.add(event.type, ts, event.app, event.count, bucket_seconds)
+            touched[event.user_id] = counters
+
+        self._stats["processed"] += len(batch) - late - future
+        self._stats["late_dropped"] += late
+        self._stats["future_dropped"] += future
+        self._stats["batches"] += 1
+
+        period = self.period_hours
+        for user_id, counters in touched.items():
+            counters.prune(window_start, bucket_seconds)
+            agg = registry.get_or_create(user_id, counters.team_id)
+            at = datetime.fromtimestamp(counters.last_event_ts)
+            if counters.has_github_events():
+                agg.update_github_data(counters.github_record(period, now), at=at)
+            if counters.has_screen_events():
+                agg.update_screen_data(counters.screen_record(period, now), at=at)
+            state = registry.commit(user_id)
+            if state.critical:
+                await scheduler.trigger_intervention(
+                    InterventionType.REST_REMINDER,
+                    force=True,
+                    user_id=user_id
+                )
+
+        if now - self._last_sweep >= self.window_seconds / 4:
+            self._sweep(window_start)
+            self._last_sweep = now
+
+    def _sweep(self, window_start: float) -> None:
+        """清理窗口内已无活动的用户计数器"""
+        idle = [
+            user_id for user_id, counters in self._counters.items()
+            if counters.last_event_ts < window_start
+        ]
+        for user_id in idle:
+            del self._counters[user_id]
+
+    def get_intensity(self, user_id: str) -> Optional[ActivityIntensity]:
+        """按需推导用户在滚动窗口内的活动强度，没有计数器时返回 None"""
+        counters = self._counters.get(user_id)
+        if counters is None:
+            return None
+        now = clock.now().timestamp()
+        counters.prune(now - self.window_seconds, self.bucket_seconds)
+        github = counters.github_record(self.period_hours, now)
+        screen = counters.screen_record(self.period_hours, now)
+        return ActivityIntensity(
+            user_id=user_id,
+            window_minutes=self.window_seconds / 60,
+            commits_count=github.commits_count,
+            pull_requests=github.pull_requests,
+            code_reviews=github.code_reviews,
+            issues_resolved=github.issues_resolved,
+            active_hours=screen.active_hours,
+            continuous_sessions=screen.continuous_sessions,
+            app_switches=screen.app_switches,
+            activity_intensity=github.activity_intensity,
+            screen_intensity=screen.screen_intensity,
+            last_event_at=datetime.fromtimestamp(counters.last_event_ts)
+        )
+
+    def get_stats(self) -> dict:
+        """获取接收统计"""
+        return {
+            **self._stats,
+            "queued": self._queued,
+            "max_queued": self.max_queued,
+            "tracked_users": len(self._counters),
+        }
+
+
+# 全局单例实例
+activity = ActivityIngestor()
@@ -0,0 +1,134 @@
+"""准入控制服务 - 数据写入限流与并发控制"""
+import math
+from collections import OrderedDict
+from typing import Dict, NamedTuple
+
+from ..core import clock
+from ..core.config import settings
+
+
+class TokenBucket:
+    """令牌桶 - 按固定速率补充令牌，允许一定突发"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def try_acquire(self, now: float) -> float:
+        """尝试取出一个令牌，成功返回 0，否则返回需要等待的秒数"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionDecision(NamedTuple):
+    """准入决策"""
+    admitted: bool
+    status_code: int = 200
+    retry_after: int = 0
+    reason: str = ""
+
+
+ADMITTED = AdmissionDecision(admitted=True)
+
+
+class AdmissionController:
+    """
+    准入控制器
+
+    - 每个采集端 (或用户) 一个令牌桶，超出速率返回 429
+    - 全局并发上限，其中为状态查询预留一部分槽位；
+      写入请求只能使用非预留槽位，超出时返回 503，查询请求不受写入压力影响
+    """
+
+    def __init__(
+        self,
+        rate: float = settings.ingest_rate_per_second,
+        burst: float = settings.ingest_burst,
+        max_concurrency: int = settings.max_concurrent_requests,
+        read_reserved: int = settings.read_reserved_slots,
+        max_keys: int = settings.admission_max_keys
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.ingest_limit = max(1, max_concurrency - read_reserved)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._in_flight_ingest = 0
+        self._in_flight_read = 0
+        self._counters: Dict[str, int] = {
+            "ingest_admitted": 0,
+            "ingest_shed_rate_limited": 0,
+            "ingest_shed_overloaded": 0,
+            "read_admitted": 0,
+            "read_shed_overloaded": 0,
+        }
+
+    def admit_ingest(self, key: str) -> AdmissionDecision:
+        """写入请求准入 (先检查全局并发，再检查采集端速率)"""
+        if self._in_flight_ingest >= self.ingest_limit or self._in_flight_total >= self.max_concurrency:
+            self._counters["ingest_shed_overloaded"] += 1
+            return AdmissionDecision(False, 503, 1, "服务繁忙，请稍后重试")
+
+        now = clock.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        wait = bucket.try_acquire(now)
+        if wait > 0:
+            self._counters["ingest_shed_rate_limited"] += 1
+            return AdmissionDecision(False, 429, max(1, math.ceil(wait)), "请求过于频繁")
+
+        self._in_flight_ingest += 1
+        self._counters["ingest_admitted"] += 1
+        return ADMITTED
+
+    def admit_read(self) -> AdmissionDecision:
+        """查询请求准入 (可使用包括预留槽位在内的全部并发)"""
+        if self._in_flight_total >= self.max_concurrency:
+            self._counters["read_shed_overloaded"] += 1
+            return AdmissionDecision(False, 503, 1, "服务繁忙，请稍后重试")
+        self._in_flight_read += 1
+        self._counters["read_admitted"] += 1
+        return ADMITTED
+
+    def release_ingest(self) -> None:
+        """写入请求完成"""
+        self._in_flight_ingest -= 1
+
+    def release_read(self) -> None:
+        """查询请求完成"""
+        self._in_flight_read -= 1
+
+    @property
+    def _in_flight_total(self) -> int:
+        return self._in_flight_ingest + self._in_flight_read
+
+    def get_stats(self) -> dict:
+        """获取准入统计"""
+        return {
+            **self._counters,
+            "in_flight_ingest": self._in_flight_ingest,
+            "in_flight_read": self._in_flight_read,
+            "ingest_limit": self.ingest_limit,
+            "max_concurrency": self.max_concurrency,
+            "tracked_keys": len(self._buckets),
+        }
+
+
+# 全局单例实例
+admission = AdmissionController()
@@ -1,155 +1,253 @@
 """认知负荷聚合计算服务"""
 from datetime import datetime
-from typing import Optional
-from ..core.config import settings
-from ..models.data_input import GitHubData, CalendarData, ScreenTimeData
-from ..models.energy import EnergyState, FatigueIndex
+from typing import Iterable, NamedTuple, Optional, Protocol, Union
+from ..core import clock
+from ..models.energy import (
+    EnergyLevel,
+    EnergyState,
+    FatigueIndex,
+    FatigueLevel,
+    energy_level,
+    fatigue_level,
+)
+from .scoring import scoring
+
+# 距离上次活动超过该小时数视为休息，重新开始计算连续工作时长
+_BREAK_HOURS = 0.5
+
+
+class _GitHubInput(Protocol):
+    @property
+    def activity_intensity(self) -> float: ...
+
+
+class _CalendarInput(Protocol):
+    @property
+    def meeting_intensity(self) -> float: ...
+
+
+class _ScreenInput(Protocol):
+    @property
+    def screen_intensity(self) -> float: ...
+
+
+class AggregatorState(NamedTuple):
+    """聚合器的可持久化状态 (数据源负荷值与工作时间，时间为 Unix 秒)"""
+    github_load: Optional[float]
+    calendar_load: Optional[float]
+    screen_load: Optional[float]
+    work_start: Optional[float]
+    last_activity: Optional[float]
+    continuous_work_hours: float
+
+
+class AggregatorScore(NamedTuple):
+    """按当前评分配置计算的精力与疲劳结果"""
+    energy: float
+    fatigue: float
+    energy_level: EnergyLevel
+    fatigue_level: FatigueLevel
+    critical: bool
+    github_contribution: float
+    calendar_contribution: float
+    screen_contribution: float
+    version: int
 
 
 class CognitiveLoadAggregator:
-    """认知负荷聚合器 - 计算精力槽和疲劳指数"""
-    
+    """
+    认知负荷聚合器 - 计算精力槽和疲劳指数
+
+    每个用户只保存各数据源的负荷值 (强度) 与工作时间等数值，精力与疲劳按需计算；
+    EnergyState / FatigueIndex 模型只在 API 边界构造
+    """
+
+    __slots__ = (
+        "_github_load", "_calendar_load", "_screen_load",
+        "_work_start", "_last_activity", "_continuous_hours",
+        "committed_version",
+    )
+
     def __init__(self):
-        # 最新的数据源
-        self._github_data: Optional[GitHubData] = None
-        self._calendar_data: Optional[CalendarData] = None
-        self._screen_data: Optional[ScreenTimeData] = None
-        
-        # 工作时间追踪
-        self._work_start_time: Optional[datetime] = None
-        self._last_activity_time: Optional[datetime] = None
-        self._continuous_work_hours: float = 0.0
-        
-        # 缓存的状态
-        self._cached_energy: Optional[EnergyState] = None
-        self._cached_fatigue: Optional[FatigueIndex] = None
-    
-    def update_github_data(self, data: GitHubData) -> None:
-        """更新 GitHub 数据"""
-        self._github_data = data
-        self._update_work_time()
-        self._invalidate_cache()
-    
-    def update_calendar_data(self, data: CalendarData) -> None:
-        """更新日历数据"""
-        self._calendar_data = data
-        self._update_work_time()
-        self._invalidate_cache()
-    
-    def update_screen_data(self, data: ScreenTimeData) -> None:
-        """更新屏幕时间数据"""
-        self._screen_data = data
-        self._update_work_time()
-        self._invalidate_cache()
-    
-    def _update_work_time(self) -> None:
+        # 最新的数据源负荷 (0-100)，未提交过数据时为 None
+        self._github_load: Optional[float] = None
+        self._calendar_load: Optional[float] = None
+        self._screen_load: Optional[float] = None
+
+        # 工作时间追踪 (Unix 秒)
+        self._work_start: Optional[float] = None
+        self._last_activity: Optional[float] = None
+        self._continuous_hours: float = 0.0
+
+        # 注册表最近一次提交状态时的评分配置版本
+        self.committed_version = 0
+
+    def update_github_data(self, data: _GitHubInput, at: Optional[datetime] = None) -> None:
+        """更新 GitHub 数据 (at 为事件时间，默认当前时间)"""
+        self._github_load = data.activity_intensity
+        self._update_work_time(at)
+
+    def update_calendar_data(self, data: _CalendarInput, at: Optional[datetime] = None) -> None:
+        """更新日历数据 (at 为事件时间，默认当前时间)"""
+        self._calendar_load = data.meeting_intensity
+        self._update_work_time(at)
+
+    def update_screen_data(self, data: _ScreenInput, at: Optional[datetime] = None) -> None:
+        """更新屏幕时间数据 (at 为事件时间，默认当前时间)"""
+        self._screen_load = data.screen_intensity
+        self._update_work_time(at)
+
+    def update_batch(
+        self,
+        source: str,
+        last: Union[_GitHubInput, _CalendarInput, _ScreenInput],
+        timestamps: Iterable[float]
+    ) -> None:
+        """
+        按顺序写入同一数据源的一批记录 (timestamps 为各条记录的 Unix 秒)
+
+        负荷只取决于最后一条记录，工作时间按各条记录的时间依次推进，结果与逐条写入相同
+        """
+        if source == "github":
+            self._github_load = last.activity_intensity
+        elif source == "calendar":
+            self._calendar_load = last.meeting_intensity
+        else:
+            self._screen_load = last.screen_intensity
+        for ts in timestamps:
+            self._advance_work_time(ts)
+
+    def _update_work_time(self, at: Optional[datetime] = None) -> None:
         """更新工作时间追踪"""
-        now = datetime.now()
-        
-        if self._work_start_time is None:
-            self._work_start_time = now
-        
-        if self._last_activity_time is not None:
+        self._advance_work_time((at or clock.now()).timestamp())
+
+    def _advance_work_time(self, now: float) -> None:
+        """按活动时间 (Unix 秒) 推进工作时间"""
+        last = self._last_activity
+
+        # 乱序到达的事件不回拨时间
+        if last is not None and now < last:
+            now = last
+
+        if self._work_start is None:
+            self._work_start = now
+
+        if last is not None:
             # 如果距离上次活动超过 30 分钟，重置工作开始时间
-            gap = (now - self._last_activity_time).total_seconds() / 3600
-            if gap > 0.5:  # 30 分钟无活动视为休息
-                self._work_start_time = now
-                self._continuous_work_hours = 0.0
+            if (now - last) / 3600 > _BREAK_HOURS:
+                self._work_start = now
+                self._continuous_hours = 0.0
             else:
-                self._continuous_work_hours = (now - self._work_start_time).total_seconds() / 3600
-        
-        self._last_activity_time = now
-    
-    def _invalidate_cache(self) -> None:
-        """使缓存失效"""
-        self._cached_energy = None
-        self._cached_fatigue = None
-    
-    def calculate_energy(self) -> EnergyState:
+                self._continuous_hours = (now - self._work_start) / 3600
+
+        self._last_activity = now
+
+    def dump_state(self) -> AggregatorState:
+        """导出可持久化状态"""
+        return AggregatorState(
+            github_load=self._github_load,
+            calendar_load=self._calendar_load,
+            screen_load=self._screen_load,
+            work_start=self._work_start,
+            last_activity=self._last_activity,
+            continuous_work_hours=self._continuous_hours
+        )
+
+    def load_state(self, state: AggregatorState) -> None:
+        """载入持久化状态"""
+        self._github_load = state.github_load
+        self._calendar_load = state.calendar_load
+        self._screen_load = state.screen_load
+        self._work_start = state.work_start
+        self._last_activity = state.last_activity
+        self._continuous_hours = state.continuous_work_hours
+        self.committed_version = 0
+
+    @property
+    def stale(self) -> bool:
+        """注册表中的状态是否尚未按当前版本的评分配置提交"""
+        return self.committed_version != scoring.version
+
+    def score(self) -> AggregatorScore:
         """
-        计算精力槽状态
-        
-        公式: energy = 100 - (github_weight * github_load 
-                            + calendar_weight * calendar_load 
+        按当前评分配置计算精力与疲劳
+
+        公式: energy = 100 - (github_weight * github_load
+                            + calendar_weight * calendar_load
                             + screen_weight * screen_load)
+              fatigue = base_fatigue * (1 + duration_factor * hours_worked)
+              其中 base_fatigue = 100 - energy
         """
-        if self._cached_energy is not None:
-            return self._cached_energy
-        
-        # 获取各数据源的负荷值
-        github_load = self._github_data.activity_intensity if self._github_data else 0
-        calendar_load = self._calendar_data.meeting_intensity if self._calendar_data else 0
-        screen_load = self._screen_data.screen_intensity if self._screen_data else 0
-        
-        # 加权计算贡献
-        github_contribution = settings.github_weight * github_load
-        calendar_contribution = settings.calendar_weight * calendar_load
-        screen_contribution = settings.screen_weight * screen_load
-        
-        # 计算总负荷和精力值
+        active = scoring.active
+        config = active.config
+
+        # 加权计算各数据源的负荷贡献
+        github_contribution = config.github_weight * (self._github_load or 0)
+        calendar_contribution = config.calendar_weight * (self._calendar_load or 0)
+        screen_contribution = config.screen_weight * (self._screen_load or 0)
         total_load = github_contribution + calendar_contribution + screen_contribution
-        energy_value = max(0, 100 - total_load)
-        
-        # 创建精力状态对象
-        self._cached_energy = EnergyState.from_value(
-            value=energy_value,
+        energy = max(0.0, min(100.0, 100 - total_load))
+
+        # 根据持续工作时间增加疲劳
+        duration_multiplier = 1 + config.fatigue_duration_factor * self._continuous_hours
+        fatigue = max(0.0, min(100.0, (100 - energy) * duration_multiplier))
+
+        return AggregatorScore(
+            energy=energy,
+            fatigue=fatigue,
+            energy_level=energy_level(energy),
+            fatigue_level=fatigue_level(fatigue),
+            critical=(
+                energy <= config.energy_critical_threshold or
+                fatigue >= config.fatigue_critical_threshold
+            ),
             github_contribution=github_contribution,
             calendar_contribution=calendar_contribution,
-            screen_contribution=screen_contribution
+            screen_contribution=screen_contribution,
+            version=active.version
+        )
+
+    def calculate_energy(self) -> EnergyState:
+        """计算精力槽状态"""
+        score = self.score()
+        return EnergyState.from_value(
+            value=score.energy,
+            github_contribution=score.github_contribution,
+            calendar_contribution=score.calendar_contribution,
+            screen_contribution=score.screen_contribution
         )
-        
-        return self._cached_energy
-    
+
     def calculate_fatigue(self) -> FatigueIndex:
-        """
-        计算疲劳指数
-        
-        公式: fatigue = base_fatigue * (1 + duration_factor * hours_worked)
-        其中 base_fatigue = 100 - energy
-        """
-        if self._cached_fatigue is not None:
-            return self._cached_fatigue
-        
-        # 获取精力状态
-        energy = self.calculate_energy()
-        base_fatigue = 100 - energy.value
-        
-        # 根据持续工作时间增加疲劳
-        duration_multiplier = 1 + settings.fatigue_duration_factor * self._continuous_work_hours
-        fatigue_value = min(100, base_fatigue * duration_multiplier)
-        
-        # 创建疲劳指数对象
-        self._cached_fatigue = FatigueIndex.from_value(
-            value=fatigue_value,
-            continuous_hours=self._continuous_work_hours
+        """计算疲劳指数"""
+        return FatigueIndex.from_value(
+            value=self.score().fatigue,
+            continuous_hours=self._continuous_hours
         )
-        
-        return self._cached_fatigue
-    
+
     def needs_intervention(self) -> bool:
         """判断是否需要干预"""
-        energy = self.calculate_energy()
-        fatigue = self.calculate_fatigue()
-        
-        return (
-            energy.value <= settings.energy_critical_threshold or
-            fatigue.value >= settings.fatigue_critical_threshold
-        )
-    
+        return self.score().critical
+
     def get_status_summary(self) -> dict:
         """获取状态摘要"""
-        energy = self.calculate_energy()
-        fatigue = self.calculate_fatigue()
-        
+        score = self.score()
+        energy = EnergyState.from_value(
+            value=score.energy,
+            github_contribution=score.github_contribution,
+            calendar_contribution=score.calendar_contribution,
+            screen_contribution=score.screen_contribution
+        )
+        fatigue = FatigueIndex.from_value(score.fatigue, continuous_hours=self._continuous_hours)
+
         return {
             "energy": energy.model_dump(),
             "fatigue": fatigue.model_dump(),
-            "needs_intervention": self.needs_intervention(),
-            "continuous_work_hours": round(self._continuous_work_hours, 2),
+            "needs_intervention": score.critical,
+            "continuous_work_hours": round(self._continuous_hours, 2),
             "data_sources": {
-                "github": self._github_data is not None,
-                "calendar": self._calendar_data is not None,
-                "screen": self._screen_data is not None
+                "github": self._github_load is not None,
+                "calendar": self._calendar_load is not None,
+                "screen": self._screen_load is not None
             }
         }
 
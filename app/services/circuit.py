@@ -0,0 +1,104 @@
+"""熔断器服务 - 隔离失效的 Webhook 端点"""
+from datetime import datetime
+from typing import Optional
+
+from ..core import clock
+from ..core.config import settings
+from ..models.intervention import CircuitState, CircuitStatus
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    - 关闭: 正常放行，连续失败达到阈值后打开
+    - 打开: 直接拒绝，经过探测间隔后进入半开
+    - 半开: 放行有限的探测请求，成功则关闭，失败则重新打开
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.circuit_failure_threshold,
+        recovery_seconds: float = settings.circuit_recovery_seconds,
+        half_open_max_calls: int = settings.circuit_half_open_max_calls
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._opened_at_monotonic = 0.0
+        self._half_open_calls = 0
+
+        self.consecutive_failures = 0
+        self.total_successes = 0
+        self.total_failures = 0
+        self.total_skipped = 0
+        self.opened_at: Optional[datetime] = None
+        self.last_failure_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> CircuitState:
+        """当前状态 (打开状态超过探测间隔后视为半开)"""
+        if (
+            self._state == CircuitState.OPEN and
+            clock.monotonic() - self._opened_at_monotonic >= self.recovery_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """判断是否放行一次请求，拒绝时计入跳过次数"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        self.total_skipped += 1
+        return False
+
+    def release_probe(self) -> None:
+        """归还一次未得出结果的探测名额 (如投递被取消)"""
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        """记录一次成功"""
+        self.total_successes += 1
+        self.consecutive_failures = 0
+        self._state = CircuitState.CLOSED
+        self.opened_at = None
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        """记录一次失败"""
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        self.last_failure_at = clock.now()
+        self.last_error = error
+        if (
+            self._state == CircuitState.HALF_OPEN or
+            self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at_monotonic = clock.monotonic()
+        self._half_open_calls = 0
+        self.opened_at = clock.now()
+
+    def get_status(self) -> CircuitStatus:
+        """获取熔断器状态与统计"""
+        return CircuitStatus(
+            state=self.state,
+            consecutive_failures=self.consecutive_failures,
+            total_successes=self.total_successes,
+            total_failures=self.total_failures,
+            total_skipped=self.total_skipped,
+            opened_at=self.opened_at,
+            last_failure_at=self.last_failure_at,
+            last_error=self.last_error
+        )
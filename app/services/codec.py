@@ -0,0 +1,230 @@
+"""
+紧凑二进制记录编解码
+
+内容类型 application/x-burnout-records 的请求体为若干条定长记录 (小端序，每条 32 字节，
+与状态快照中的数据源记录布局相同)：
+
+- github:   <IIIIdd  commits_count, pull_requests, code_reviews, issues_resolved, period_hours, timestamp
+- calendar: <IdIdd   meetings_count, total_meeting_hours, back_to_back_meetings, period_hours, timestamp
+- screen:   <dIIdd   active_hours, continuous_sessions, app_switches, period_hours, timestamp
+
+timestamp 为 Unix 秒，0 表示使用服务端当前时间；晚于服务端时间超过允许的时钟偏差或早于
+最大记录时长的记录会被拒绝 (聚合器不回拨工作时间，一条未来时间的记录会让工作时长停滞到该时刻)。解码结果是与数据输入模型字段同名、
+共用强度计算函数的轻量记录，只做字段范围检查，绕过 JSON 解析与 pydantic 模型构造。
+
+批量请求体按列整体校验 (内置 min/max/sum 在 C 层遍历)，只为最后一条记录构造记录对象：
+聚合器的负荷只取决于最后一条记录，工作时间只需要各条记录的时间戳
+"""
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from ..core import clock
+from ..core.config import settings
+from ..models.data_input import (
+    GitHubData,
+    CalendarData,
+    ScreenTimeData,
+    compute_activity_intensity,
+    compute_meeting_intensity,
+    compute_screen_intensity,
+)
+
+BINARY_CONTENT_TYPE = "application/x-burnout-records"
+
+RECORD_STRUCTS: Dict[str, struct.Struct] = {
+    "github": struct.Struct("<IIIIdd"),
+    "calendar": struct.Struct("<IdIdd"),
+    "screen": struct.Struct("<dIIdd"),
+}
+
+# 合法时间戳上限 (约 5138 年)，同时拒绝 inf/nan
+_MAX_TS = 1e11
+_INF = float("inf")
+
+
+class GitHubRecord(NamedTuple):
+    """GitHub 活动记录 (字段与 GitHubData 相同)"""
+    commits_count: int
+    pull_requests: int
+    code_reviews: int
+    issues_resolved: int
+    period_hours: float
+    ts: float
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts)
+
+    @property
+    def activity_intensity(self) -> float:
+        return compute_activity_intensity(
+            self.commits_count, self.pull_requests, self.code_reviews,
+            self.issues_resolved, self.period_hours
+        )
+
+
+class CalendarRecord(NamedTuple):
+    """日历会议记录 (字段与 CalendarData 相同)"""
+    meetings_count: int
+    total_meeting_hours: float
+    back_to_back_meetings: int
+    period_hours: float
+    ts: float
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts)
+
+    @property
+    def meeting_intensity(self) -> float:
+        return compute_meeting_intensity(
+            self.total_meeting_hours, self.back_to_back_meetings, self.period_hours
+        )
+
+
+class ScreenTimeRecord(NamedTuple):
+    """屏幕使用记录 (字段与 ScreenTimeData 相同)"""
+    active_hours: float
+    continuous_sessions: int
+    app_switches: int
+    period_hours: float
+    ts: float
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts)
+
+    @property
+    def screen_intensity(self) -> float:
+        return compute_screen_intensity(
+            self.active_hours, self.continuous_sessions, self.app_switches, self.period_hours
+        )
+
+
+DataRecord = Union[GitHubRecord, CalendarRecord, ScreenTimeRecord]
+
+RECORD_TYPES: Dict[str, Type[DataRecord]] = {
+    "github": GitHubRecord,
+    "calendar": CalendarRecord,
+    "screen": ScreenTimeRecord,
+}
+
+
+class RecordBatch(NamedTuple):
+    """解码后的一批同源记录"""
+    source: str
+    count: int
+    # 最后一条记录 (时间戳为 0 时已替换为服务端当前时间)
+    last: DataRecord
+    # 各条记录的 Unix 秒 (按请求体顺序)
+    timestamps: List[float]
+
+
+def _valid(source: str, fields: tuple) -> bool:
+    """单条记录的字段范围检查 (无符号整数已由记录布局保证非负；比较式同时拒绝 nan)"""
+    if not (0 < fields[-2] < _INF and 0 <= fields[-1] < _MAX_TS):
+        return False
+    if source == "calendar":
+        return 0 <= fields[1] < _INF
+    if source == "screen":
+        return 0 <= fields[0] < _INF and fields[1] >= 1
+    return True
+
+
+def _bounds(column: Sequence[float]) -> Optional[Tuple[float, float]]:
+    """浮点列的 (最小值, 最大值)，含 nan 时返回 None (nan 会使求和结果为 nan)"""
+    total = sum(column)
+    if total != total:
+        return None
+    return min(column), max(column)
+
+
+def _columns_valid(source: str, columns: List[tuple]) -> bool:
+    """按列检查一批记录的字段范围，与逐条调用 _valid 等价"""
+    period = _bounds(columns[-2])
+    ts = _bounds(columns[-1])
+    if period is None or ts is None:
+        return False
+    if not (period[0] > 0 and period[1] < _INF and ts[0] >= 0 and ts[1] < _MAX_TS):
+        return False
+    if source == "calendar":
+        hours = _bounds(columns[1])
+        return hours is not None and hours[0] >= 0 and hours[1] < _INF
+    if source == "screen":
+        active = _bounds(columns[0])
+        return active is not None and active[0] >= 0 and active[1] < _INF and min(columns[1]) >= 1
+    return True
+
+
+def _unpack(source: str, body: bytes) -> List[tuple]:
+    """拆分请求体并校验 (长度不是记录大小的整数倍或字段越界时抛出 ValueError)"""
+    record = RECORD_STRUCTS[source]
+    if not body or len(body) % record.size:
+        raise ValueError(f"请求体长度 {len(body)} 不是 {source} 记录大小 {record.size} 的整数倍")
+    rows = list(record.iter_unpack(body))
+    if len(rows) == 1:
+        if not _valid(source, rows[0]):
+            raise ValueError(f"第 0 条 {source} 记录的字段超出范围")
+        return rows
+    if not _columns_valid(source, list(zip(*rows))):
+        # 只在出错时逐条定位越界的记录
+        index = next(i for i, fields in enumerate(rows) if not _valid(source, fields))
+        raise ValueError(f"第 {index} 条 {source} 记录的字段超出范围")
+    return rows
+
+
+def _check_times(source: str, timestamps: List[float], now_ts: float) -> None:
+    """时间戳须在 [服务端时间 - 最大记录时长, 服务端时间 + 时钟偏差] 内，否则抛出 ValueError"""
+    earliest = now_ts - settings.ingest_max_record_age_seconds
+    latest = now_ts + settings.ingest_max_clock_skew_seconds
+    if min(timestamps) < earliest or max(timestamps) > latest:
+        index = next(i for i, ts in enumerate(timestamps) if not earliest <= ts <= latest)
+        raise ValueError(f"第 {index} 条 {source} 记录的时间戳超出服务端时间允许的范围")
+
+
+def decode_batch(source: str, body: bytes) -> RecordBatch:
+    """解码一条或一批记录，只构造最后一条记录对象 (用于直接写入聚合器)"""
+    rows = _unpack(source, body)
+    timestamps = [fields[-1] for fields in rows]
+    now_ts = clock.now().timestamp()
+    if 0 in timestamps:
+        timestamps = [ts or now_ts for ts in timestamps]
+    _check_times(source, timestamps, now_ts)
+    last = RECORD_TYPES[source]._make(rows[-1][:-1] + (timestamps[-1],))
+    return RecordBatch(source, len(rows), last, timestamps)
+
+
+def decode_records(source: str, body: bytes) -> List[DataRecord]:
+    """解码一条或一批记录为记录对象列表 (长度不是记录大小的整数倍、字段或时间戳越界时抛出 ValueError)"""
+    rows = _unpack(source, body)
+    make = RECORD_TYPES[source]._make
+    now_ts = clock.now().timestamp()
+    records = []
+    for fields in rows:
+        if fields[-1] == 0:
+            fields = fields[:-1] + (now_ts,)
+        records.append(make(fields))
+    _check_times(source, [record.ts for record in records], now_ts)
+    return records
+
+
+def encode_records(
+    source: str,
+    samples: Iterable[Union[GitHubData, CalendarData, ScreenTimeData, DataRecord]]
+) -> bytes:
+    """将数据样本编码为定长记录 (供采集端、基准测试与状态快照使用)"""
+    pack = RECORD_STRUCTS[source].pack
+    parts = []
+    for s in samples:
+        ts = s.timestamp.timestamp() if s.timestamp is not None else 0.0
+        if source == "github":
+            parts.append(pack(s.commits_count, s.pull_requests, s.code_reviews,
+                              s.issues_resolved, s.period_hours, ts))
+        elif source == "calendar":
+            parts.append(pack(s.meetings_count, s.total_meeting_hours,
+                              s.back_to_back_meetings, s.period_hours, ts))
+        else:
+            parts.append(pack(s.active_hours, s.continuous_sessions,
+                              s.app_switches, s.period_hours, ts))
+    return b"".join(parts)
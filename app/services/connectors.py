@@ -0,0 +1,136 @@
+"""数据连接器调度服务"""
+import asyncio
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import httpx
+
+from ..connectors import CONNECTOR_TYPES, PullConnector
+from ..core import clock
+from ..core.config import settings
+from ..models.connector import ConnectorConfig, ConnectorStatus
+from ..models.intervention import InterventionType
+from .registry import registry
+from .scheduler import scheduler
+
+# 连续失败时轮询间隔的最大放大倍数
+MAX_BACKOFF_FACTOR = 16
+
+
+class ConnectorManager:
+    """
+    连接器管理器
+
+    每个启用的连接器一个轮询任务，所有连接器共享一个有界 HTTP 连接池；
+    轮询结果写入对应用户的聚合器并触发与数据输入接口相同的干预检查
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.connector_max_connections,
+        max_keepalive: int = settings.connector_max_keepalive,
+        timeout: float = settings.connector_timeout
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+        self._timeout = timeout
+        self._connectors: Dict[UUID, PullConnector] = {}
+        self._tasks: Dict[UUID, asyncio.Task] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._running = False
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """获取共享 HTTP 客户端"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+        return self._http_client
+
+    def register(self, config: ConnectorConfig) -> ConnectorConfig:
+        """注册连接器 (服务运行中时立即开始轮询)"""
+        self.unregister(config.id)
+        connector = CONNECTOR_TYPES[config.kind](config)
+        self._connectors[config.id] = connector
+        if self._running and config.enabled:
+            self._spawn(connector)
+        return config
+
+    def unregister(self, connector_id: UUID) -> bool:
+        """注销连接器并停止其轮询任务"""
+        task = self._tasks.pop(connector_id, None)
+        if task is not None:
+            task.cancel()
+        return self._connectors.pop(connector_id, None) is not None
+
+    def get_status(self, connector_id: UUID) -> Optional[ConnectorStatus]:
+        """获取连接器状态"""
+        connector = self._connectors.get(connector_id)
+        return connector.get_status() if connector is not None else None
+
+    def list_statuses(self) -> List[ConnectorStatus]:
+        """列出所有连接器状态"""
+        return [connector.get_status() for connector in self._connectors.values()]
+
+    async def poll(self, connector_id: UUID) -> Optional[ConnectorStatus]:
+        """立即轮询一次指定连接器，不存在时返回 None"""
+        connector = self._connectors.get(connector_id)
+        if connector is None:
+            return None
+        await self._poll_and_apply(connector)
+        return connector.get_status()
+
+    async def _poll_and_apply(self, connector: PullConnector) -> bool:
+        """轮询并将结果写入聚合器，返回是否成功"""
+        config = connector.config
+        try:
+            client = await self._get_client()
+            data = await connector.poll(client, clock.now())
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            connector.record_failure(f"{type(e).__name__}: {e}")
+            return False
+
+        aggregator = registry.get_or_create(config.user_id, config.team_id)
+        getattr(aggregator, f"update_{connector.source}_data")(data)
+        state = registry.commit(config.user_id)
+        if state.critical:
+            await scheduler.trigger_intervention(
+                InterventionType.REST_REMINDER,
+                force=True,
+                user_id=config.user_id
+            )
+        return True
+
+    async def _run(self, connector: PullConnector) -> None:
+        """轮询循环 (连续失败时指数退避)"""
+        while True:
+            await self._poll_and_apply(connector)
+            factor = min(2 ** connector.consecutive_failures, MAX_BACKOFF_FACTOR)
+            await asyncio.sleep(connector.poll_interval * factor)
+
+    def _spawn(self, connector: PullConnector) -> None:
+        self._tasks[connector.config.id] = asyncio.create_task(self._run(connector))
+
+    def start(self) -> None:
+        """启动所有启用的连接器"""
+        if self._running:
+            return
+        self._running = True
+        for connector in self._connectors.values():
+            if connector.config.enabled:
+                self._spawn(connector)
+
+    async def stop(self) -> None:
+        """停止所有轮询任务并关闭连接池"""
+        self._running = False
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+
+
+# 全局单例实例
+connectors = ConnectorManager()
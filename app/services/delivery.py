@@ -0,0 +1,228 @@
+"""干预投递通道 - 按紧急程度分通道排队，各通道独立的工作协程与队列上限"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+from uuid import UUID
+
+from ..core.config import settings
+from ..models.intervention import (
+    DeliveryLaneStatus,
+    InterventionEvent,
+    InterventionType,
+    InterventionUrgency,
+    recovery_urgency,
+)
+from .payload import RenderedEvent
+from .tracing import Trace, tracer
+
+# 通道按紧急程度从高到低排列
+LANE_ORDER: List[InterventionUrgency] = [
+    InterventionUrgency.CRITICAL,
+    InterventionUrgency.HIGH,
+    InterventionUrgency.MEDIUM,
+    InterventionUrgency.LOW,
+]
+
+# 各干预类型的默认投递通道
+TYPE_LANES: Dict[InterventionType, InterventionUrgency] = {
+    InterventionType.LOCK_SCREEN: InterventionUrgency.CRITICAL,
+    InterventionType.BLOCK_APPS: InterventionUrgency.CRITICAL,
+    InterventionType.REST_REMINDER: InterventionUrgency.HIGH,
+    InterventionType.MEDITATION: InterventionUrgency.MEDIUM,
+    InterventionType.STRETCH_BREAK: InterventionUrgency.MEDIUM,
+    InterventionType.HYDRATION: InterventionUrgency.LOW,
+    InterventionType.EYE_REST: InterventionUrgency.LOW,
+}
+
+# 每个通道保留的近期排队延迟样本数
+LATENCY_SAMPLES = 1024
+
+
+def select_lane(intervention_type: InterventionType, fatigue: float) -> InterventionUrgency:
+    """
+    选择投递通道
+
+    以干预类型的默认通道为准；用户当前的恢复紧急程度更高时提升一级，
+    避免提醒类干预因用户状态整体涌入 critical 通道
+    """
+    lane = TYPE_LANES[intervention_type]
+    index = LANE_ORDER.index(lane)
+    if index > 0 and LANE_ORDER.index(recovery_urgency(fatigue)) < index:
+        return LANE_ORDER[index - 1]
+    return lane
+
+
+class DeliveryJob:
+    """
+    一次干预事件的 Webhook 投递任务
+
+    创建时记录当前请求的追踪，工作协程投递时重新绑定，使 webhook 阶段计入触发请求的追踪
+    """
+
+    __slots__ = ("event", "rendered", "webhook_ids", "enqueued_at", "done", "trace")
+
+    def __init__(self, event: InterventionEvent, rendered: RenderedEvent, webhook_ids: List[UUID]):
+        self.event = event
+        self.rendered = rendered
+        self.webhook_ids = webhook_ids
+        self.enqueued_at = 0.0
+        self.done: Optional[asyncio.Future] = None
+        self.trace: Optional[Trace] = tracer.current()
+
+
+DeliveryHandler = Callable[[DeliveryJob], Awaitable[None]]
+
+
+class _Lane:
+    """单个投递通道"""
+
+    __slots__ = (
+        "name", "workers", "max_queue", "slo_ms", "queue", "tasks",
+        "enqueued", "delivered", "dropped", "slo_violations", "latencies",
+    )
+
+    def __init__(self, name: InterventionUrgency, workers: int, max_queue: int, slo_ms: Optional[float]):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.slo_ms = slo_ms
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.slo_violations = 0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def record_latency(self, latency_ms: float) -> None:
+        self.latencies.append(latency_ms)
+        if self.slo_ms is not None and latency_ms > self.slo_ms:
+            self.slo_violations += 1
+
+    def get_status(self) -> DeliveryLaneStatus:
+        samples = sorted(self.latencies)
+        return DeliveryLaneStatus(
+            lane=self.name,
+            workers=self.workers,
+            max_queue=self.max_queue,
+            queued=self.queue.qsize() if self.queue is not None else 0,
+            enqueued=self.enqueued,
+            delivered=self.delivered,
+            dropped=self.dropped,
+            latency_p50_ms=_percentile(samples, 0.5),
+            latency_p99_ms=_percentile(samples, 0.99),
+            latency_max_ms=samples[-1] if samples else None,
+            slo_ms=self.slo_ms,
+            slo_violations=self.slo_violations
+        )
+
+
+class DeliveryLanes:
+    """
+    干预投递通道
+
+    - 每个紧急程度一个有界队列与一组工作协程，低优先级通道积压不会占用高优先级通道的工作协程
+    - 队列已满时丢弃新任务并计数，不阻塞干预判断
+    - 未启动时 (如离线工具) 由调用方直接投递
+    """
+
+    def __init__(
+        self,
+        handler: DeliveryHandler,
+        workers: Dict[str, int] = settings.delivery_lane_workers,
+        queue_limits: Dict[str, int] = settings.delivery_lane_queue_limits,
+        critical_slo_ms: float = settings.delivery_critical_slo_ms
+    ):
+        self._handler = handler
+        self._lanes: Dict[InterventionUrgency, _Lane] = {
+            lane: _Lane(
+                lane,
+                workers=max(1, workers.get(lane.value, 1)),
+                max_queue=max(1, queue_limits.get(lane.value, 100)),
+                slo_ms=critical_slo_ms if lane == InterventionUrgency.CRITICAL else None
+            )
+            for lane in LANE_ORDER
+        }
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def submit(self, lane: InterventionUrgency, job: DeliveryJob) -> bool:
+        """将投递任务放入通道，队列已满时返回 False"""
+        state = self._lanes[lane]
+        job.enqueued_at = time.perf_counter()
+        try:
+            state.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            state.dropped += 1
+            return False
+        state.enqueued += 1
+        return True
+
+    async def _work(self, state: _Lane) -> None:
+        queue = state.queue
+        while True:
+            job: DeliveryJob = await queue.get()
+            state.record_latency((time.perf_counter() - job.enqueued_at) * 1000)
+            token = tracer.activate(job.trace)
+            try:
+                await self._handler(job)
+            except Exception as e:
+                print(f"干预投递失败: {job.event.id} - {e}")
+            finally:
+                tracer.deactivate(token)
+                state.delivered += 1
+                queue.task_done()
+                if job.done is not None and not job.done.done():
+                    job.done.set_result(None)
+
+    def start(self) -> None:
+        """启动各通道的工作协程"""
+        if self._running:
+            return
+        for state in self._lanes.values():
+            state.queue = asyncio.Queue(maxsize=state.max_queue)
+            state.tasks = [
+                asyncio.create_task(self._work(state)) for _ in range(state.workers)
+            ]
+        self._running = True
+
+    async def stop(self, drain_timeout: float = settings.webhook_timeout) -> None:
+        """停止工作协程，按优先级顺序在限定时间内尽量投递完排队中的任务"""
+        if not self._running:
+            return
+        self._running = False
+        deadline = time.perf_counter() + drain_timeout
+        for lane in LANE_ORDER:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._lanes[lane].queue.join(), remaining)
+            except asyncio.TimeoutError:
+                break
+        for state in self._lanes.values():
+            for task in state.tasks:
+                task.cancel()
+            await asyncio.gather(*state.tasks, return_exceptions=True)
+            # 未能投递的任务放弃，唤醒等待中的调用方
+            while not state.queue.empty():
+                job = state.queue.get_nowait()
+                state.dropped += 1
+                if job.done is not None and not job.done.done():
+                    job.done.set_result(None)
+            state.tasks = []
+            state.queue = None
+
+    def get_status(self) -> List[DeliveryLaneStatus]:
+        """获取各通道状态 (按紧急程度从高到低)"""
+        return [self._lanes[lane].get_status() for lane in LANE_ORDER]
+
+
+def _percentile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
@@ -0,0 +1,93 @@
+"""流式导出服务 - 以生成器逐块输出 NDJSON/CSV，可选 gzip 压缩"""
+import csv
+import io
+import zlib
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+# 输出块的目标大小
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    """导出格式枚举"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def to_local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """将带时区的时间转换为本地无时区时间，与存储的时间戳保持一致"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[bytes]:
+    """将 JSON 行合并为输出块"""
+    buffer: list = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= CHUNK_SIZE:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence[object]]) -> Iterator[bytes]:
+    """将行数据编码为 CSV 输出块 (含表头)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """以 gzip 格式流式压缩输出块"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """判断客户端是否接受 gzip 编码"""
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def encode_stream(
+    export_format: ExportFormat,
+    ndjson_lines: Callable[[], Iterable[str]],
+    csv_header: Sequence[str],
+    csv_rows: Callable[[], Iterable[Sequence[object]]],
+    gzip: bool = False
+) -> Iterator[bytes]:
+    """按格式编码导出流"""
+    if export_format == ExportFormat.CSV:
+        chunks = iter_csv(csv_header, csv_rows())
+    else:
+        chunks = iter_ndjson(ndjson_lines())
+    return gzip_stream(chunks) if gzip else chunks
@@ -0,0 +1,174 @@
+"""精力历史存储服务"""
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, NamedTuple, Optional, TextIO
+
+from ..core import clock
+from ..core.config import settings
+from .registry import UserState, registry
+
+
+class EnergyRecord(NamedTuple):
+    """一条精力历史记录"""
+    timestamp: datetime
+    user_id: str
+    team_id: Optional[str]
+    energy: float
+    fatigue: float
+
+    def to_json(self) -> str:
+        """序列化为 NDJSON 行 (不含换行符)"""
+        return json.dumps({
+            "timestamp": self.timestamp.isoformat(),
+            "user_id": self.user_id,
+            "team_id": self.team_id,
+            "energy": self.energy,
+            "fatigue": self.fatigue,
+        }, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "EnergyRecord":
+        """从 NDJSON 行解析"""
+        data = json.loads(line)
+        return cls(
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            user_id=data["user_id"],
+            team_id=data.get("team_id"),
+            energy=data["energy"],
+            fatigue=data["fatigue"],
+        )
+
+
+class EnergyHistoryStore:
+    """
+    精力历史存储
+
+    最近的记录保存在有界内存队列中；配置了 history_file 时，
+    所有记录同时以 NDJSON 追加写入文件，供离线回放和导出使用。
+    文件句柄保持打开并缓冲写入，由定期任务、读取前及关闭时刷新到磁盘
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = settings.history_file,
+        max_records: int = settings.history_max_records
+    ):
+        self.path = Path(path) if path else None
+        self._recent: Deque[EnergyRecord] = deque(maxlen=max_records)
+        self._file: Optional[TextIO] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _writer(self) -> TextIO:
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8", buffering=settings.history_buffer_bytes)
+        return self._file
+
+    def on_state_change(
+        self,
+        user_id: str,
+        old: Optional[UserState],
+        new: Optional[UserState]
+    ) -> None:
+        """记录用户的新状态"""
+        if new is not None:
+            self.append(EnergyRecord(clock.now(), user_id, new.team_id, new.energy, new.fatigue))
+
+    def append(self, record: EnergyRecord) -> None:
+        """追加一条记录"""
+        self._recent.append(record)
+        if self.path is not None:
+            self._writer().write(record.to_json() + "\n")
+
+    def extend(self, records: Iterable[EnergyRecord]) -> int:
+        """批量追加记录，返回写入数量"""
+        count = 0
+        f = self._writer() if self.path is not None else None
+        for record in records:
+            self._recent.append(record)
+            if f is not None:
+                f.write(record.to_json() + "\n")
+            count += 1
+        return count
+
+    def flush(self) -> None:
+        """将缓冲中的记录写入文件"""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """刷新并关闭文件句柄 (之后的写入会重新打开文件)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _run_periodic(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"精力历史刷新失败: {e}")
+
+    def start(self, interval: float = settings.history_flush_interval_seconds) -> None:
+        """启动定期刷新任务"""
+        if self.path is not None and self._task is None:
+            self._task = asyncio.create_task(self._run_periodic(interval))
+
+    async def stop(self) -> None:
+        """停止定期刷新任务并关闭文件"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.close()
+
+    def recent(self) -> Iterator[EnergyRecord]:
+        """遍历内存中的最近记录 (按时间升序)"""
+        return iter(list(self._recent))
+
+    def iter_records(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        team_id: Optional[str] = None
+    ) -> Iterator[EnergyRecord]:
+        """
+        按条件流式遍历历史记录
+
+        配置了文件时逐行读取文件 (内存占用与范围无关)，否则遍历内存中的最近记录
+        """
+        if self.path is not None:
+            records = self._iter_file()
+        else:
+            records = self.recent()
+        for record in records:
+            if start is not None and record.timestamp < start:
+                continue
+            if end is not None and record.timestamp > end:
+                continue
+            if user_id is not None and record.user_id != user_id:
+                continue
+            if team_id is not None and record.team_id != team_id:
+                continue
+            yield record
+
+    def _iter_file(self) -> Iterator[EnergyRecord]:
+        self.flush()
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield EnergyRecord.from_json(line)
+
+
+# 全局单例实例
+history = EnergyHistoryStore()
+registry.add_listener(history.on_state_change)
@@ -0,0 +1,97 @@
+"""Webhook 负载渲染服务 - 每个事件只序列化一次"""
+import json
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from ..models.intervention import InterventionEvent, WebhookConfig
+
+# 默认负载包含的字段 (按输出顺序)
+PAYLOAD_FIELDS: Tuple[str, ...] = (
+    "event_id",
+    "type",
+    "user_id",
+    "triggered_at",
+    "fatigue_level",
+    "energy_level",
+    "message",
+)
+
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class PayloadTemplate:
+    """
+    编译后的负载模板 (字段选择与重命名)
+
+    在注册 Webhook 时编译，相同模板的接收端共享同一份渲染结果
+    """
+
+    __slots__ = ("mapping", "key")
+
+    def __init__(
+        self,
+        fields: Optional[Tuple[str, ...]] = None,
+        renames: Optional[Mapping[str, str]] = None
+    ):
+        fields = tuple(fields) if fields else PAYLOAD_FIELDS
+        renames = dict(renames or {})
+        unknown = [f for f in (*fields, *renames) if f not in PAYLOAD_FIELDS]
+        if unknown:
+            raise ValueError(f"未知的负载字段: {', '.join(sorted(set(unknown)))}")
+        self.mapping: Tuple[Tuple[str, str], ...] = tuple(
+            (field, renames.get(field, field)) for field in fields
+        )
+        self.key = self.mapping
+
+    def render(self, values: Mapping[str, object]) -> bytes:
+        """按模板渲染为 JSON 字节"""
+        return _encode({target: values[source] for source, target in self.mapping})
+
+
+class PreparedWebhook:
+    """注册时预编译的 Webhook 投递参数 (负载模板与完整请求头)"""
+
+    __slots__ = ("template", "headers")
+
+    def __init__(self, config: WebhookConfig):
+        self.template = PayloadTemplate(config.payload_fields, config.payload_renames)
+        merged = dict(_JSON_CONTENT_TYPE)
+        merged.update(config.headers)
+        # 所有事件和重试共享同一份只读请求头
+        self.headers: Mapping[str, str] = MappingProxyType(merged)
+
+
+class RenderedEvent:
+    """
+    渲染后的干预事件
+
+    事件字段只提取一次，每种模板只序列化一次，
+    结果以不可变字节在所有接收端和重试之间共享
+    """
+
+    __slots__ = ("event", "values", "_bodies")
+
+    def __init__(self, event: InterventionEvent):
+        self.event = event
+        self.values: Dict[str, object] = {
+            "event_id": str(event.id),
+            "type": event.type.value,
+            "user_id": event.user_id,
+            "triggered_at": event.triggered_at.isoformat(),
+            "fatigue_level": event.fatigue_at_trigger,
+            "energy_level": event.energy_at_trigger,
+            "message": event.message,
+        }
+        self._bodies: Dict[Tuple[Tuple[str, str], ...], bytes] = {}
+
+    def body(self, template: PayloadTemplate) -> bytes:
+        """获取指定模板的负载字节 (首次调用时渲染)"""
+        body = self._bodies.get(template.key)
+        if body is None:
+            body = template.render(self.values)
+            self._bodies[template.key] = body
+        return body
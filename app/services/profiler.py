@@ -0,0 +1,71 @@
+"""CPU 性能剖析服务 - 采样调用栈并输出火焰图折叠格式"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict
+
+
+class ProfilerBusyError(RuntimeError):
+    """已有剖析正在进行"""
+
+
+class SamplingProfiler:
+    """
+    采样式 CPU 剖析器
+
+    在独立线程中按固定间隔采集进程内其他线程的调用栈，
+    结果为 Brendan Gregg 折叠栈格式 (每行 "帧;帧;帧 次数")，
+    可直接交给 flamegraph.pl、speedscope 或 inferno 渲染
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def capture(self, seconds: float, interval: float = 0.005) -> str:
+        """采样指定时长 (阻塞调用，应在线程中执行)，返回折叠栈文本"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("已有剖析正在进行")
+        try:
+            stacks = self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def _sample(self, seconds: float, interval: float) -> Counter:
+        own = threading.get_ident()
+        labels: Dict[object, str] = {}
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(parts))] += 1
+            time.sleep(interval)
+        return stacks
+
+
+def _frame_label(code) -> str:
+    """帧标签: 函数名 (文件名:起始行)，分号替换掉以免破坏折叠格式"""
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+# 全局单例实例
+profiler = SamplingProfiler()
@@ -0,0 +1,255 @@
+"""用户聚合器注册表"""
+import asyncio
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .aggregator import CognitiveLoadAggregator, aggregator
+from .scoring import ActiveScoring, scoring
+from .tracing import tracer
+from ..core.config import settings
+from ..models.energy import EnergyLevel, FatigueLevel
+
+
+class UserState(NamedTuple):
+    """用户状态快照 - 状态变更时作为增量的前后值"""
+    team_id: Optional[str]
+    energy: float
+    fatigue: float
+    energy_level: EnergyLevel
+    fatigue_level: FatigueLevel
+    critical: bool
+
+
+# 状态变更监听器: (user_id, 旧状态, 新状态)，新增用户时旧状态为 None，移除用户时新状态为 None
+StateListener = Callable[[str, Optional[UserState], Optional[UserState]], None]
+
+# 重置监听器: 批量恢复状态后调用，监听器应基于 states() 全量重建
+ResetListener = Callable[[], None]
+
+# 延迟加载器: 首次访问用户时根据恢复时提供的记录键构建其聚合器
+AggregatorLoader = Callable[[Any], CognitiveLoadAggregator]
+
+
+class UserRegistry:
+    """用户注册表 - 管理每个用户的聚合器并广播状态变更"""
+
+    DEFAULT_USER_ID = "default"
+
+    def __init__(self, default_aggregator: CognitiveLoadAggregator):
+        self._aggregators: Dict[str, CognitiveLoadAggregator] = {
+            self.DEFAULT_USER_ID: default_aggregator
+        }
+        self._teams: Dict[str, Optional[str]] = {}
+        self._states: Dict[str, UserState] = {}
+        self._pending: Dict[str, Any] = {}
+        self._loader: Optional[AggregatorLoader] = None
+        self._listeners: List[StateListener] = []
+        self._reset_listeners: List[ResetListener] = []
+        # 评分配置版本变化后待重算的用户
+        self._stale: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: StateListener) -> None:
+        """注册状态变更监听器"""
+        self._listeners.append(listener)
+
+    def add_reset_listener(self, listener: ResetListener) -> None:
+        """注册重置监听器"""
+        self._reset_listeners.append(listener)
+
+    def get(self, user_id: str) -> Optional[CognitiveLoadAggregator]:
+        """获取用户的聚合器 (延迟恢复的用户在首次访问时加载)"""
+        agg = self._aggregators.get(user_id)
+        if agg is None:
+            if user_id in self._pending:
+                agg = self._loader(self._pending.pop(user_id))
+                self._aggregators[user_id] = agg
+        return agg
+
+    def get_or_create(
+        self,
+        user_id: str,
+        team_id: Optional[str] = None
+    ) -> CognitiveLoadAggregator:
+        """获取或创建用户的聚合器，提供 team_id 时更新用户所属团队"""
+        agg = self.get(user_id)
+        if agg is None:
+            agg = CognitiveLoadAggregator()
+            self._aggregators[user_id] = agg
+        if team_id is not None:
+            self._teams[user_id] = team_id
+        return agg
+
+    def team_of(self, user_id: str) -> Optional[str]:
+        """获取用户所属团队"""
+        return self._teams.get(user_id)
+
+    def get_state(self, user_id: str) -> Optional[UserState]:
+        """获取用户最近一次提交的状态"""
+        return self._states.get(user_id)
+
+    def commit(self, user_id: str) -> UserState:
+        """
+        计算用户当前状态并在发生变化时通知监听器
+
+        每次数据更新后调用，监听器据此以增量方式维护汇总数据
+        """
+        agg = self._aggregators[user_id]
+        with tracer.span("score"):
+            score = agg.score()
+            agg.committed_version = score.version
+            new = UserState(
+                team_id=self._teams.get(user_id),
+                energy=score.energy,
+                fatigue=score.fatigue,
+                energy_level=score.energy_level,
+                fatigue_level=score.fatigue_level,
+                critical=score.critical
+            )
+
+        old = self._states.get(user_id)
+        if new != old:
+            self._states[user_id] = new
+            with tracer.span("notify"):
+                self._notify(user_id, old, new)
+        return new
+
+    def refresh(self, user_id: str) -> Optional[UserState]:
+        """
+        评分配置更新后惰性重算用户状态
+
+        状态基于旧版本配置提交时重新提交，使汇总与索引随读取逐步收敛到新配置
+        """
+        agg = self.get(user_id)
+        if agg is None or user_id not in self._states or not agg.stale:
+            return self._states.get(user_id)
+        return self.commit(user_id)
+
+    def on_scoring_change(self, active: ActiveScoring) -> None:
+        """评分配置切换后将全部已提交状态的用户加入待重算队列"""
+        self._stale = list(self._states)
+
+    def refresh_stale(self, limit: Optional[int] = None) -> int:
+        """
+        重算待重算队列中的用户 (limit 为本次最多处理的数量，为空时处理全部)
+
+        由后台任务分批调用，限制单次占用事件循环的时间；汇总读取路径不等待重算，
+        而是在结果中返回 stale_count。返回队列中剩余的用户数量
+        """
+        stale = self._stale
+        count = len(stale) if limit is None else min(limit, len(stale))
+        for _ in range(count):
+            self.refresh(stale.pop())
+        return len(stale)
+
+    @property
+    def stale_count(self) -> int:
+        """待重算的用户数量"""
+        return len(self._stale)
+
+    async def _sweep(self, batch: int, interval: float) -> None:
+        while True:
+            if self._stale:
+                self.refresh_stale(batch)
+                await asyncio.sleep(0)
+            else:
+                await asyncio.sleep(interval)
+
+    def start(
+        self,
+        batch: int = settings.scoring_refresh_batch,
+        interval: float = settings.scoring_refresh_interval_seconds
+    ) -> None:
+        """启动后台重算任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep(batch, interval))
+
+    async def stop(self) -> None:
+        """停止后台重算任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def remove(self, user_id: str) -> bool:
+        """移除用户 (默认用户不可移除)"""
+        if user_id == self.DEFAULT_USER_ID or user_id not in self:
+            return False
+        self._aggregators.pop(user_id, None)
+        self._pending.pop(user_id, None)
+        self._teams.pop(user_id, None)
+        old = self._states.pop(user_id, None)
+        if old is not None:
+            self._notify(user_id, old, None)
+        return True
+
+    def states(self) -> Iterator[Tuple[str, UserState]]:
+        """遍历所有已提交的用户状态"""
+        return iter(list(self._states.items()))
+
+    def loaded_items(self) -> Iterator[Tuple[str, CognitiveLoadAggregator]]:
+        """遍历已加载的聚合器 (不触发延迟加载)"""
+        return iter(list(self._aggregators.items()))
+
+    def pending_ids(self) -> List[str]:
+        """尚未加载的延迟恢复用户"""
+        return list(self._pending.keys())
+
+    def restore(
+        self,
+        users: Iterable[Tuple[str, Optional[str], Optional[UserState], Any]],
+        loader: AggregatorLoader
+    ) -> int:
+        """
+        批量恢复用户 (user_id, team_id, 状态, 记录键)
+
+        聚合器在首次访问时才通过 loader(记录键) 构建；恢复完成后通知重置监听器，
+        不会触发状态变更监听器。返回恢复的用户数量
+        """
+        default_key = None
+        aggregators = self._aggregators
+        pending = self._pending
+        teams = self._teams
+        states = self._states
+        count = 0
+        for user_id, team_id, state, key in users:
+            if user_id == self.DEFAULT_USER_ID:
+                default_key = key
+            else:
+                aggregators.pop(user_id, None)
+                pending[user_id] = key
+            if team_id is not None:
+                teams[user_id] = team_id
+            if state is not None:
+                states[user_id] = state
+            count += 1
+        self._loader = loader
+
+        if default_key is not None:
+            # 默认用户的聚合器是全局单例，就地恢复以保持引用一致
+            aggregators[self.DEFAULT_USER_ID].load_state(loader(default_key).dump_state())
+        for listener in self._reset_listeners:
+            listener()
+        return count
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._aggregators or user_id in self._pending
+
+    def __len__(self) -> int:
+        return len(self._aggregators) + len(self._pending)
+
+    def _notify(
+        self,
+        user_id: str,
+        old: Optional[UserState],
+        new: Optional[UserState]
+    ) -> None:
+        for listener in self._listeners:
+            listener(user_id, old, new)
+
+
+# 全局单例实例 (默认用户沿用全局聚合器)
+registry = UserRegistry(aggregator)
+scoring.add_listener(registry.on_scoring_change)
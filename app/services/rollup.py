@@ -0,0 +1,182 @@
+"""团队与组织汇总服务 - 基于状态变更增量维护"""
+import math
+from typing import Dict, Iterable, List, Optional
+
+from ..core import clock
+from ..models.energy import EnergyLevel, FatigueLevel
+from ..models.team import TeamStatus, RollupConsistency
+from .registry import UserState, registry
+from .scoring import scoring
+
+
+class RollupTotals:
+    """一组用户的汇总累加器 (总和、计数、各等级计数)"""
+
+    __slots__ = (
+        "count",
+        "energy_sum",
+        "fatigue_sum",
+        "critical_count",
+        "energy_levels",
+        "fatigue_levels",
+        "last_updated",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.energy_sum = 0.0
+        self.fatigue_sum = 0.0
+        self.critical_count = 0
+        self.energy_levels: Dict[EnergyLevel, int] = {level: 0 for level in EnergyLevel}
+        self.fatigue_levels: Dict[FatigueLevel, int] = {level: 0 for level in FatigueLevel}
+        self.last_updated = clock.now()
+
+    def apply(self, state: UserState, sign: int) -> None:
+        """应用一个用户状态的增量 (sign 为 +1 加入，-1 移除)"""
+        self.count += sign
+        self.energy_sum += sign * state.energy
+        self.fatigue_sum += sign * state.fatigue
+        self.critical_count += sign * int(state.critical)
+        self.energy_levels[state.energy_level] += sign
+        self.fatigue_levels[state.fatigue_level] += sign
+        self.last_updated = clock.now()
+
+        # 成员清空时归零，避免浮点累积误差残留
+        if self.count == 0:
+            self.energy_sum = 0.0
+            self.fatigue_sum = 0.0
+
+    @classmethod
+    def from_states(cls, states: Iterable[UserState]) -> "RollupTotals":
+        """全量重算汇总 (用于一致性检查)"""
+        totals = cls()
+        energies = []
+        fatigues = []
+        for state in states:
+            totals.count += 1
+            energies.append(state.energy)
+            fatigues.append(state.fatigue)
+            totals.critical_count += int(state.critical)
+            totals.energy_levels[state.energy_level] += 1
+            totals.fatigue_levels[state.fatigue_level] += 1
+        totals.energy_sum = math.fsum(energies)
+        totals.fatigue_sum = math.fsum(fatigues)
+        return totals
+
+    def to_status(self, team_id: Optional[str] = None) -> TeamStatus:
+        """转换为 API 模型"""
+        count = self.count
+        return TeamStatus(
+            team_id=team_id,
+            member_count=count,
+            average_energy=self.energy_sum / count if count else 0,
+            average_fatigue=self.fatigue_sum / count if count else 0,
+            critical_count=self.critical_count,
+            energy_distribution=dict(self.energy_levels),
+            fatigue_distribution=dict(self.fatigue_levels),
+            last_updated=self.last_updated,
+            scoring_version=scoring.version,
+            stale_users=registry.stale_count
+        )
+
+
+class TeamRollupService:
+    """团队汇总服务 - 监听用户状态变更，O(1) 查询团队与组织汇总"""
+
+    # 一致性检查允许的平均值偏差
+    TOLERANCE = 1e-6
+
+    def __init__(self):
+        self._teams: Dict[str, RollupTotals] = {}
+        self._org = RollupTotals()
+
+    def on_state_change(
+        self,
+        user_id: str,
+        old: Optional[UserState],
+        new: Optional[UserState]
+    ) -> None:
+        """应用单个用户的状态增量"""
+        if old is not None:
+            self._org.apply(old, -1)
+            if old.team_id is not None:
+                team = self._teams[old.team_id]
+                team.apply(old, -1)
+                if team.count == 0:
+                    del self._teams[old.team_id]
+        if new is not None:
+            self._org.apply(new, 1)
+            if new.team_id is not None:
+                self._teams.setdefault(new.team_id, RollupTotals()).apply(new, 1)
+
+    def rebuild(self) -> None:
+        """基于注册表中的全部状态重建汇总 (批量恢复后调用)"""
+        states: List[UserState] = []
+        by_team: Dict[str, List[UserState]] = {}
+        for _, state in registry.states():
+            states.append(state)
+            if state.team_id is not None:
+                by_team.setdefault(state.team_id, []).append(state)
+        self._org = RollupTotals.from_states(states)
+        self._teams = {
+            team_id: RollupTotals.from_states(members)
+            for team_id, members in by_team.items()
+        }
+
+    def get_team_status(self, team_id: str) -> Optional[TeamStatus]:
+        """获取团队汇总"""
+        totals = self._teams.get(team_id)
+        return totals.to_status(team_id) if totals is not None else None
+
+    def get_org_status(self) -> TeamStatus:
+        """获取组织汇总"""
+        return self._org.to_status()
+
+    def list_teams(self) -> List[str]:
+        """列出有成员的团队 ID"""
+        return list(self._teams.keys())
+
+    def check_consistency(self, team_id: Optional[str] = None) -> RollupConsistency:
+        """对比增量汇总与全量重算结果 (评分配置切换后仍有用户未重算时视为不一致)"""
+        states = (
+            state for _, state in registry.states()
+            if team_id is None or state.team_id == team_id
+        )
+        recomputed = RollupTotals.from_states(states).to_status(team_id)
+        if team_id is None:
+            incremental = self._org.to_status()
+        else:
+            totals = self._teams.get(team_id)
+            incremental = totals.to_status(team_id) if totals is not None else TeamStatus(
+                team_id=team_id,
+                energy_distribution={level: 0 for level in EnergyLevel},
+                fatigue_distribution={level: 0 for level in FatigueLevel}
+            )
+
+        max_deviation = max(
+            abs(incremental.average_energy - recomputed.average_energy),
+            abs(incremental.average_fatigue - recomputed.average_fatigue)
+        )
+        stale_users = registry.stale_count
+        consistent = (
+            stale_users == 0 and
+            max_deviation <= self.TOLERANCE and
+            incremental.member_count == recomputed.member_count and
+            incremental.critical_count == recomputed.critical_count and
+            incremental.energy_distribution == recomputed.energy_distribution and
+            incremental.fatigue_distribution == recomputed.fatigue_distribution
+        )
+        return RollupConsistency(
+            team_id=team_id,
+            consistent=consistent,
+            max_deviation=max_deviation,
+            stale_users=stale_users,
+            incremental=incremental,
+            recomputed=recomputed
+        )
+
+
+# 全局单例实例
+rollups = TeamRollupService()
+registry.add_listener(rollups.on_state_change)
+registry.add_reset_listener(rollups.rebuild)
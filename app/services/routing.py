@@ -0,0 +1,74 @@
+"""Webhook 路由索引服务 - 按干预类型与订阅范围匹配接收端"""
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from ..models.intervention import InterventionType, WebhookConfig
+
+# 订阅范围: ("all", None) 表示全部用户，("user", id) / ("team", id) 表示指定用户或团队
+Scope = Tuple[str, Optional[str]]
+
+_ALL: Scope = ("all", None)
+
+
+def _scopes(config: WebhookConfig) -> List[Scope]:
+    if config.user_ids is None and config.team_ids is None:
+        return [_ALL]
+    return [
+        *(("user", user_id) for user_id in config.user_ids or ()),
+        *(("team", team_id) for team_id in config.team_ids or ()),
+    ]
+
+
+class WebhookRouter:
+    """
+    Webhook 路由索引
+
+    (干预类型, 订阅范围) -> 已启用的 Webhook ID，注册、注销、启停时同步维护，
+    匹配耗时只与命中的接收端数量相关
+    """
+
+    def __init__(self):
+        # 使用 dict 作为有序集合，保持注册顺序
+        self._index: Dict[Tuple[InterventionType, Scope], Dict[UUID, None]] = {}
+
+    def add(self, config: WebhookConfig) -> None:
+        """将已启用的 Webhook 加入索引"""
+        if not config.enabled:
+            return
+        for intervention_type in config.intervention_types:
+            for scope in _scopes(config):
+                self._index.setdefault((intervention_type, scope), {})[config.id] = None
+
+    def remove(self, config: WebhookConfig) -> None:
+        """将 Webhook 从索引中移除"""
+        for intervention_type in config.intervention_types:
+            for scope in _scopes(config):
+                key = (intervention_type, scope)
+                bucket = self._index.get(key)
+                if bucket is not None:
+                    bucket.pop(config.id, None)
+                    if not bucket:
+                        del self._index[key]
+
+    def match(
+        self,
+        intervention_type: InterventionType,
+        user_id: Optional[str] = None,
+        team_id: Optional[str] = None
+    ) -> List[UUID]:
+        """匹配订阅了该干预类型且范围覆盖该用户的 Webhook"""
+        matched: Dict[UUID, None] = {}
+        keys = [(intervention_type, _ALL)]
+        if user_id is not None:
+            keys.append((intervention_type, ("user", user_id)))
+        if team_id is not None:
+            keys.append((intervention_type, ("team", team_id)))
+        for key in keys:
+            bucket = self._index.get(key)
+            if bucket:
+                matched.update(bucket)
+        return list(matched)
+
+    def clear(self) -> None:
+        """清空索引"""
+        self._index = {}
@@ -1,27 +1,45 @@
 """干预调度服务"""
 import asyncio
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from uuid import UUID
 import httpx
 
 from ..core.config import settings
 from ..models.intervention import (
     WebhookConfig, 
+    WebhookStatus,
     RecoverySchedule, 
     InterventionEvent,
-    InterventionType
+    InterventionType,
+    CircuitState,
+    DeliveryLaneStatus
 )
 from .aggregator import aggregator
+from .circuit import CircuitBreaker
+from .delivery import DeliveryJob, DeliveryLanes, select_lane
+from .payload import PreparedWebhook, RenderedEvent
+from .routing import WebhookRouter
+from .registry import UserRegistry, registry
+from .tracing import tracer
 
 
 class InterventionScheduler:
     """干预调度器 - 管理 Webhook 和恢复计划"""
     
-    def __init__(self):
+    def __init__(self, users: UserRegistry = registry):
+        self._users = users
         self._webhooks: Dict[UUID, WebhookConfig] = {}
+        self._breakers: Dict[UUID, CircuitBreaker] = {}
+        self._prepared: Dict[UUID, PreparedWebhook] = {}
+        self._router = WebhookRouter()
         self._intervention_history: List[InterventionEvent] = []
         self._http_client: Optional[httpx.AsyncClient] = None
+        self._lanes = DeliveryLanes(self._deliver)
+    
+    def start(self) -> None:
+        """启动分优先级的投递通道"""
+        self._lanes.start()
     
     async def _get_client(self) -> httpx.AsyncClient:
         """获取 HTTP 客户端"""
@@ -32,22 +50,62 @@ class InterventionScheduler:
         return self._http_client
     
     async def close(self) -> None:
-        """关闭 HTTP 客户端"""
+        """停止投递通道并关闭 HTTP 客户端"""
+        await self._lanes.stop()
         if self._http_client and not self._http_client.is_closed:
             await self._http_client.aclose()
     
+    def dump_state(self) -> dict:
+        """导出可持久化状态 (Webhook 配置与干预历史)"""
+        return {
+            "webhooks": [w.model_dump(mode="json") for w in self._webhooks.values()],
+            "history": [e.model_dump(mode="json") for e in self._intervention_history],
+        }
+    
+    def load_state(self, state: dict) -> None:
+        """载入持久化状态"""
+        self._webhooks = {}
+        self._breakers = {}
+        self._prepared = {}
+        self._router.clear()
+        for data in state.get("webhooks", []):
+            self.register_webhook(WebhookConfig.model_validate(data))
+        self._intervention_history = [
+            InterventionEvent.model_validate(data) for data in state.get("history", [])
+        ]
+    
     def register_webhook(self, config: WebhookConfig) -> WebhookConfig:
-        """注册 Webhook"""
+        """注册 Webhook (负载模板无效时抛出 ValueError)"""
+        prepared = PreparedWebhook(config)
+        existing = self._webhooks.get(config.id)
+        if existing is not None:
+            self._router.remove(existing)
+        self._prepared[config.id] = prepared
         self._webhooks[config.id] = config
+        self._breakers[config.id] = CircuitBreaker()
+        self._router.add(config)
         return config
     
     def unregister_webhook(self, webhook_id: UUID) -> bool:
         """注销 Webhook"""
         if webhook_id in self._webhooks:
-            del self._webhooks[webhook_id]
+            self._router.remove(self._webhooks.pop(webhook_id))
+            del self._breakers[webhook_id]
+            del self._prepared[webhook_id]
             return True
         return False
     
+    def set_webhook_enabled(self, webhook_id: UUID, enabled: bool) -> Optional[WebhookConfig]:
+        """启用或停用 Webhook，不存在时返回 None"""
+        webhook = self._webhooks.get(webhook_id)
+        if webhook is None:
+            return None
+        if webhook.enabled != enabled:
+            self._router.remove(webhook)
+            webhook.enabled = enabled
+            self._router.add(webhook)
+        return webhook
+    
     def get_webhook(self, webhook_id: UUID) -> Optional[WebhookConfig]:
         """获取 Webhook 配置"""
         return self._webhooks.get(webhook_id)
@@ -56,71 +114,117 @@ class InterventionScheduler:
         """列出所有 Webhook"""
         return list(self._webhooks.values())
     
+    def list_webhook_statuses(self) -> List[WebhookStatus]:
+        """列出所有 Webhook 及其熔断器状态"""
+        return [
+            WebhookStatus(
+                **webhook.model_dump(),
+                circuit=self._breakers[webhook_id].get_status()
+            )
+            for webhook_id, webhook in self._webhooks.items()
+        ]
+    
     async def _send_webhook(
         self, 
         webhook: WebhookConfig, 
-        event: InterventionEvent
+        rendered: RenderedEvent
     ) -> bool:
-        """发送 Webhook 通知"""
+        """发送 Webhook 通知 (负载与请求头均复用预渲染结果)"""
         if not webhook.enabled:
             return False
         
+        # 熔断器打开时立即跳过，不占用超时等待
+        breaker = self._breakers[webhook.id]
+        if not breaker.allow_request():
+            return False
+        
         try:
             client = await self._get_client()
-            payload = {
-                "event_id": str(event.id),
-                "type": event.type.value,
-                "triggered_at": event.triggered_at.isoformat(),
-                "fatigue_level": event.fatigue_at_trigger,
-                "energy_level": event.energy_at_trigger,
-                "message": event.message
-            }
-            
-            headers = {"Content-Type": "application/json"}
-            headers.update(webhook.headers)
+            prepared = self._prepared[webhook.id]
+            body = rendered.body(prepared.template)
             
             for attempt in range(settings.webhook_retry_count):
                 try:
                     response = await client.post(
                         webhook.url,
-                        json=payload,
-                        headers=headers
+                        content=body,
+                        headers=prepared.headers
                     )
                     if response.status_code < 400:
+                        breaker.record_success()
                         return True
-                except httpx.RequestError:
+                    breaker.record_failure(f"HTTP {response.status_code}")
+                except httpx.RequestError as e:
+                    breaker.record_failure(f"{type(e).__name__}: {e}")
                     if attempt == settings.webhook_retry_count - 1:
                         raise
+                    if breaker.state != CircuitState.CLOSED:
+                        break
                     await asyncio.sleep(1 * (attempt + 1))  # 指数退避
+                    continue
+                
+                # 熔断器已打开时不再重试
+                if breaker.state != CircuitState.CLOSED:
+                    break
             
             return False
             
+        except asyncio.CancelledError:
+            # 投递被取消不代表端点失效，归还探测名额
+            breaker.release_probe()
+            raise
         except Exception as e:
+            # 网络错误已在重试循环中记录，其余异常 (无效 URL、负载渲染错误等) 在此记录，
+            # 保证半开状态的探测总有结果
+            if not isinstance(e, httpx.RequestError):
+                breaker.record_failure(f"{type(e).__name__}: {e}")
             print(f"Webhook 发送失败: {webhook.name} - {e}")
             return False
     
+    async def _deliver(self, job: DeliveryJob) -> None:
+        """向匹配的 Webhook 投递干预事件 (事件只渲染一次)"""
+        for webhook_id in job.webhook_ids:
+            webhook = self._webhooks.get(webhook_id)
+            if webhook is None:
+                continue
+            with tracer.span("webhook", webhook=webhook.name):
+                success = await self._send_webhook(webhook, job.rendered)
+            if success:
+                job.event.webhook_notified.append(webhook_id)
+    
     async def trigger_intervention(
         self, 
         intervention_type: InterventionType,
-        force: bool = False
+        force: bool = False,
+        user_id: Optional[str] = None,
+        wait: bool = False
     ) -> InterventionEvent:
         """
         触发干预事件
         
+        Webhook 投递按干预类型与用户紧急程度进入对应的优先级通道，
+        通道未启动时直接投递
+        
         Args:
             intervention_type: 干预类型
             force: 是否强制触发(跳过状态检查)
+            user_id: 目标用户 ID (为空时使用默认用户)
+            wait: 是否等待投递完成后返回 (webhook_notified 届时已填充)
         """
+        target = self._users.get(user_id) if user_id is not None else None
+        if target is None:
+            target = aggregator
+        
         # 获取当前状态
-        energy = aggregator.calculate_energy()
-        fatigue = aggregator.calculate_fatigue()
+        score = target.score()
         
         # 检查是否需要干预
-        if not force and not aggregator.needs_intervention():
+        if not force and not score.critical:
             return InterventionEvent(
                 type=intervention_type,
-                fatigue_at_trigger=fatigue.value,
-                energy_at_trigger=energy.value,
+                user_id=user_id,
+                fatigue_at_trigger=score.fatigue,
+                energy_at_trigger=score.energy,
                 success=False,
                 message="当前状态良好，无需干预"
             )
@@ -128,35 +232,48 @@ class InterventionScheduler:
         # 创建干预事件
         event = InterventionEvent(
             type=intervention_type,
-            fatigue_at_trigger=fatigue.value,
-            energy_at_trigger=energy.value,
+            user_id=user_id,
+            fatigue_at_trigger=score.fatigue,
+            energy_at_trigger=score.energy,
+            lane=select_lane(intervention_type, score.fatigue),
             message=f"触发 {intervention_type.value} 干预"
         )
         
-        # 通知相关 Webhook
-        notified_webhooks: List[UUID] = []
-        for webhook_id, webhook in self._webhooks.items():
-            if intervention_type in webhook.intervention_types:
-                success = await self._send_webhook(webhook, event)
-                if success:
-                    notified_webhooks.append(webhook_id)
-        
-        event.webhook_notified = notified_webhooks
-        event.success = True
-        
-        # 记录历史
+        # 记录历史 (投递结果在完成后写回事件)
         self._intervention_history.append(event)
         
+        # 通知相关 Webhook
+        target_user = user_id or self._users.DEFAULT_USER_ID
+        webhook_ids = self._router.match(
+            intervention_type,
+            user_id=target_user,
+            team_id=self._users.team_of(target_user)
+        )
+        if webhook_ids:
+            job = DeliveryJob(event, RenderedEvent(event), webhook_ids)
+            if not self._lanes.running:
+                await self._deliver(job)
+            else:
+                if wait:
+                    job.done = asyncio.get_running_loop().create_future()
+                if not self._lanes.submit(event.lane, job):
+                    event.message += f" ({event.lane.value} 通道已满，未投递)"
+                elif wait:
+                    await job.done
+        
         return event
     
+    def get_lane_statuses(self) -> List[DeliveryLaneStatus]:
+        """获取各投递通道的队列与排队延迟统计"""
+        return self._lanes.get_status()
+    
     def generate_recovery_schedule(self) -> RecoverySchedule:
         """生成恢复时间表"""
-        energy = aggregator.calculate_energy()
-        fatigue = aggregator.calculate_fatigue()
+        score = aggregator.score()
         
         return RecoverySchedule.generate(
-            fatigue=fatigue.value,
-            energy=energy.value
+            fatigue=score.fatigue,
+            energy=score.energy
         )
     
     def get_intervention_history(
@@ -165,6 +282,29 @@ class InterventionScheduler:
     ) -> List[InterventionEvent]:
         """获取干预历史"""
         return self._intervention_history[-limit:][::-1]
+    
+    def iter_intervention_history(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        intervention_type: Optional[InterventionType] = None,
+        user_id: Optional[str] = None
+    ) -> Iterator[InterventionEvent]:
+        """按条件流式遍历干预历史 (按时间升序，不复制历史列表)"""
+        history = self._intervention_history
+        index = 0
+        while index < len(history):
+            event = history[index]
+            index += 1
+            if start is not None and event.triggered_at < start:
+                continue
+            if end is not None and event.triggered_at > end:
+                continue
+            if intervention_type is not None and event.type != intervention_type:
+                continue
+            if user_id is not None and event.user_id != user_id:
+                continue
+            yield event
 
 
 # 全局单例实例
@@ -0,0 +1,180 @@
+"""评分配置服务 - 校验并原子切换带版本号的权重与阈值配置"""
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ..core import clock
+from ..core.config import Settings, settings
+from ..models.scoring import ScoringConfig, ScoringConfigStatus, ScoringConfigUpdate
+
+
+class ActiveScoring(NamedTuple):
+    """生效中的评分配置 (整体替换，读取方拿到的版本号与配置始终一致)"""
+    version: int
+    config: ScoringConfig
+    source: str
+    activated_at: datetime
+
+
+# 配置切换监听器: 版本号递增后以新配置调用
+ScoringListener = Callable[[ActiveScoring], None]
+
+
+def config_from_settings(source: Settings) -> ScoringConfig:
+    """从应用配置 (环境变量 / .env) 构建评分配置，未通过校验时抛出 ValidationError"""
+    return ScoringConfig.model_validate({
+        name: getattr(source, name) for name in ScoringConfig.model_fields
+    })
+
+
+def default_config() -> ScoringConfig:
+    """应用配置中各评分字段的默认值"""
+    return ScoringConfig.model_validate({
+        name: Settings.model_fields[name].default for name in ScoringConfig.model_fields
+    })
+
+
+def initial_config(source: Settings) -> ScoringConfig:
+    """启动时的评分配置: 环境变量配置未通过校验时记录错误并使用默认值，不阻止启动"""
+    try:
+        return config_from_settings(source)
+    except ValidationError as e:
+        print(f"评分配置未通过校验，使用默认配置: {_describe_error(e)}")
+        return default_config()
+
+
+class ScoringConfigStore:
+    """
+    评分配置存储
+
+    - 新配置通过校验后整体替换并递增版本号，校验失败时保留当前配置
+    - 聚合器记录提交状态时的版本号，版本变化后通知监听器 (注册表据此分批重算全部用户)
+    - 配置文件 (JSON，字段与 ScoringConfig 一致，未提供的字段取环境变量配置) 按修改时间轮询重载
+    """
+
+    def __init__(self, base: ScoringConfig, path: Optional[str] = settings.scoring_config_file):
+        self._base = base
+        self._active = ActiveScoring(1, base, "settings", clock.now())
+        self.path = Path(path) if path else None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[ScoringListener] = []
+
+    def add_listener(self, listener: ScoringListener) -> None:
+        """注册配置切换监听器"""
+        self._listeners.append(listener)
+
+    @property
+    def active(self) -> ActiveScoring:
+        """当前生效的配置"""
+        return self._active
+
+    @property
+    def version(self) -> int:
+        return self._active.version
+
+    def apply(self, config: ScoringConfig, source: str) -> ActiveScoring:
+        """切换到新配置 (与当前配置相同时不递增版本号)"""
+        current = self._active
+        self._last_error = None
+        if config != current.config:
+            self._active = ActiveScoring(current.version + 1, config, source, clock.now())
+            for listener in self._listeners:
+                listener(self._active)
+        return self._active
+
+    def update(self, changes: ScoringConfigUpdate, source: str = "api") -> ActiveScoring:
+        """在当前配置上应用部分更新，校验失败时抛出 ValidationError"""
+        merged = {
+            **self._active.config.model_dump(),
+            **changes.model_dump(exclude_none=True),
+        }
+        return self.apply(ScoringConfig.model_validate(merged), source)
+
+    def reset(self) -> ActiveScoring:
+        """恢复为环境变量配置"""
+        return self.apply(self._base, "settings")
+
+    def load_file(self) -> ActiveScoring:
+        """
+        从配置文件加载
+
+        文件不可读、不是合法 JSON 或未通过校验时记录错误并抛出 (OSError / ValueError)
+        """
+        if self.path is None:
+            raise FileNotFoundError("未配置评分配置文件")
+        try:
+            stat = self.path.stat()
+            self._file_stamp = (stat.st_mtime_ns, stat.st_size)
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("配置文件内容必须是 JSON 对象")
+            config = ScoringConfig.model_validate({**self._base.model_dump(), **data})
+        except (OSError, ValueError) as e:
+            self._last_error = _describe_error(e)
+            raise
+        return self.apply(config, str(self.path))
+
+    def check_file(self) -> bool:
+        """配置文件有变化时重新加载，返回是否发生了加载尝试"""
+        if self.path is None:
+            return False
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self._file_stamp:
+            return False
+        try:
+            self.load_file()
+        except (OSError, ValueError) as e:
+            print(f"评分配置加载失败，保留版本 {self.version}: {_describe_error(e)}")
+        return True
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.check_file()
+
+    def start(self, interval: float = settings.scoring_watch_interval_seconds) -> None:
+        """加载配置文件并启动文件监视任务"""
+        if self.path is not None and self._task is None:
+            self.check_file()
+            self._task = asyncio.create_task(self._watch(interval))
+
+    async def stop(self) -> None:
+        """停止文件监视任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> ScoringConfigStatus:
+        """获取配置状态"""
+        active = self._active
+        return ScoringConfigStatus(
+            version=active.version,
+            config=active.config,
+            source=active.source,
+            activated_at=active.activated_at,
+            watch_file=str(self.path) if self.path is not None else None,
+            last_error=self._last_error
+        )
+
+
+def _describe_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(err["msg"] for err in error.errors())
+    return str(error)
+
+
+# 全局单例实例
+scoring = ScoringConfigStore(initial_config(settings))
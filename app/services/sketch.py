@@ -0,0 +1,178 @@
+"""流式分位数草图服务 - 按团队与时间分桶维护精力/疲劳分布"""
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core import clock
+from ..core.config import settings
+from .registry import UserState, registry
+
+
+class DDSketch:
+    """
+    DDSketch 风格的可合并分位数草图
+
+    按对数分桶计数，任意分位数的相对误差不超过 relative_accuracy，
+    内存只取决于取值范围 (精力/疲劳为 0-100)，与样本数量无关
+    """
+
+    # 小于该值的样本计入零值桶
+    MIN_INDEXABLE = 1e-3
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "_bins", "zero_count", "count", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """加入一个样本"""
+        if value < self.MIN_INDEXABLE:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._bins[key] = self._bins.get(key, 0) + 1
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch") -> None:
+        """合并另一个草图 (两者精度必须一致)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("只能合并相同精度的草图")
+        for key, count in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """估算分位数 (q 取值 0-1)，空草图返回 None"""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(0.0, self.min)
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if seen > rank:
+                # 取桶的中点值，保证相对误差
+                value = 2 * self._gamma ** key / (1 + self._gamma)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class DistributionTracker:
+    """分布追踪器 - 每个 (团队, 时间桶) 维护一对精力/疲劳草图"""
+
+    def __init__(
+        self,
+        bucket_minutes: int = settings.distribution_bucket_minutes,
+        retention_buckets: int = settings.distribution_retention_buckets,
+        relative_accuracy: float = settings.distribution_relative_accuracy
+    ):
+        self.bucket_minutes = bucket_minutes
+        self.retention_buckets = retention_buckets
+        self.relative_accuracy = relative_accuracy
+        # (team_id, bucket_index) -> (精力草图, 疲劳草图)
+        self._sketches: Dict[Tuple[Optional[str], int], Tuple[DDSketch, DDSketch]] = {}
+        self._latest_bucket = 0
+
+    def _bucket_index(self, at: datetime) -> int:
+        return int(at.timestamp() // (self.bucket_minutes * 60))
+
+    def on_state_change(
+        self,
+        user_id: str,
+        old: Optional[UserState],
+        new: Optional[UserState]
+    ) -> None:
+        """记录新计算出的精力与疲劳值"""
+        if new is not None:
+            self.record(new.team_id, new.energy, new.fatigue)
+
+    def record(
+        self,
+        team_id: Optional[str],
+        energy: float,
+        fatigue: float,
+        at: Optional[datetime] = None
+    ) -> None:
+        """向对应团队和时间桶的草图中加入样本"""
+        index = self._bucket_index(at or clock.now())
+        key = (team_id, index)
+        sketches = self._sketches.get(key)
+        if sketches is None:
+            sketches = (DDSketch(self.relative_accuracy), DDSketch(self.relative_accuracy))
+            self._sketches[key] = sketches
+            if index > self._latest_bucket:
+                self._latest_bucket = index
+                self._evict()
+        sketches[0].add(energy)
+        sketches[1].add(fatigue)
+
+    def _evict(self) -> None:
+        """淘汰超出保留窗口的时间桶"""
+        oldest = self._latest_bucket - self.retention_buckets + 1
+        for key in [key for key in self._sketches if key[1] < oldest]:
+            del self._sketches[key]
+
+    def merged(
+        self,
+        team_ids: Optional[Iterable[Optional[str]]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Tuple[DDSketch, DDSketch]:
+        """合并指定团队与时间范围内的草图 (team_ids 为空表示全组织)"""
+        teams = set(team_ids) if team_ids is not None else None
+        start_index = self._bucket_index(start) if start is not None else None
+        end_index = self._bucket_index(end) if end is not None else None
+
+        energy = DDSketch(self.relative_accuracy)
+        fatigue = DDSketch(self.relative_accuracy)
+        for (team_id, index), (energy_sketch, fatigue_sketch) in self._sketches.items():
+            if teams is not None and team_id not in teams:
+                continue
+            if start_index is not None and index < start_index:
+                continue
+            if end_index is not None and index > end_index:
+                continue
+            energy.merge(energy_sketch)
+            fatigue.merge(fatigue_sketch)
+        return energy, fatigue
+
+    def quantiles(
+        self,
+        quantiles: List[float],
+        team_ids: Optional[Iterable[Optional[str]]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Tuple[int, Dict[str, Optional[float]], Dict[str, Optional[float]]]:
+        """返回样本数以及精力、疲劳的分位数"""
+        energy, fatigue = self.merged(team_ids, start, end)
+        labels = [f"p{q * 100:g}" for q in quantiles]
+        return (
+            energy.count,
+            {label: energy.quantile(q) for label, q in zip(labels, quantiles)},
+            {label: fatigue.quantile(q) for label, q in zip(labels, quantiles)},
+        )
+
+
+# 全局单例实例
+distributions = DistributionTracker()
+registry.add_listener(distributions.on_state_change)
@@ -0,0 +1,369 @@
+"""
+状态快照服务 - 定期及关闭时持久化聚合器与调度器状态，启动时快速热恢复
+
+快照文件格式 (小端序，版本 2):
+
+    头部     magic "BGSN" | version u16 | 保留 u16 | 创建时间 f64
+             | 用户数 u32 | 团队数 u32 | 调度器段长度 u32 | 用户 ID 段长度 u32 | 团队 ID 段长度 u32
+    调度器段 UTF-8 JSON (Webhook 配置与干预历史)
+    用户 ID  以 NUL 分隔的 UTF-8 字符串
+    团队 ID  以 NUL 分隔的 UTF-8 字符串 (去重)
+    用户索引 定长条目: 团队序号 u32 (0xFFFFFFFF 表示无团队) | 精力 f64 | 疲劳 f64
+             | 精力等级 u8 | 疲劳等级 u8 | 状态标志 u8 | 记录偏移 u32 | 记录长度 u32
+    用户记录 每个聚合器: 标志 u8 | 各数据源的负荷值 f64 | 工作开始 f64 | 最后活动 f64 | 连续工作时长 f64
+
+版本 1 的用户记录保存完整的数据源字段，读取时换算为负荷值，再次写入时转换为版本 2
+
+启动时只解析用户索引 (团队汇总等依赖的状态摘要)，聚合器记录在用户首次被访问时才解码
+"""
+import asyncio
+import json
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..core.config import settings
+from ..models.data_input import (
+    compute_activity_intensity,
+    compute_meeting_intensity,
+    compute_screen_intensity,
+)
+from ..models.energy import EnergyLevel, FatigueLevel
+from .aggregator import AggregatorState, CognitiveLoadAggregator
+from .codec import RECORD_STRUCTS
+from .registry import UserRegistry, UserState, registry
+from .scheduler import InterventionScheduler, scheduler
+
+MAGIC = b"BGSN"
+VERSION = 2
+# 仍可读取的旧版本
+_READABLE_VERSIONS = (1, VERSION)
+
+_HEADER = struct.Struct("<4sHHdIIIII")
+_INDEX = struct.Struct("<IddBBBII")
+_FLAGS = struct.Struct("<B")
+_LOAD = struct.Struct("<d")
+# 版本 1 的数据源记录 (与二进制写入协议共用布局)
+_GITHUB = RECORD_STRUCTS["github"]
+_CALENDAR = RECORD_STRUCTS["calendar"]
+_SCREEN = RECORD_STRUCTS["screen"]
+_WORK = struct.Struct("<ddd")
+
+_NO_TEAM = 0xFFFFFFFF
+_SEPARATOR = "\0"
+
+# 用户记录标志位
+_HAS_GITHUB = 0x01
+_HAS_CALENDAR = 0x02
+_HAS_SCREEN = 0x04
+_HAS_WORK_START = 0x08
+_HAS_LAST_ACTIVITY = 0x10
+
+# 状态摘要标志位
+_HAS_STATE = 0x01
+_CRITICAL = 0x02
+
+_ENERGY_LEVELS = list(EnergyLevel)
+_FATIGUE_LEVELS = list(FatigueLevel)
+
+
+class SnapshotError(ValueError):
+    """快照文件无效或版本不兼容"""
+
+
+def encode_aggregator(state: AggregatorState) -> bytes:
+    """将聚合器状态编码为紧凑的二进制记录"""
+    flags = 0
+    parts: List[bytes] = []
+    if state.github_load is not None:
+        flags |= _HAS_GITHUB
+        parts.append(_LOAD.pack(state.github_load))
+    if state.calendar_load is not None:
+        flags |= _HAS_CALENDAR
+        parts.append(_LOAD.pack(state.calendar_load))
+    if state.screen_load is not None:
+        flags |= _HAS_SCREEN
+        parts.append(_LOAD.pack(state.screen_load))
+    if state.work_start is not None:
+        flags |= _HAS_WORK_START
+    if state.last_activity is not None:
+        flags |= _HAS_LAST_ACTIVITY
+    parts.append(_WORK.pack(
+        state.work_start or 0.0,
+        state.last_activity or 0.0,
+        state.continuous_work_hours
+    ))
+    return _FLAGS.pack(flags) + b"".join(parts)
+
+
+def _decode_loads_v1(buffer: bytes, offset: int, flags: int) -> Tuple[List[Optional[float]], int]:
+    """解码版本 1 记录中的完整数据源字段，换算为负荷值"""
+    loads: List[Optional[float]] = [None, None, None]
+    if flags & _HAS_GITHUB:
+        commits, prs, reviews, issues, period, _ = _GITHUB.unpack_from(buffer, offset)
+        offset += _GITHUB.size
+        loads[0] = compute_activity_intensity(commits, prs, reviews, issues, period)
+    if flags & _HAS_CALENDAR:
+        _, hours, b2b, period, _ = _CALENDAR.unpack_from(buffer, offset)
+        offset += _CALENDAR.size
+        loads[1] = compute_meeting_intensity(hours, b2b, period)
+    if flags & _HAS_SCREEN:
+        active, sessions, switches, period, _ = _SCREEN.unpack_from(buffer, offset)
+        offset += _SCREEN.size
+        loads[2] = compute_screen_intensity(active, sessions, switches, period)
+    return loads, offset
+
+
+def decode_aggregator(buffer: bytes, offset: int = 0, version: int = VERSION) -> CognitiveLoadAggregator:
+    """从二进制记录构建聚合器 (兼容版本 1 记录)"""
+    (flags,) = _FLAGS.unpack_from(buffer, offset)
+    offset += _FLAGS.size
+    if version == 1:
+        loads, offset = _decode_loads_v1(buffer, offset, flags)
+    else:
+        loads = []
+        for flag in (_HAS_GITHUB, _HAS_CALENDAR, _HAS_SCREEN):
+            if flags & flag:
+                loads.append(_LOAD.unpack_from(buffer, offset)[0])
+                offset += _LOAD.size
+            else:
+                loads.append(None)
+    work_start, last_activity, continuous = _WORK.unpack_from(buffer, offset)
+
+    agg = CognitiveLoadAggregator()
+    agg.load_state(AggregatorState(
+        github_load=loads[0],
+        calendar_load=loads[1],
+        screen_load=loads[2],
+        work_start=work_start if flags & _HAS_WORK_START else None,
+        last_activity=last_activity if flags & _HAS_LAST_ACTIVITY else None,
+        continuous_work_hours=continuous
+    ))
+    return agg
+
+
+class SnapshotReader:
+    """
+    快照读取器 - 持有快照内容并按需解码用户记录
+
+    所有延迟加载的用户共享同一个缓冲区
+    """
+
+    def __init__(self, buffer: bytes):
+        if len(buffer) < _HEADER.size:
+            raise SnapshotError("快照文件过短")
+        (
+            magic, version, _, created_at,
+            user_count, team_count, scheduler_len, ids_len, teams_len
+        ) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise SnapshotError("不是有效的快照文件")
+        if version not in _READABLE_VERSIONS:
+            raise SnapshotError(f"不支持的快照版本: {version}")
+
+        self.buffer = buffer
+        self.version = version
+        self.created_at = datetime.fromtimestamp(created_at)
+        self.user_count = user_count
+        self.team_count = team_count
+        self._scheduler_start = _HEADER.size
+        self._ids_start = self._scheduler_start + scheduler_len
+        self._teams_start = self._ids_start + ids_len
+        self._index_start = self._teams_start + teams_len
+        self._index_end = self._index_start + user_count * _INDEX.size
+        if len(buffer) < self._index_end:
+            raise SnapshotError("快照文件不完整")
+
+    def scheduler_state(self) -> dict:
+        """解析调度器段"""
+        raw = self.buffer[self._scheduler_start:self._ids_start]
+        return json.loads(raw) if raw else {}
+
+    def _strings(self, start: int, end: int, count: int) -> List[str]:
+        if count == 0:
+            return []
+        values = self.buffer[start:end].decode().split(_SEPARATOR)
+        if len(values) != count:
+            raise SnapshotError("快照字符串段损坏")
+        return values
+
+    def users(self) -> Iterator[Tuple[str, Optional[str], Optional[UserState], int, int]]:
+        """遍历用户索引: (user_id, team_id, 状态摘要, 记录偏移, 记录长度)"""
+        user_ids = self._strings(self._ids_start, self._teams_start, self.user_count)
+        team_ids = self._strings(self._teams_start, self._index_start, self.team_count)
+        energy_levels = _ENERGY_LEVELS
+        fatigue_levels = _FATIGUE_LEVELS
+        entries = _INDEX.iter_unpack(self.buffer[self._index_start:self._index_end])
+
+        for user_id, (team_index, energy, fatigue, energy_level, fatigue_level, flags, offset, length) in zip(user_ids, entries):
+            team_id = team_ids[team_index] if team_index != _NO_TEAM else None
+            state = None
+            if flags & _HAS_STATE:
+                state = UserState(
+                    team_id, energy, fatigue,
+                    energy_levels[energy_level], fatigue_levels[fatigue_level],
+                    bool(flags & _CRITICAL)
+                )
+            yield user_id, team_id, state, offset, length
+
+    def record(self, record_offset: int, record_len: int) -> bytes:
+        """获取用户记录 (旧版本记录转换为当前版本)"""
+        if self.version != VERSION:
+            return encode_aggregator(self.load(record_offset).dump_state())
+        return self.buffer[record_offset:record_offset + record_len]
+
+    def load(self, record_offset: int) -> CognitiveLoadAggregator:
+        """解码指定偏移处的用户聚合器"""
+        return decode_aggregator(self.buffer, record_offset, self.version)
+
+
+class SnapshotService:
+    """快照服务 - 写入、恢复快照并驱动定期快照任务"""
+
+    def __init__(
+        self,
+        users: UserRegistry,
+        interventions: InterventionScheduler,
+        path: Optional[str] = settings.snapshot_path
+    ):
+        self._users = users
+        self._interventions = interventions
+        self.path = Path(path) if path else None
+        # 延迟恢复用户的原始记录来源
+        self._reader: Optional[SnapshotReader] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def encode(self) -> bytes:
+        """编码当前全部状态"""
+        scheduler_blob = json.dumps(
+            self._interventions.dump_state(),
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode()
+
+        # 已加载的用户重新编码，未加载的用户直接复用原始记录
+        records: List[Tuple[str, bytes]] = [
+            (user_id, encode_aggregator(agg.dump_state()))
+            for user_id, agg in self._users.loaded_items()
+        ]
+        pending = set(self._users.pending_ids())
+        if pending and self._reader is not None:
+            for user_id, _, _, record_offset, record_len in self._reader.users():
+                if user_id in pending:
+                    records.append((user_id, self._reader.record(record_offset, record_len)))
+
+        user_ids: List[str] = []
+        team_ids: Dict[str, int] = {}
+        index_entries = []
+        record_offset = 0
+        for user_id, record in records:
+            user_ids.append(user_id)
+            team_id = self._users.team_of(user_id)
+            team_index = team_ids.setdefault(team_id, len(team_ids)) if team_id is not None else _NO_TEAM
+            state = self._users.get_state(user_id)
+            if state is not None:
+                summary = (
+                    state.energy, state.fatigue,
+                    _ENERGY_LEVELS.index(state.energy_level),
+                    _FATIGUE_LEVELS.index(state.fatigue_level),
+                    _HAS_STATE | (_CRITICAL if state.critical else 0)
+                )
+            else:
+                summary = (0.0, 0.0, 0, 0, 0)
+            index_entries.append((team_index, *summary, record_offset, len(record)))
+            record_offset += len(record)
+
+        ids_blob = _SEPARATOR.join(user_ids).encode()
+        teams_blob = _SEPARATOR.join(team_ids).encode()
+        records_start = (
+            _HEADER.size + len(scheduler_blob) + len(ids_blob) + len(teams_blob)
+            + len(index_entries) * _INDEX.size
+        )
+        index_blob = b"".join(
+            _INDEX.pack(*entry[:-2], entry[-2] + records_start, entry[-1])
+            for entry in index_entries
+        )
+
+        header = _HEADER.pack(
+            MAGIC, VERSION, 0, time.time(),
+            len(user_ids), len(team_ids), len(scheduler_blob), len(ids_blob), len(teams_blob)
+        )
+        return b"".join([
+            header, scheduler_blob, ids_blob, teams_blob, index_blob,
+            *(record for _, record in records)
+        ])
+
+    async def save(self) -> Optional[int]:
+        """写入快照 (原子替换)，返回写入字节数；未配置路径时跳过"""
+        if self.path is None:
+            return None
+        # 编码在事件循环中完成以保证状态一致，文件写入放到线程中
+        data = self.encode()
+        await asyncio.to_thread(self._write, data)
+        return len(data)
+
+    def _write(self, data: bytes) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def restore(self) -> int:
+        """
+        从快照恢复状态，返回恢复的用户数量
+
+        只解析索引，聚合器延迟加载；快照不存在或无效时从空状态启动，
+        单个组件的状态无法载入时该组件从空状态启动
+        """
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            reader = SnapshotReader(self.path.read_bytes())
+            scheduler_state = reader.scheduler_state()
+            users = [
+                (user_id, team_id, state, record_offset)
+                for user_id, team_id, state, record_offset, _ in reader.users()
+            ]
+        except (SnapshotError, struct.error, ValueError) as e:
+            print(f"快照恢复失败，将从空状态启动: {e}")
+            return 0
+        try:
+            self._interventions.load_state(scheduler_state)
+        except Exception as e:
+            print(f"调度器状态恢复失败，Webhook 与干预历史将从空状态启动: {e}")
+            self._interventions.load_state({})
+        self._reader = reader
+        return self._users.restore(users, reader.load)
+
+    async def _run_periodic(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.save()
+            except OSError as e:
+                print(f"定期快照写入失败: {e}")
+
+    def start(self, interval: float = settings.snapshot_interval_seconds) -> None:
+        """启动定期快照任务"""
+        if self.path is not None and self._task is None:
+            self._task = asyncio.create_task(self._run_periodic(interval))
+
+    async def stop(self) -> None:
+        """停止定期快照任务并写入最终快照"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
+
+
+# 全局单例实例
+snapshots = SnapshotService(registry, scheduler)
@@ -0,0 +1,184 @@
+"""请求追踪服务 - 按采样率记录请求各阶段耗时"""
+import random
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar, Token
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+from ..core import clock
+from ..core.config import settings
+
+
+class Span(NamedTuple):
+    """一个计时阶段 (时间均为相对请求开始的毫秒数)"""
+    name: str
+    start_ms: float
+    duration_ms: float
+    attributes: Optional[Dict[str, Any]] = None
+
+
+class Trace:
+    """一次请求的追踪记录"""
+
+    __slots__ = (
+        "trace_id", "method", "path", "started_at", "_t0",
+        "spans", "status_code", "response_ms", "duration_ms",
+    )
+
+    def __init__(self, method: str, path: str):
+        self.trace_id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started_at = clock.now()
+        self._t0 = time.perf_counter()
+        self.spans: List[Span] = []
+        self.status_code: Optional[int] = None
+        self.response_ms: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+
+    def elapsed_ms(self, t: Optional[float] = None) -> float:
+        """相对请求开始的毫秒数"""
+        return ((time.perf_counter() if t is None else t) - self._t0) * 1000
+
+    def add_span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """记录一个阶段 (start/end 为 perf_counter 时间)"""
+        self.spans.append(Span(name, self.elapsed_ms(start), (end - start) * 1000, attributes))
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "status_code": self.status_code,
+            "response_ms": self.response_ms,
+            "duration_ms": self.duration_ms,
+            "spans": [span._asdict() for span in self.spans],
+        }
+
+
+class _SpanContext:
+    """记录一个阶段的上下文管理器 (可跨 await 使用)"""
+
+    __slots__ = ("trace", "name", "attributes", "start")
+
+    def __init__(self, trace: Trace, name: str, attributes: Optional[Dict[str, Any]]):
+        self.trace = trace
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> "_SpanContext":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        attributes = self.attributes
+        if exc_type is not None:
+            attributes = {**(attributes or {}), "error": exc_type.__name__}
+        self.trace.add_span(self.name, self.start, time.perf_counter(), attributes)
+
+
+class _NoopSpan:
+    """未采样时使用的空上下文，不产生任何开销"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("burnout_trace", default=None)
+
+
+class Tracer:
+    """
+    请求追踪器
+
+    按采样率为请求创建追踪记录，业务代码通过 span() 记录各阶段耗时；
+    未被采样的请求 span() 直接返回空上下文。最近的追踪与慢请求追踪分别保存在有界队列中
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = settings.trace_sample_rate,
+        max_traces: int = settings.trace_max_traces,
+        slow_ms: float = settings.trace_slow_ms
+    ):
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._recent: Deque[Trace] = deque(maxlen=max_traces)
+        self._slow: Deque[Trace] = deque(maxlen=max_traces)
+        self._sampled = 0
+        self._skipped = 0
+
+    def start(self, method: str, path: str) -> Optional[Trace]:
+        """按采样率开始追踪，未采样时返回 None"""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            self._skipped += 1
+            return None
+        self._sampled += 1
+        return Trace(method, path)
+
+    def activate(self, trace: Optional[Trace]) -> Token:
+        """将追踪绑定到当前上下文 (也用于在后台任务中继续记录请求的追踪)"""
+        return _current_trace.set(trace)
+
+    def deactivate(self, token: Token) -> None:
+        """解除 activate() 的绑定 (不保存追踪)"""
+        _current_trace.reset(token)
+
+    def finish(self, trace: Trace, token: Token) -> None:
+        """结束追踪并保存"""
+        _current_trace.reset(token)
+        trace.duration_ms = trace.elapsed_ms()
+        self._recent.append(trace)
+        if trace.duration_ms >= self.slow_ms:
+            self._slow.append(trace)
+
+    def current(self) -> Optional[Trace]:
+        """当前上下文中的追踪"""
+        return _current_trace.get()
+
+    def span(self, name: str, **attributes: Any):
+        """记录一个阶段的耗时"""
+        trace = _current_trace.get()
+        if trace is None:
+            return _NOOP_SPAN
+        return _SpanContext(trace, name, attributes or None)
+
+    def mark(self, name: str) -> None:
+        """记录从请求开始到当前的阶段 (如请求体读取与校验)"""
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(name, trace._t0, time.perf_counter())
+
+    def traces(self, limit: int = 50, slow_only: bool = False) -> List[Trace]:
+        """获取最近的追踪记录 (最新在前)"""
+        source = self._slow if slow_only else self._recent
+        return list(source)[-limit:][::-1]
+
+    def get_stats(self) -> dict:
+        """获取追踪统计"""
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_ms": self.slow_ms,
+            "sampled": self._sampled,
+            "skipped": self._skipped,
+            "recent_traces": len(self._recent),
+            "slow_traces": len(self._slow),
+        }
+
+
+# 全局单例实例
+tracer = Tracer()
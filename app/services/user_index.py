@@ -0,0 +1,246 @@
+"""用户等级索引服务 - 按精力/疲劳等级分桶并按数值排序，快速列出处于特定状态的用户"""
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..models.energy import EnergyLevel, FatigueLevel
+from ..models.user import UserOrder
+from .registry import UserState, registry
+
+
+def _sort_key(item: Tuple[float, str]) -> float:
+    return item[0]
+
+
+class UserQueryResult(NamedTuple):
+    """用户查询结果"""
+    order_by: UserOrder
+    users: List[Tuple[str, UserState]]
+    has_more: bool
+
+
+class SortedUsers:
+    """
+    按排序键有序的用户集合 ((键, user_id) 二元组，键相同时按 user_id 排序)
+
+    元素分块存放在若干有序子列表中，插入与删除只移动单个子列表内的元素，
+    不会随用户总数线性变慢
+    """
+
+    # 子列表超过 2 倍该长度时对半拆分
+    CHUNK_SIZE = 512
+
+    __slots__ = ("_chunks", "_maxes", "_len")
+
+    def __init__(self, items: Optional[List[Tuple[float, str]]] = None):
+        ordered = sorted(items) if items else []
+        size = self.CHUNK_SIZE
+        self._chunks: List[List[Tuple[float, str]]] = [
+            ordered[start:start + size] for start in range(0, len(ordered), size)
+        ]
+        self._maxes: List[Tuple[float, str]] = [chunk[-1] for chunk in self._chunks]
+        self._len = len(ordered)
+
+    def add(self, key: float, user_id: str) -> None:
+        item = (key, user_id)
+        chunks, maxes = self._chunks, self._maxes
+        self._len += 1
+        if not chunks:
+            chunks.append([item])
+            maxes.append(item)
+            return
+        index = bisect_left(maxes, item)
+        if index == len(maxes):
+            index -= 1
+            chunks[index].append(item)
+            maxes[index] = item
+        else:
+            insort(chunks[index], item)
+        chunk = chunks[index]
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            half = len(chunk) // 2
+            chunks.insert(index + 1, chunk[half:])
+            del chunk[half:]
+            maxes.insert(index, chunk[-1])
+
+    def remove(self, key: float, user_id: str) -> None:
+        item = (key, user_id)
+        chunks, maxes = self._chunks, self._maxes
+        index = bisect_left(maxes, item)
+        if index == len(maxes):
+            return
+        chunk = chunks[index]
+        position = bisect_left(chunk, item)
+        if position == len(chunk) or chunk[position] != item:
+            return
+        del chunk[position]
+        self._len -= 1
+        if chunk:
+            maxes[index] = chunk[-1]
+        else:
+            del chunks[index]
+            del maxes[index]
+
+    def count_upto(self, bound: Optional[float]) -> int:
+        """键不超过 bound 的用户数量 (bound 为空时返回全部数量)"""
+        if bound is None:
+            return len(self)
+        index = bisect_right(self._maxes, bound, key=_sort_key)
+        count = sum(len(chunk) for chunk in self._chunks[:index])
+        if index < len(self._chunks):
+            count += bisect_right(self._chunks[index], bound, key=_sort_key)
+        return count
+
+    def __iter__(self) -> Iterator[Tuple[float, str]]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class UserLevelIndex:
+    """
+    用户等级索引 - 监听用户状态变更增量维护
+
+    - 每个精力等级、疲劳等级及需要干预的用户各有一个有序桶
+    - 另有按精力值、疲劳值排序的全量有序列表，支持阈值范围查询
+    - 查询时选取最小的候选桶按序扫描，无附加过滤条件时耗时与结果数量成正比
+    - 桶中只保存 (排序键, user_id)，用户状态从注册表读取；删除条目所需的旧状态由变更通知提供
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        # 精力有序桶以精力值为键 (升序)，疲劳有序桶以疲劳值的相反数为键 (疲劳值降序)
+        self._by_energy = SortedUsers()
+        self._by_fatigue = SortedUsers()
+        self._energy_levels: Dict[EnergyLevel, SortedUsers] = {level: SortedUsers() for level in EnergyLevel}
+        self._fatigue_levels: Dict[FatigueLevel, SortedUsers] = {level: SortedUsers() for level in FatigueLevel}
+        self._critical_by_energy = SortedUsers()
+        self._critical_by_fatigue = SortedUsers()
+
+    def _add(self, user_id: str, state: UserState) -> None:
+        self._by_energy.add(state.energy, user_id)
+        self._by_fatigue.add(-state.fatigue, user_id)
+        self._energy_levels[state.energy_level].add(state.energy, user_id)
+        self._fatigue_levels[state.fatigue_level].add(-state.fatigue, user_id)
+        if state.critical:
+            self._critical_by_energy.add(state.energy, user_id)
+            self._critical_by_fatigue.add(-state.fatigue, user_id)
+
+    def _remove(self, user_id: str, state: UserState) -> None:
+        self._by_energy.remove(state.energy, user_id)
+        self._by_fatigue.remove(-state.fatigue, user_id)
+        self._energy_levels[state.energy_level].remove(state.energy, user_id)
+        self._fatigue_levels[state.fatigue_level].remove(-state.fatigue, user_id)
+        if state.critical:
+            self._critical_by_energy.remove(state.energy, user_id)
+            self._critical_by_fatigue.remove(-state.fatigue, user_id)
+
+    def on_state_change(
+        self,
+        user_id: str,
+        old: Optional[UserState],
+        new: Optional[UserState]
+    ) -> None:
+        """应用单个用户的状态变更"""
+        if old is not None:
+            self._remove(user_id, old)
+        if new is not None:
+            self._add(user_id, new)
+
+    def rebuild(self) -> None:
+        """基于注册表中的全部状态重建索引 (批量恢复后调用)"""
+        by_energy: List[Tuple[float, str]] = []
+        by_fatigue: List[Tuple[float, str]] = []
+        energy_levels: Dict[EnergyLevel, list] = {level: [] for level in EnergyLevel}
+        fatigue_levels: Dict[FatigueLevel, list] = {level: [] for level in FatigueLevel}
+        critical_by_energy: List[Tuple[float, str]] = []
+        critical_by_fatigue: List[Tuple[float, str]] = []
+        for user_id, state in registry.states():
+            energy_key = (state.energy, user_id)
+            fatigue_key = (-state.fatigue, user_id)
+            by_energy.append(energy_key)
+            by_fatigue.append(fatigue_key)
+            energy_levels[state.energy_level].append(energy_key)
+            fatigue_levels[state.fatigue_level].append(fatigue_key)
+            if state.critical:
+                critical_by_energy.append(energy_key)
+                critical_by_fatigue.append(fatigue_key)
+
+        self._by_energy = SortedUsers(by_energy)
+        self._by_fatigue = SortedUsers(by_fatigue)
+        self._energy_levels = {level: SortedUsers(items) for level, items in energy_levels.items()}
+        self._fatigue_levels = {level: SortedUsers(items) for level, items in fatigue_levels.items()}
+        self._critical_by_energy = SortedUsers(critical_by_energy)
+        self._critical_by_fatigue = SortedUsers(critical_by_fatigue)
+
+    def query(
+        self,
+        energy_level: Optional[EnergyLevel] = None,
+        fatigue_level: Optional[FatigueLevel] = None,
+        critical: Optional[bool] = None,
+        max_energy: Optional[float] = None,
+        min_fatigue: Optional[float] = None,
+        team_id: Optional[str] = None,
+        order_by: Optional[UserOrder] = None,
+        limit: int = 100
+    ) -> UserQueryResult:
+        """
+        查询符合全部条件的用户
+
+        未指定排序时，只按疲劳条件筛选则按疲劳值降序，否则按精力值升序
+        """
+        if order_by is None:
+            fatigue_only = (
+                (fatigue_level is not None or min_fatigue is not None)
+                and energy_level is None and max_energy is None
+            )
+            order_by = UserOrder.FATIGUE if fatigue_only else UserOrder.ENERGY
+
+        # 候选来源: (有序桶, 扫描上限)，取最小者扫描，其余条件逐个过滤
+        if order_by == UserOrder.ENERGY:
+            candidates = [(self._by_energy, self._by_energy.count_upto(max_energy))]
+            if energy_level is not None:
+                bucket = self._energy_levels[energy_level]
+                candidates.append((bucket, bucket.count_upto(max_energy)))
+            if critical:
+                candidates.append((self._critical_by_energy, self._critical_by_energy.count_upto(max_energy)))
+        else:
+            bound = -min_fatigue if min_fatigue is not None else None
+            candidates = [(self._by_fatigue, self._by_fatigue.count_upto(bound))]
+            if fatigue_level is not None:
+                bucket = self._fatigue_levels[fatigue_level]
+                candidates.append((bucket, bucket.count_upto(bound)))
+            if critical:
+                candidates.append((self._critical_by_fatigue, self._critical_by_fatigue.count_upto(bound)))
+        source, stop = min(candidates, key=lambda candidate: candidate[1])
+
+        get_state = registry.get_state
+        results: List[Tuple[str, UserState]] = []
+        for _, user_id in islice(source, stop):
+            state = get_state(user_id)
+            if energy_level is not None and state.energy_level != energy_level:
+                continue
+            if fatigue_level is not None and state.fatigue_level != fatigue_level:
+                continue
+            if critical is not None and state.critical != critical:
+                continue
+            if max_energy is not None and state.energy > max_energy:
+                continue
+            if min_fatigue is not None and state.fatigue < min_fatigue:
+                continue
+            if team_id is not None and state.team_id != team_id:
+                continue
+            if len(results) == limit:
+                return UserQueryResult(order_by, results, True)
+            results.append((user_id, state))
+        return UserQueryResult(order_by, results, False)
+
+
+# 全局单例实例
+user_index = UserLevelIndex()
+registry.add_listener(user_index.on_state_change)
+registry.add_reset_listener(user_index.rebuild)
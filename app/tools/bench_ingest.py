@@ -0,0 +1,165 @@
+"""
+写入协议基准测试 - 比较 JSON 与紧凑二进制记录的解码开销
+
+codec 模式测量请求体到聚合器的写入路径 (JSON 解析 + pydantic 校验后逐条写入
+vs 定长记录按列校验后整批写入)，分别比较单条请求体与批量请求体；
+--http 模式通过 TestClient 走完整的数据输入路由，包括中间件与聚合器更新，
+并额外比较 gzip 压缩的请求体。
+
+用法:
+    python -m app.tools.bench_ingest --samples 100000 --batch 100
+    python -m app.tools.bench_ingest --http --samples 20000 --batch 100
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from typing import Callable, List, Optional
+
+from pydantic import TypeAdapter
+
+from ..models.data_input import GitHubData, CalendarData, ScreenTimeData
+from ..services.aggregator import CognitiveLoadAggregator
+from ..services.codec import BINARY_CONTENT_TYPE, decode_batch, encode_records
+
+_SOURCES = ("calendar", "github", "screen")
+
+
+def _samples(source: str, count: int, rng: random.Random) -> list:
+    if source == "github":
+        return [GitHubData(commits_count=rng.randint(0, 20), pull_requests=rng.randint(0, 3),
+                           code_reviews=rng.randint(0, 5), issues_resolved=rng.randint(0, 3),
+                           period_hours=8) for _ in range(count)]
+    if source == "calendar":
+        return [CalendarData(meetings_count=rng.randint(0, 6), total_meeting_hours=rng.uniform(0, 5),
+                             back_to_back_meetings=rng.randint(0, 3), period_hours=8) for _ in range(count)]
+    return [ScreenTimeData(active_hours=rng.uniform(0, 8), continuous_sessions=rng.randint(1, 4),
+                           app_switches=rng.randint(0, 300), period_hours=8) for _ in range(count)]
+
+
+def _timed(fn: Callable[[], int]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def bench_codec(source: str, samples: list, batch: int) -> dict:
+    """测量请求体解码并写入聚合器的耗时 (单条与批量)"""
+    model = type(samples[0])
+    json_bodies = [s.model_dump_json().encode() for s in samples]
+    binary_bodies = [encode_records(source, [s]) for s in samples]
+    adapter = TypeAdapter(List[model])
+    chunks = [samples[i:i + batch] for i in range(0, len(samples), batch)]
+    json_batches = [adapter.dump_json(chunk) for chunk in chunks]
+    binary_batches = [encode_records(source, chunk) for chunk in chunks]
+    agg = CognitiveLoadAggregator()
+    update = getattr(agg, f"update_{source}_data")
+
+    def run_json() -> int:
+        for body in json_bodies:
+            sample = model.model_validate_json(body)
+            update(sample, at=sample.timestamp)
+        return len(json_bodies)
+
+    def run_binary() -> int:
+        for body in binary_bodies:
+            records = decode_batch(source, body)
+            agg.update_batch(source, records.last, records.timestamps)
+        return len(binary_bodies)
+
+    def run_json_batch() -> int:
+        for body in json_batches:
+            for sample in adapter.validate_json(body):
+                update(sample, at=sample.timestamp)
+        return len(samples)
+
+    def run_binary_batch() -> int:
+        for body in binary_batches:
+            records = decode_batch(source, body)
+            agg.update_batch(source, records.last, records.timestamps)
+        return len(samples)
+
+    json_seconds = _timed(run_json)
+    binary_seconds = _timed(run_binary)
+    json_batch_seconds = _timed(run_json_batch)
+    binary_batch_seconds = _timed(run_binary_batch)
+    return {
+        "json_us_per_sample": json_seconds / len(samples) * 1e6,
+        "binary_us_per_sample": binary_seconds / len(samples) * 1e6,
+        "single_speedup": json_seconds / binary_seconds if binary_seconds > 0 else 0.0,
+        "json_batch_us_per_sample": json_batch_seconds / len(samples) * 1e6,
+        "binary_batch_us_per_sample": binary_batch_seconds / len(samples) * 1e6,
+        "batch_speedup": json_batch_seconds / binary_batch_seconds if binary_batch_seconds > 0 else 0.0,
+        "json_bytes_per_sample": sum(map(len, json_bodies)) / len(samples),
+        "binary_bytes_per_sample": sum(map(len, binary_bodies)) / len(samples),
+    }
+
+
+def bench_http(source: str, samples: list, batch: int) -> dict:
+    """通过数据输入路由测量端到端吞吐量 (样本/秒)"""
+    from fastapi.testclient import TestClient
+    from main import app
+    from ..services.admission import admission
+
+    # 基准测试不受写入限流影响
+    admission.rate = admission.burst = float("inf")
+    client = TestClient(app)
+    url = f"/api/data/{source}"
+    params = {"user_id": "bench"}
+    json_bodies = [s.model_dump_json() for s in samples]
+    batches: List[bytes] = [
+        encode_records(source, samples[i:i + batch]) for i in range(0, len(samples), batch)
+    ]
+    gzipped = [gzip.compress(body) for body in batches]
+
+    def run_json() -> int:
+        for body in json_bodies:
+            client.post(url, content=body, params=params, headers={"Content-Type": "application/json"})
+        return len(json_bodies)
+
+    def run_binary(bodies: List[bytes], encoding: Optional[str]) -> Callable[[], int]:
+        headers = {"Content-Type": BINARY_CONTENT_TYPE}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        def run() -> int:
+            for body in bodies:
+                response = client.post(f"{url}/records", content=body, params=params, headers=headers)
+                response.raise_for_status()
+            return len(samples)
+        return run
+
+    json_seconds = _timed(run_json)
+    binary_seconds = _timed(run_binary(batches, None))
+    gzip_seconds = _timed(run_binary(gzipped, "gzip"))
+    return {
+        "json_samples_per_second": len(samples) / json_seconds,
+        "binary_batch_samples_per_second": len(samples) / binary_seconds,
+        "binary_gzip_samples_per_second": len(samples) / gzip_seconds,
+        "binary_bytes_per_batch": sum(map(len, batches)) / len(batches),
+        "gzip_bytes_per_batch": sum(map(len, gzipped)) / len(gzipped),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="比较 JSON 与二进制记录写入协议的开销")
+    parser.add_argument("--samples", type=int, default=50000, help="每个数据源的样本数")
+    parser.add_argument("--source", choices=_SOURCES, action="append", help="数据源 (可重复，默认全部)")
+    parser.add_argument("--http", action="store_true", help="通过数据输入路由进行端到端测试")
+    parser.add_argument("--batch", type=int, default=100, help="每个批量请求体的记录数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    results = {}
+    for source in args.source or _SOURCES:
+        samples = _samples(source, args.samples, rng)
+        results[source] = bench_http(source, samples, args.batch) if args.http else bench_codec(source, samples, args.batch)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+"""
+内存基准测试 - 测量每个用户的常驻状态占用
+
+默认模式为每个用户创建一个聚合器并依次写入 GitHub、日历与屏幕记录，
+用 tracemalloc 统计保留下来的字节数 (含用户 ID 与字典开销)；
+--registry 模式改为经由注册表写入并提交，额外计入状态摘要、团队汇总与用户索引等监听器维护的数据；
+--baseline 额外按重构前的布局 (每用户保存三个输入模型及精力、疲劳模型) 构造对照组。
+
+用法:
+    python -m app.tools.bench_memory --users 10000 100000 1000000
+    python -m app.tools.bench_memory --users 10000 100000 --baseline
+    python -m app.tools.bench_memory --users 10000 100000 --registry
+"""
+import argparse
+import gc
+import importlib
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from ..models.data_input import GitHubData, CalendarData, ScreenTimeData
+from ..models.energy import EnergyState, FatigueIndex
+from ..services.aggregator import CognitiveLoadAggregator
+from ..services.codec import CalendarRecord, GitHubRecord, ScreenTimeRecord
+
+# 对照组默认的最大用户数 (pydantic 模型构造较慢)
+BASELINE_MAX_USERS = 100000
+
+
+class _LegacyState:
+    """重构前的每用户状态布局: 三个输入模型、缓存的精力与疲劳模型及工作时间"""
+
+    def __init__(self, github: GitHubData, calendar: CalendarData, screen: ScreenTimeData, at: datetime):
+        self.github_data = github
+        self.calendar_data = calendar
+        self.screen_data = screen
+        self.work_start_time = at
+        self.last_activity_time = at
+        self.continuous_work_hours = 0.0
+        self.cached_energy = EnergyState.from_value(50.0)
+        self.cached_fatigue = FatigueIndex.from_value(50.0)
+        self.cached_version = 1
+
+
+def _fill_compact(count: int, rng: random.Random, start: datetime) -> Dict[str, CognitiveLoadAggregator]:
+    users: Dict[str, CognitiveLoadAggregator] = {}
+    ts = start.timestamp()
+    for i in range(count):
+        agg = users[f"user-{i}"] = CognitiveLoadAggregator()
+        agg.update_github_data(GitHubRecord(rng.randint(0, 20), rng.randint(0, 3), rng.randint(0, 5),
+                                            rng.randint(0, 3), 8.0, ts), at=start)
+        agg.update_calendar_data(CalendarRecord(rng.randint(0, 6), rng.uniform(0, 5), rng.randint(0, 3),
+                                                8.0, ts), at=start + timedelta(minutes=5))
+        agg.update_screen_data(ScreenTimeRecord(rng.uniform(0, 8), rng.randint(1, 4), rng.randint(0, 300),
+                                                8.0, ts), at=start + timedelta(minutes=10))
+    return users
+
+
+def _fill_baseline(count: int, rng: random.Random, start: datetime) -> Dict[str, _LegacyState]:
+    users: Dict[str, _LegacyState] = {}
+    for i in range(count):
+        users[f"user-{i}"] = _LegacyState(
+            GitHubData(commits_count=rng.randint(0, 20), pull_requests=rng.randint(0, 3),
+                       code_reviews=rng.randint(0, 5), issues_resolved=rng.randint(0, 3),
+                       period_hours=8, timestamp=start),
+            CalendarData(meetings_count=rng.randint(0, 6), total_meeting_hours=rng.uniform(0, 5),
+                         back_to_back_meetings=rng.randint(0, 3), period_hours=8, timestamp=start),
+            ScreenTimeData(active_hours=rng.uniform(0, 8), continuous_sessions=rng.randint(1, 4),
+                           app_switches=rng.randint(0, 300), period_hours=8, timestamp=start),
+            start
+        )
+    return users
+
+
+def _fill_registry(count: int, rng: random.Random, start: datetime, teams: int) -> None:
+    from ..services.registry import registry
+
+    ts = start.timestamp()
+    for i in range(count):
+        user_id = f"user-{i}"
+        agg = registry.get_or_create(user_id, f"team-{i % teams}")
+        agg.update_github_data(GitHubRecord(rng.randint(0, 20), rng.randint(0, 3), rng.randint(0, 5),
+                                            rng.randint(0, 3), 8.0, ts), at=start)
+        agg.update_calendar_data(CalendarRecord(rng.randint(0, 6), rng.uniform(0, 5), rng.randint(0, 3),
+                                                8.0, ts), at=start + timedelta(minutes=5))
+        agg.update_screen_data(ScreenTimeRecord(rng.uniform(0, 8), rng.randint(1, 4), rng.randint(0, 300),
+                                                8.0, ts), at=start + timedelta(minutes=10))
+        registry.commit(user_id)
+
+
+def _clear_registry(count: int) -> None:
+    from ..services.registry import registry
+
+    for i in range(count):
+        registry.remove(f"user-{i}")
+
+
+def measure(fill: Callable[[], object], count: int) -> dict:
+    """运行 fill 构建 count 个用户的状态，返回保留的内存占用"""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    retained = fill()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+
+    used = current - baseline
+    return {
+        "users": count,
+        "bytes_per_user": round(used / count, 1),
+        "total_mb": round(used / 1024 / 1024, 1),
+        "peak_mb": round((peak - baseline) / 1024 / 1024, 1),
+        "seconds": round(elapsed, 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="测量每个用户的常驻状态内存占用")
+    parser.add_argument("--users", type=int, nargs="+", default=[10000, 100000, 1000000], help="用户数 (可多个)")
+    parser.add_argument("--registry", action="store_true", help="经由注册表写入并提交，计入监听器维护的数据")
+    parser.add_argument("--teams", type=int, default=100, help="--registry 模式下的团队数")
+    parser.add_argument("--baseline", action="store_true", help="同时测量重构前布局的对照组")
+    parser.add_argument("--baseline-max", type=int, default=BASELINE_MAX_USERS, help="对照组的最大用户数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args(argv)
+
+    if args.registry:
+        # 在测量前导入应用，注册全部状态监听器
+        importlib.import_module("main")
+
+    start = datetime(2024, 1, 1, 9, 0)
+    results = []
+    for count in args.users:
+        rng = random.Random(args.seed)
+        if args.registry:
+            entry = {"mode": "registry", **measure(lambda: _fill_registry(count, rng, start, args.teams), count)}
+            _clear_registry(count)
+        else:
+            entry = {"mode": "aggregator", **measure(lambda: _fill_compact(count, rng, start), count)}
+        results.append(entry)
+
+        if args.baseline and count <= args.baseline_max:
+            rng = random.Random(args.seed)
+            baseline = measure(lambda: _fill_baseline(count, rng, start), count)
+            results.append({"mode": "baseline", **baseline})
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
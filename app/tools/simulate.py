@@ -0,0 +1,279 @@
+"""
+模拟工具 - 以加速时间驱动合成用户群体通过真实的聚合器与调度器
+
+每个模拟步长内，为每个在岗用户按其活动画像生成 GitHub、日历与屏幕数据，
+依次调用聚合器更新、注册表提交 (触发团队汇总监听器)，
+并在状态危险时像数据输入接口一样触发干预。模拟使用私有的注册表、团队汇总与调度器，
+不注册历史等全局监听器，合成数据不会写入精力历史文件或影响全局状态。时间由 ManualClock 推进，
+一个工作日可在数秒内跑完，用于在新组织上线前估算部署规模。
+
+报告包括吞吐量 (不含 HTTP 开销)、内存占用、干预次数及最终的组织汇总。
+
+用法:
+    python -m app.tools.simulate --users 5000 --teams 50 --hours 9 --step-minutes 15 --profile mixed
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import resource
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from ..core import clock
+from ..core.clock import ManualClock
+from ..models.data_input import GitHubData, CalendarData, ScreenTimeData
+from ..models.intervention import InterventionType
+from ..services.aggregator import CognitiveLoadAggregator
+from ..services.registry import UserRegistry
+from ..services.rollup import TeamRollupService
+from ..services.scheduler import InterventionScheduler
+
+
+class ActivityProfile(NamedTuple):
+    """活动画像 (速率均为每小时)"""
+    name: str
+    commits_per_hour: float
+    pull_requests_per_hour: float
+    reviews_per_hour: float
+    issues_per_hour: float
+    meeting_ratio: float          # 会议时间占比
+    back_to_back_ratio: float     # 会议之间无间隔的概率
+    screen_ratio: float           # 屏幕活跃时间占比
+    switches_per_hour: float
+    break_probability: float      # 每个步长离开休息的概率
+
+
+PROFILES: Dict[str, ActivityProfile] = {
+    profile.name: profile
+    for profile in (
+        ActivityProfile("light", 0.3, 0.03, 0.05, 0.05, 0.10, 0.10, 0.40, 20, 0.15),
+        ActivityProfile("balanced", 0.8, 0.10, 0.20, 0.10, 0.25, 0.20, 0.60, 40, 0.08),
+        ActivityProfile("meeting_heavy", 0.3, 0.05, 0.15, 0.05, 0.60, 0.50, 0.70, 60, 0.05),
+        ActivityProfile("crunch", 2.0, 0.20, 0.30, 0.20, 0.20, 0.30, 0.90, 80, 0.02),
+    )
+}
+
+# mixed 画像下各画像的占比
+MIXED_WEIGHTS = {"light": 0.2, "balanced": 0.5, "meeting_heavy": 0.2, "crunch": 0.1}
+
+
+class SimulationConfig(NamedTuple):
+    """模拟参数"""
+    users: int = 1000
+    teams: int = 10
+    hours: float = 9.0
+    step_minutes: float = 15.0
+    profile: str = "mixed"
+    seed: int = 42
+    start: Optional[datetime] = None
+    trace_memory: bool = False
+
+
+class SimulationReport(NamedTuple):
+    """模拟报告"""
+    users: int
+    teams: int
+    profiles: Dict[str, int]
+    simulated_hours: float
+    steps: int
+    updates: int
+    wall_seconds: float
+    updates_per_second: float
+    speedup: float
+    interventions: int
+    users_intervened: int
+    peak_rss_mb: float
+    traced_peak_mb: Optional[float]
+    average_energy: float
+    average_fatigue: float
+    critical_count: int
+    energy_distribution: Dict[str, int]
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """泊松采样 (Knuth 算法，均值较大时用正态近似)"""
+    if mean <= 0:
+        return 0
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit = math.exp(-mean)
+    count, product = 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def _generate(rng: random.Random, profile: ActivityProfile, hours: float):
+    """按画像生成一个步长的三类数据"""
+    github = GitHubData(
+        commits_count=_poisson(rng, profile.commits_per_hour * hours),
+        pull_requests=_poisson(rng, profile.pull_requests_per_hour * hours),
+        code_reviews=_poisson(rng, profile.reviews_per_hour * hours),
+        issues_resolved=_poisson(rng, profile.issues_per_hour * hours),
+        period_hours=hours
+    )
+
+    meeting_hours = min(hours, hours * profile.meeting_ratio * rng.uniform(0.5, 1.5))
+    meetings = math.ceil(meeting_hours / 0.5) if meeting_hours > 0.05 else 0
+    back_to_back = sum(1 for _ in range(max(0, meetings - 1)) if rng.random() < profile.back_to_back_ratio)
+    calendar = CalendarData(
+        meetings_count=meetings,
+        total_meeting_hours=meeting_hours if meetings else 0.0,
+        back_to_back_meetings=back_to_back,
+        period_hours=hours
+    )
+
+    screen = ScreenTimeData(
+        active_hours=min(hours, hours * profile.screen_ratio * rng.uniform(0.8, 1.2)),
+        app_switches=_poisson(rng, profile.switches_per_hour * hours),
+        period_hours=hours
+    )
+    return github, calendar, screen
+
+
+def _assign_profiles(rng: random.Random, users: int, profile: str) -> List[ActivityProfile]:
+    if profile != "mixed":
+        return [PROFILES[profile]] * users
+    names = list(MIXED_WEIGHTS)
+    weights = [MIXED_WEIGHTS[name] for name in names]
+    return [PROFILES[name] for name in rng.choices(names, weights=weights, k=users)]
+
+
+async def run_simulation(config: SimulationConfig) -> SimulationReport:
+    """运行模拟 (使用私有的注册表、团队汇总与调度器)"""
+    rng = random.Random(config.seed)
+    start = config.start or datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    manual = ManualClock(start)
+    step = timedelta(minutes=config.step_minutes)
+    step_hours = config.step_minutes / 60
+    steps = max(1, int(config.hours * 60 // config.step_minutes))
+
+    registry = UserRegistry(CognitiveLoadAggregator())
+    rollups = TeamRollupService()
+    registry.add_listener(rollups.on_state_change)
+    scheduler = InterventionScheduler(registry)
+
+    user_ids = [f"sim-{i:06d}" for i in range(config.users)]
+    team_ids = [f"team-{i % max(1, config.teams):04d}" for i in range(config.users)]
+    profiles = _assign_profiles(rng, config.users, config.profile)
+
+    if config.trace_memory:
+        tracemalloc.start()
+    updates = 0
+    interventions = 0
+    intervened = set()
+
+    with clock.use_clock(manual):
+        for user_id, team_id in zip(user_ids, team_ids):
+            registry.get_or_create(user_id, team_id)
+
+        started = time.perf_counter()
+        for _ in range(steps):
+            manual.advance(step)
+            now = manual.now()
+            for user_id, profile in zip(user_ids, profiles):
+                if rng.random() < profile.break_probability:
+                    continue
+                github, calendar, screen = _generate(rng, profile, step_hours)
+                agg = registry.get(user_id)
+                agg.update_github_data(github, at=now)
+                agg.update_calendar_data(calendar, at=now)
+                agg.update_screen_data(screen, at=now)
+                updates += 3
+                state = registry.commit(user_id)
+                if state.critical:
+                    event = await scheduler.trigger_intervention(
+                        InterventionType.REST_REMINDER,
+                        force=True,
+                        user_id=user_id
+                    )
+                    if event.success:
+                        interventions += 1
+                        intervened.add(user_id)
+        wall = time.perf_counter() - started
+
+    traced_peak = None
+    if config.trace_memory:
+        traced_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    org = rollups.get_org_status()
+    mix: Dict[str, int] = {}
+    for profile in profiles:
+        mix[profile.name] = mix.get(profile.name, 0) + 1
+    simulated_seconds = steps * step.total_seconds()
+    return SimulationReport(
+        users=config.users,
+        teams=config.teams,
+        profiles=mix,
+        simulated_hours=simulated_seconds / 3600,
+        steps=steps,
+        updates=updates,
+        wall_seconds=wall,
+        updates_per_second=updates / wall if wall > 0 else 0.0,
+        speedup=simulated_seconds / wall if wall > 0 else 0.0,
+        interventions=interventions,
+        users_intervened=len(intervened),
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        traced_peak_mb=traced_peak,
+        average_energy=org.average_energy,
+        average_fatigue=org.average_fatigue,
+        critical_count=org.critical_count,
+        energy_distribution={level.value: count for level, count in org.energy_distribution.items()}
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="以加速时间模拟合成用户群体，评估吞吐量、内存与干预次数")
+    parser.add_argument("--users", type=int, default=1000, help="用户数量")
+    parser.add_argument("--teams", type=int, default=10, help="团队数量")
+    parser.add_argument("--hours", type=float, default=9.0, help="模拟时长(小时)")
+    parser.add_argument("--step-minutes", type=float, default=15.0, help="模拟步长(分钟)，超过 30 分钟会被视为休息")
+    parser.add_argument("--profile", choices=["mixed", *PROFILES], default="mixed", help="活动画像")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="模拟开始时间 (默认今天 09:00)")
+    parser.add_argument("--trace-memory", action="store_true", help="使用 tracemalloc 统计 Python 内存峰值 (较慢)")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    args = parser.parse_args(argv)
+
+    if args.users <= 0 or args.teams <= 0 or args.hours <= 0 or args.step_minutes <= 0:
+        parser.error("用户数、团队数、时长与步长必须为正数")
+
+    report = asyncio.run(run_simulation(SimulationConfig(
+        users=args.users,
+        teams=args.teams,
+        hours=args.hours,
+        step_minutes=args.step_minutes,
+        profile=args.profile,
+        seed=args.seed,
+        start=args.start,
+        trace_memory=args.trace_memory
+    )))
+
+    if args.json:
+        print(json.dumps(report._asdict(), ensure_ascii=False, indent=2))
+        return 0
+
+    print(
+        f"✅ 模拟完成: {report.users} 个用户 / {report.teams} 个团队, "
+        f"模拟 {report.simulated_hours:.1f} 小时 ({report.steps} 步)\n"
+        f"   画像分布: {report.profiles}\n"
+        f"   吞吐量: {report.updates} 次更新, 耗时 {report.wall_seconds:.2f}s "
+        f"({report.updates_per_second:,.0f} 次/秒, 加速 {report.speedup:,.0f} 倍)\n"
+        f"   内存: 峰值 RSS {report.peak_rss_mb:.1f} MB"
+        + (f", Python 分配峰值 {report.traced_peak_mb:.1f} MB" if report.traced_peak_mb is not None else "") + "\n"
+        f"   干预: {report.interventions} 次, 涉及 {report.users_intervened} 个用户\n"
+        f"   组织汇总: 平均精力 {report.average_energy:.1f}, 平均疲劳 {report.average_fatigue:.1f}, "
+        f"危险 {report.critical_count} 人, 精力分布 {report.energy_distribution}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,8 +4,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.routers import data_router, energy_router, intervention_router
+from app.middleware import AdmissionMiddleware, DecompressionMiddleware, TracingMiddleware
+from app.routers import (
+    data_router,
+    energy_router,
+    intervention_router,
+    team_router,
+    admin_router,
+    export_router,
+    connector_router,
+    activity_router,
+    user_router,
+)
+from app.services.activity import activity
+from app.services.connectors import connectors
+from app.services.history import history
+from app.services.registry import registry
+from app.services.scoring import scoring
 from app.services.scheduler import scheduler
+from app.services.snapshot import snapshots
 
 
 @asynccontextmanager
@@ -13,8 +30,24 @@ async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时
     print(f"🚀 {settings.app_name} v{settings.app_version} 启动中...")
+    restored = snapshots.restore()
+    if restored:
+        print(f"♻️ 已从快照恢复 {restored} 个用户")
+    scoring.start()
+    registry.start()
+    history.start()
+    snapshots.start()
+    connectors.start()
+    activity.start()
+    scheduler.start()
     yield
     # 关闭时
+    await connectors.stop()
+    await activity.stop()
+    await snapshots.stop()
+    await history.stop()
+    await scoring.stop()
+    await registry.stop()
     await scheduler.close()
     print(f"👋 {settings.app_name} 已关闭")
 
@@ -38,11 +71,19 @@ app = FastAPI(
 - 日历会议数据 (会议数量、时长)
 - 屏幕使用时间 (活跃时间、连续使用)
 
+数据既可由外部推送到数据输入接口，也可注册连接器由服务按计划拉取
+
 ### API 分组
 
 - **数据输入**: 提交各类数据源信息
 - **精力状态**: 查询精力槽和疲劳指数
 - **干预调度**: 管理 Webhook 和触发干预
+- **团队汇总**: 查询团队与组织的增量汇总状态
+- **用户索引**: 按精力/疲劳等级即时列出处于特定状态的用户
+- **活动事件**: 接收原始活动事件并增量折叠为滚动计数器
+- **数据连接器**: 按计划增量拉取 GitHub、日历与屏幕使用数据
+- **数据导出**: 流式导出干预事件与精力历史
+- **系统管理**: 准入控制、评分配置热更新、请求追踪与 CPU 剖析
     """,
     version=settings.app_version,
     lifespan=lifespan,
@@ -59,10 +100,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 请求解压中间件 (透明解压 gzip/zstd 编码的写入请求)
+app.add_middleware(DecompressionMiddleware)
+
+# 请求追踪中间件 (位于准入控制之内，只追踪被接受的请求)
+app.add_middleware(TracingMiddleware)
+
+# 准入控制中间件 (最外层，在解析请求之前拒绝超额写入)
+app.add_middleware(AdmissionMiddleware)
+
 # 注册路由
 app.include_router(data_router)
 app.include_router(energy_router)
 app.include_router(intervention_router)
+app.include_router(team_router)
+app.include_router(admin_router)
+app.include_router(export_router)
+app.include_router(connector_router)
+app.include_router(activity_router)
+app.include_router(user_router)
 
 
 @app.get("/", tags=["健康检查"])
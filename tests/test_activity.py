@@ -0,0 +1,59 @@
+"""原始活动事件测试"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.clock import ManualClock, use_clock
+from app.models.activity import ActivityEvent, ActivityEventType
+from app.models.data_input import GitHubData
+from app.services.activity import ActivityIngestor
+from app.services.registry import registry
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def _ingest(ingestor: ActivityIngestor, events) -> None:
+    with use_clock(ManualClock(NOW)):
+        ingestor.submit(events)
+        asyncio.run(ingestor.drain())
+
+
+def test_events_far_ahead_of_server_time_are_dropped():
+    user_id = "activity-future-user"
+    ingestor = ActivityIngestor()
+    try:
+        _ingest(ingestor, [
+            ActivityEvent(type=ActivityEventType.HEARTBEAT, user_id=user_id, timestamp=NOW - timedelta(minutes=1)),
+            ActivityEvent(type=ActivityEventType.HEARTBEAT, user_id=user_id, timestamp=datetime(5000, 1, 1)),
+        ])
+
+        stats = ingestor.get_stats()
+        assert stats["future_dropped"] == 1
+        assert stats["processed"] == 1
+        with use_clock(ManualClock(NOW)):
+            assert ingestor.get_intensity(user_id).last_event_at == NOW - timedelta(minutes=1)
+    finally:
+        registry.remove(user_id)
+
+
+def test_raw_events_keep_loads_from_sources_they_do_not_cover():
+    user_id = "activity-pushed-user"
+    ingestor = ActivityIngestor()
+    try:
+        with use_clock(ManualClock(NOW - timedelta(minutes=5))):
+            agg = registry.get_or_create(user_id)
+            agg.update_github_data(GitHubData(commits_count=20, pull_requests=3, code_reviews=5, period_hours=1))
+            pushed = registry.commit(user_id)
+        assert agg.dump_state().github_load == 100
+
+        _ingest(ingestor, [ActivityEvent(type=ActivityEventType.HEARTBEAT, user_id=user_id, timestamp=NOW)])
+
+        state = agg.dump_state()
+        assert state.github_load == 100
+        assert state.screen_load is not None
+        assert registry.get_state(user_id).energy <= pushed.energy
+
+        # 窗口内出现 GitHub 类事件后才由滚动计数器接管该数据源
+        _ingest(ingestor, [ActivityEvent(type=ActivityEventType.COMMIT, user_id=user_id, timestamp=NOW)])
+        assert agg.dump_state().github_load < 100
+    finally:
+        registry.remove(user_id)
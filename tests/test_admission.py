@@ -0,0 +1,40 @@
+"""准入控制中间件测试"""
+import asyncio
+
+from app.middleware.admission import AdmissionMiddleware
+from app.services.admission import AdmissionController
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _status(middleware: AdmissionMiddleware, path: str, method: str = "GET") -> int:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"", "headers": []}
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"]
+
+
+def test_health_docs_export_and_admin_reads_do_not_take_read_slots():
+    controller = AdmissionController(max_concurrency=1, read_reserved=1)
+    middleware = AdmissionMiddleware(_ok_app, controller)
+    # 一个长时间运行的请求占满全部槽位
+    assert controller.admit_read().admitted
+
+    assert _status(middleware, "/api/energy") == 503
+    for path in ("/health", "/", "/docs", "/openapi.json", "/api/export/energy", "/api/admin/profile"):
+        assert _status(middleware, path) == 200, path
+    assert controller.get_stats()["in_flight_read"] == 1
+
+    controller.release_read()
+    assert _status(middleware, "/api/energy") == 200
+    assert controller.get_stats()["in_flight_read"] == 0
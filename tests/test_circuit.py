@@ -0,0 +1,42 @@
+"""Webhook 熔断器测试"""
+import asyncio
+
+from app.core.clock import ManualClock, use_clock
+from app.models.intervention import CircuitState, InterventionEvent, InterventionType, WebhookConfig
+from app.services.circuit import CircuitBreaker
+from app.services.payload import RenderedEvent
+from app.services.scheduler import InterventionScheduler
+
+
+class _BrokenRender(RenderedEvent):
+    """渲染负载时抛出非网络异常"""
+
+    def body(self, template) -> bytes:
+        raise TypeError("unserializable payload")
+
+
+def test_half_open_probe_with_unexpected_error_releases_its_slot():
+    with use_clock(ManualClock()) as manual:
+        _probe_with_broken_payload(manual)
+
+
+def _probe_with_broken_payload(manual: ManualClock) -> None:
+    scheduler = InterventionScheduler()
+    webhook = scheduler.register_webhook(WebhookConfig(name="hook", url="http://127.0.0.1:9/hook"))
+    breaker = scheduler._breakers[webhook.id] = CircuitBreaker(
+        failure_threshold=1, recovery_seconds=10, half_open_max_calls=1
+    )
+    breaker.record_failure("boom")
+    manual.advance(11)
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    rendered = _BrokenRender(InterventionEvent(
+        type=InterventionType.REST_REMINDER, fatigue_at_trigger=80.0, energy_at_trigger=20.0
+    ))
+    assert asyncio.run(scheduler._send_webhook(webhook, rendered)) is False
+
+    # 探测失败重新打开，之后的探测间隔过后仍可再次探测
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.last_error == "TypeError: unserializable payload"
+    manual.advance(11)
+    assert breaker.allow_request()
@@ -0,0 +1,95 @@
+"""二进制记录编解码测试"""
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.clock import ManualClock, use_clock
+from app.models.data_input import ScreenTimeData
+from app.services.aggregator import CognitiveLoadAggregator
+from app.services.codec import (
+    CalendarRecord,
+    ScreenTimeRecord,
+    decode_batch,
+    decode_records,
+    encode_records,
+)
+
+START = datetime(2024, 1, 1, 9, 0)
+NOW = START + timedelta(hours=2)
+
+
+def _screen(minutes: int, active_hours: float = 2.0, sessions: int = 2) -> ScreenTimeRecord:
+    at = (START + timedelta(minutes=minutes)).timestamp()
+    return ScreenTimeRecord(active_hours, sessions, 50, 8.0, at)
+
+
+def test_batch_update_matches_sequential_updates():
+    # 包含超过 30 分钟的间隔与乱序时间戳
+    records = [_screen(m, active_hours=m / 60) for m in (0, 10, 20, 70, 65, 90)]
+    with use_clock(ManualClock(NOW)):
+        batch = decode_batch("screen", encode_records("screen", records))
+        decoded = decode_records("screen", encode_records("screen", records))
+
+    bulk = CognitiveLoadAggregator()
+    bulk.update_batch("screen", batch.last, batch.timestamps)
+    sequential = CognitiveLoadAggregator()
+    for record in decoded:
+        sequential.update_screen_data(record, at=record.timestamp)
+
+    assert batch.count == len(records)
+    assert bulk.dump_state() == sequential.dump_state()
+
+
+def test_out_of_range_record_is_reported_by_index():
+    records = [_screen(0), _screen(10), _screen(20, sessions=0)]
+    with pytest.raises(ValueError, match="第 2 条 screen 记录"):
+        decode_batch("screen", encode_records("screen", records))
+
+
+@pytest.mark.parametrize("value", [math.nan, math.inf, -1.0])
+def test_non_finite_or_negative_hours_are_rejected(value):
+    records = [CalendarRecord(1, 1.0, 0, 8.0, START.timestamp()), CalendarRecord(1, value, 0, 8.0, 0.0)]
+    with pytest.raises(ValueError, match="第 1 条 calendar 记录"):
+        decode_batch("calendar", encode_records("calendar", records))
+    with pytest.raises(ValueError, match="第 0 条 calendar 记录"):
+        decode_batch("calendar", encode_records("calendar", records[1:]))
+
+
+def test_truncated_body_is_rejected():
+    body = encode_records("screen", [_screen(0)])
+    with pytest.raises(ValueError, match="整数倍"):
+        decode_batch("screen", body[:-1])
+
+
+def test_zero_timestamp_uses_server_time():
+    now = datetime(2024, 1, 1, 12, 0)
+    records = [_screen(0), ScreenTimeRecord(3.0, 1, 10, 8.0, 0.0)]
+    with use_clock(ManualClock(now)):
+        batch = decode_batch("screen", encode_records("screen", records))
+
+    assert batch.timestamps == [records[0].ts, now.timestamp()]
+    assert batch.last.timestamp == now
+    assert batch.last.screen_intensity == ScreenTimeData(
+        active_hours=3.0, continuous_sessions=1, app_switches=10, period_hours=8, timestamp=now
+    ).screen_intensity
+
+
+@pytest.mark.parametrize("ts", [
+    (NOW + timedelta(minutes=10)).timestamp(),
+    (NOW - timedelta(days=8)).timestamp(),
+    9.9e10,  # 约 5000 年后，会让工作时长停滞在该时刻
+], ids=["ahead", "too_old", "far_future"])
+def test_timestamps_outside_the_server_window_are_rejected(ts):
+    body = encode_records("screen", [_screen(0), ScreenTimeRecord(2.0, 1, 10, 8.0, ts)])
+    with use_clock(ManualClock(NOW)):
+        with pytest.raises(ValueError, match="第 1 条 screen 记录的时间戳"):
+            decode_batch("screen", body)
+        with pytest.raises(ValueError, match="第 1 条 screen 记录的时间戳"):
+            decode_records("screen", body)
+
+
+def test_small_clock_skew_is_accepted():
+    records = [_screen(0), ScreenTimeRecord(2.0, 1, 10, 8.0, (NOW + timedelta(seconds=30)).timestamp())]
+    with use_clock(ManualClock(NOW)):
+        assert decode_batch("screen", encode_records("screen", records)).count == 2
@@ -0,0 +1,234 @@
+"""数据连接器测试 (针对本地桩 HTTP 服务)"""
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import pytest
+
+from app.connectors import CalendarConnector, GitHubEventsConnector, ScreenTimeConnector
+from app.models.connector import ConnectorConfig, ConnectorKind
+from app.services.connectors import ConnectorManager
+from app.services.registry import registry
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+class StubRequest(NamedTuple):
+    params: Dict[str, str]
+    headers: Dict[str, str]
+
+
+class StubResponse(NamedTuple):
+    status: int
+    body: object = None
+    headers: Optional[Dict[str, str]] = None
+
+
+Handler = Callable[[StubRequest], StubResponse]
+
+
+class StubServer:
+    """按顺序返回预设响应的本地 HTTP 服务，并记录收到的请求"""
+
+    def __init__(self):
+        self.requests: List[StubRequest] = []
+        self._responses: List[Handler] = []
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                request = StubRequest(
+                    dict(parse_qsl(urlsplit(self.path).query)),
+                    {key.lower(): value for key, value in self.headers.items()}
+                )
+                stub.requests.append(request)
+                response = stub._responses.pop(0)(request) if stub._responses else StubResponse(500)
+                body = json.dumps(response.body).encode() if response.body is not None else b""
+                self.send_response(response.status)
+                for key, value in (response.headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/items"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.01,), daemon=True)
+        self._thread.start()
+
+    def respond(self, *responses) -> None:
+        """追加预设响应 (StubResponse 或根据请求生成响应的函数)"""
+        for response in responses:
+            self._responses.append(response if callable(response) else (lambda _, r=response: r))
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def _poll(connector, now: datetime = NOW):
+    async def run():
+        async with httpx.AsyncClient() as client:
+            return await connector.poll(client, now)
+    return asyncio.run(run())
+
+
+def _event(event_id: str, start: str, end: str, status: str = "confirmed") -> dict:
+    return {"id": event_id, "status": status, "start": {"dateTime": start}, "end": {"dateTime": end}}
+
+
+def _calendar(stub: StubServer) -> CalendarConnector:
+    return CalendarConnector(ConnectorConfig(kind=ConnectorKind.CALENDAR, url=stub.url, window_hours=8))
+
+
+def test_calendar_time_parameters_are_rfc3339_with_utc_offset(stub):
+    stub.respond(StubResponse(200, {"items": []}))
+    connector = _calendar(stub)
+    _poll(connector)
+
+    time_min = stub.requests[0].params["timeMin"]
+    assert time_min.endswith("Z")
+    parsed = datetime.fromisoformat(time_min)
+    assert parsed.tzinfo is not None
+    assert parsed == datetime(2024, 1, 1, 4, 0).astimezone(timezone.utc)
+    # 未提供同步令牌时以 UTC 时间作为 updatedMin 游标
+    assert datetime.fromisoformat(connector.cursor).tzinfo is not None
+
+
+def test_calendar_expired_sync_token_triggers_full_resync(stub):
+    stub.respond(
+        StubResponse(200, {
+            "items": [_event("a", "2024-01-01T09:00:00", "2024-01-01T10:00:00"),
+                      _event("b", "2024-01-01T10:00:00", "2024-01-01T11:00:00")],
+            "nextSyncToken": "sync-1",
+        }),
+        StubResponse(410, {"error": {"code": 410, "message": "Sync token is no longer valid"}}),
+        StubResponse(200, {
+            "items": [_event("c", "2024-01-01T10:30:00", "2024-01-01T11:00:00")],
+            "nextSyncToken": "sync-2",
+        }),
+    )
+    connector = _calendar(stub)
+    assert _poll(connector).meetings_count == 2
+
+    data = _poll(connector)
+    assert [sorted(r.params) for r in stub.requests[1:]] == [
+        ["syncToken"], ["singleEvents", "timeMin"]
+    ]
+    assert stub.requests[1].params["syncToken"] == "sync-1"
+    assert connector.cursor == "sync-2"
+    # 完整同步替换了旧缓存
+    assert data.meetings_count == 1
+    assert data.total_meeting_hours == 0.5
+    assert connector.consecutive_failures == 0
+
+
+def test_calendar_gone_without_cursor_is_an_error(stub):
+    stub.respond(StubResponse(410, {}))
+    with pytest.raises(httpx.HTTPStatusError):
+        _poll(_calendar(stub))
+
+
+def test_validators_and_cursor_are_committed_only_after_every_page(stub):
+    page_1 = StubResponse(
+        200,
+        {"items": [_event("a", "2024-01-01T09:00:00", "2024-01-01T10:00:00")], "nextPageToken": "p2"},
+        {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 11:00:00 GMT"}
+    )
+    page_2 = StubResponse(
+        200,
+        {"items": [_event("b", "2024-01-01T10:00:00", "2024-01-01T11:00:00")], "nextSyncToken": "sync-1"}
+    )
+
+    def not_modified_if_validated(request: StubRequest) -> StubResponse:
+        if request.headers.get("if-none-match") == '"v1"':
+            return StubResponse(304)
+        return page_1
+
+    stub.respond(page_1, StubResponse(500, {}), not_modified_if_validated, page_2)
+    connector = _calendar(stub)
+    with pytest.raises(httpx.HTTPStatusError):
+        _poll(connector)
+    assert connector.etag is None
+    assert connector.last_modified is None
+    assert connector.cursor is None
+
+    data = _poll(connector)
+    assert "if-none-match" not in stub.requests[2].headers
+    assert stub.requests[3].params["pageToken"] == "p2"
+    assert data.meetings_count == 2
+    assert connector.etag == '"v1"'
+    assert connector.cursor == "sync-1"
+
+
+def test_github_conditional_requests_reuse_the_cache(stub):
+    events = [
+        {"id": "2", "type": "PullRequestEvent", "created_at": "2024-01-01T10:00:00Z",
+         "payload": {"action": "opened"}},
+        {"id": "1", "type": "PushEvent", "created_at": "2024-01-01T09:00:00Z", "payload": {"size": 3}},
+    ]
+    stub.respond(
+        StubResponse(200, events, {"ETag": '"e1"', "X-Poll-Interval": "120"}),
+        lambda request: StubResponse(304 if request.headers.get("if-none-match") == '"e1"' else 200, events),
+    )
+    connector = GitHubEventsConnector(ConnectorConfig(
+        kind=ConnectorKind.GITHUB, url=stub.url, interval_seconds=60, window_hours=24
+    ))
+    now = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    first = _poll(connector, now)
+    second = _poll(connector, now)
+
+    assert (first.commits_count, first.pull_requests) == (3, 1)
+    assert second == first
+    assert connector.cursor == "2"
+    assert connector.not_modified == 1
+    assert connector.poll_interval == 120
+
+
+def test_screen_since_cursor_uses_utc(stub):
+    stub.respond(StubResponse(200, {"items": [
+        {"start": "2024-01-01T09:00:00", "end": "2024-01-01T10:30:00", "app": "ide"},
+    ]}))
+    connector = ScreenTimeConnector(ConnectorConfig(kind=ConnectorKind.SCREEN, url=stub.url, window_hours=8))
+    data = _poll(connector)
+
+    assert stub.requests[0].params["since"].endswith("Z")
+    assert data.active_hours == 1.5
+    assert connector.cursor == datetime(2024, 1, 1, 10, 30).astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def test_manager_poll_updates_the_user_aggregator(stub):
+    stub.respond(StubResponse(200, [
+        {"id": "1", "type": "PushEvent", "created_at": datetime.now(timezone.utc).isoformat(), "payload": {"size": 40}},
+    ]), StubResponse(500, {}))
+    manager = ConnectorManager()
+    config = manager.register(ConnectorConfig(
+        kind=ConnectorKind.GITHUB, url=stub.url, user_id="connector-test-user", window_hours=1
+    ))
+
+    async def run():
+        try:
+            return await manager.poll(config.id), await manager.poll(config.id)
+        finally:
+            await manager.stop()
+    ok, failed = asyncio.run(run())
+
+    assert ok.failures == 0
+    assert registry.get_state("connector-test-user").energy < 100
+    assert failed.failures == 1
+    assert failed.last_error.startswith("HTTPStatusError")
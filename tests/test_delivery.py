@@ -0,0 +1,54 @@
+"""干预投递通道测试"""
+import asyncio
+
+from app.models.intervention import InterventionType, WebhookConfig
+from app.services.scheduler import InterventionScheduler
+from app.services.tracing import Trace, tracer
+
+
+class _RecordingScheduler(InterventionScheduler):
+    """不发送网络请求，只记录投递时所在的追踪"""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    async def _send_webhook(self, webhook, rendered) -> bool:
+        self.seen.append(tracer.current())
+        return True
+
+
+def _trigger(scheduler: InterventionScheduler, trace, wait: bool):
+    token = tracer.activate(trace)
+    try:
+        return asyncio.create_task(scheduler.trigger_intervention(
+            InterventionType.LOCK_SCREEN, force=True, wait=wait
+        ))
+    finally:
+        tracer.deactivate(token)
+
+
+def test_lane_workers_record_webhook_spans_on_the_request_trace():
+    scheduler = _RecordingScheduler()
+    scheduler.register_webhook(WebhookConfig(
+        name="hook", url="http://127.0.0.1:9/hook", intervention_types=[InterventionType.LOCK_SCREEN]
+    ))
+    waited = Trace("POST", "/api/interventions/trigger")
+    queued = Trace("POST", "/api/interventions/trigger")
+
+    async def run():
+        scheduler.start()
+        try:
+            # 等待投递完成的请求，以及投递前已返回的请求
+            await _trigger(scheduler, waited, wait=True)
+            await _trigger(scheduler, queued, wait=False)
+            await _trigger(scheduler, None, wait=True)
+        finally:
+            await scheduler.close()
+    asyncio.run(run())
+
+    assert scheduler.seen == [waited, queued, None]
+    for trace in (waited, queued):
+        spans = [span for span in trace.spans if span.name == "webhook"]
+        assert len(spans) == 1
+        assert spans[0].attributes == {"webhook": "hook"}
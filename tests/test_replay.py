@@ -0,0 +1,117 @@
+"""离线回放工具测试"""
+import json
+from datetime import datetime
+
+from app.models.data_input import CalendarData, GitHubData
+from app.services.aggregator import CognitiveLoadAggregator
+from app.services.history import EnergyRecord
+from app.tools.replay import replay
+
+
+def _write_inputs(tmp_path):
+    github = tmp_path / "gh.ndjson"
+    github.write_text("\n".join(json.dumps(sample) for sample in [
+        {"user_id": "alice", "team_id": "core", "source": "github",
+         "timestamp": "2024-01-01T09:00:00", "commits_count": 4, "pull_requests": 1, "period_hours": 1},
+        {"user_id": "bob", "source": "github",
+         "timestamp": "2024-01-01T09:05:00", "commits_count": 2, "period_hours": 1},
+        {"user_id": "alice", "team_id": "core", "source": "github",
+         "timestamp": "2024-01-01T17:00:00", "commits_count": 10, "pull_requests": 2, "period_hours": 1},
+    ]) + "\n")
+    calendar = tmp_path / "cal.csv"
+    calendar.write_text(
+        "user_id,team_id,timestamp,meetings_count,total_meeting_hours,back_to_back_meetings,period_hours\n"
+        "alice,core,2024-01-01T09:10:00,1,0.5,0,1\n"
+        "alice,core,2024-01-01T09:20:00,2,1.0,1,1\n"
+    )
+    return [str(github), str(calendar)]
+
+
+def _live_state() -> CognitiveLoadAggregator:
+    """按事件时间顺序实时写入得到的 alice 状态"""
+    agg = CognitiveLoadAggregator()
+    agg.update_github_data(
+        GitHubData(commits_count=4, pull_requests=1, period_hours=1), at=datetime(2024, 1, 1, 9, 0))
+    agg.update_calendar_data(
+        CalendarData(meetings_count=1, total_meeting_hours=0.5, period_hours=1), at=datetime(2024, 1, 1, 9, 10))
+    agg.update_calendar_data(
+        CalendarData(meetings_count=2, total_meeting_hours=1.0, back_to_back_meetings=1, period_hours=1),
+        at=datetime(2024, 1, 1, 9, 20))
+    agg.update_github_data(
+        GitHubData(commits_count=10, pull_requests=2, period_hours=1), at=datetime(2024, 1, 1, 17, 0))
+    return agg
+
+
+def _read(path) -> list:
+    return [EnergyRecord.from_json(line) for line in path.read_text().splitlines()]
+
+
+def test_samples_from_multiple_files_are_replayed_in_event_time_order(tmp_path):
+    output = tmp_path / "history.ndjson"
+    stats = replay(_write_inputs(tmp_path), str(output), workers=1, default_source="calendar")
+
+    assert stats.samples == 5
+    assert stats.skipped == 0
+    assert stats.unordered == 0
+    records = _read(output)
+    timestamps = [record.timestamp for record in records]
+    assert timestamps == sorted(timestamps)
+
+    alice = [record for record in records if record.user_id == "alice"]
+    assert [record.timestamp.hour for record in alice] == [9, 9, 9, 17]
+    expected = _live_state().score()
+    assert alice[-1].energy == expected.energy
+    assert alice[-1].fatigue == expected.fatigue
+
+
+def test_partitioned_output_is_merged_in_time_order(tmp_path):
+    single = tmp_path / "single.ndjson"
+    merged = tmp_path / "merged.ndjson"
+    inputs = _write_inputs(tmp_path)
+    replay(inputs, str(single), workers=1, default_source="calendar")
+    replay(inputs, str(merged), workers=3, default_source="calendar")
+
+    records = _read(merged)
+    timestamps = [record.timestamp for record in records]
+    assert timestamps == sorted(timestamps)
+    key = lambda record: (record.timestamp, record.user_id)
+    assert sorted(records, key=key) == sorted(_read(single), key=key)
+
+
+def test_user_with_escaped_ndjson_id_lands_in_the_same_partition_as_csv(tmp_path):
+    user_id = "用户-ünï"
+    github = tmp_path / "gh.ndjson"
+    github.write_text(json.dumps({
+        "user_id": user_id, "source": "github", "timestamp": "2024-01-01T09:00:00",
+        "commits_count": 4, "period_hours": 1,
+    }) + "\n")
+    assert "\\u" in github.read_text()
+    calendar = tmp_path / "cal.csv"
+    calendar.write_text(
+        "user_id,timestamp,meetings_count,total_meeting_hours,period_hours\n"
+        f"{user_id},2024-01-01T09:10:00,2,1.0,1\n",
+        encoding="utf-8"
+    )
+
+    output = tmp_path / "history.ndjson"
+    stats = replay([str(github), str(calendar)], str(output), workers=4, default_source="calendar")
+
+    # 分区不一致时同一用户会在两个进程中各有一份状态
+    assert stats.users == 1
+    agg = CognitiveLoadAggregator()
+    agg.update_github_data(GitHubData(commits_count=4, period_hours=1), at=datetime(2024, 1, 1, 9, 0))
+    agg.update_calendar_data(
+        CalendarData(meetings_count=2, total_meeting_hours=1.0, period_hours=1), at=datetime(2024, 1, 1, 9, 10))
+    assert _read(output)[-1].energy == agg.score().energy
+
+
+def test_out_of_order_samples_within_a_file_are_counted(tmp_path):
+    github = tmp_path / "gh.ndjson"
+    github.write_text("\n".join(json.dumps({
+        "user_id": "carol", "source": "github", "timestamp": timestamp, "commits_count": 1, "period_hours": 1,
+    }) for timestamp in ("2024-01-01T10:00:00", "2024-01-01T09:00:00", "2024-01-01T11:00:00")) + "\n")
+
+    stats = replay([str(github)], str(tmp_path / "history.ndjson"), workers=1)
+
+    assert stats.samples == 3
+    assert stats.unordered == 1
@@ -0,0 +1,86 @@
+"""评分配置切换与重算测试"""
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+from app.models.data_input import ScreenTimeData
+from app.models.energy import EnergyLevel
+from app.models.scoring import ScoringConfigUpdate
+from app.routers.team import get_org_status
+from app.routers.user import list_users
+from app.services.registry import registry
+from app.services.rollup import rollups
+from app.services.scoring import default_config, initial_config, scoring
+
+USERS = [f"scoring-test-{i}" for i in range(5)]
+
+
+@pytest.fixture
+def users():
+    for user_id in USERS:
+        agg = registry.get_or_create(user_id, "scoring-team")
+        agg.update_screen_data(ScreenTimeData(active_hours=8, continuous_sessions=1, app_switches=400, period_hours=8))
+        registry.commit(user_id)
+    yield USERS
+    scoring.reset()
+    registry.refresh_stale()
+    for user_id in USERS:
+        registry.remove(user_id)
+
+
+def _screen_heavy() -> ScoringConfigUpdate:
+    return ScoringConfigUpdate(github_weight=0.0, calendar_weight=0.0, screen_weight=1.0)
+
+
+def test_config_switch_queues_every_user_and_aggregate_reads_report_staleness(users):
+    before = registry.get_state(users[0])
+    scoring.update(_screen_heavy())
+
+    assert registry.stale_count >= len(users)
+    stale = rollups.check_consistency("scoring-team")
+    assert not stale.consistent
+    assert stale.stale_users == registry.stale_count
+
+    # 汇总读取不在事件循环上重算，只返回已提交状态与待重算数量
+    pending = registry.stale_count
+    org = asyncio.run(get_org_status())
+    listed = asyncio.run(list_users(
+        energy_level=None, fatigue_level=None, critical=True, max_energy=None,
+        min_fatigue=None, team_id="scoring-team", order_by=None, limit=100
+    ))
+    assert registry.stale_count == pending
+    assert registry.get_state(users[0]) == before
+    assert org.scoring_version == listed.scoring_version == scoring.version
+    assert org.stale_users == listed.stale_users == pending
+
+    assert registry.refresh_stale() == 0
+    after = registry.get_state(users[0])
+    assert after.energy < before.energy
+    assert after.energy_level == EnergyLevel.CRITICAL
+    assert asyncio.run(get_org_status()).stale_users == 0
+    assert rollups.check_consistency("scoring-team").consistent
+
+
+def test_background_sweep_recomputes_in_batches(users):
+    async def run():
+        registry.start(batch=2, interval=0.01)
+        try:
+            scoring.update(_screen_heavy())
+            for _ in range(100):
+                if registry.stale_count == 0:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await registry.stop()
+    asyncio.run(run())
+
+    assert registry.stale_count == 0
+    assert all(not registry.get(user_id).stale for user_id in users)
+
+
+def test_invalid_settings_fall_back_to_defaults(capsys):
+    config = initial_config(Settings(github_weight=0.9, calendar_weight=0.9, screen_weight=0.9))
+
+    assert config == default_config()
+    assert "评分配置未通过校验" in capsys.readouterr().out
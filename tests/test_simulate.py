@@ -0,0 +1,28 @@
+"""负载模拟工具测试"""
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+from app.services.history import history
+from app.services.registry import registry
+from app.services.rollup import rollups
+from app.tools.simulate import SimulationConfig, run_simulation
+
+
+def test_simulation_does_not_touch_global_state_or_history_file(tmp_path, monkeypatch):
+    history_file = tmp_path / "history.ndjson"
+    monkeypatch.setattr(history, "path", Path(history_file))
+    users_before = len(registry)
+    org_before = rollups.get_org_status().member_count
+
+    report = asyncio.run(run_simulation(SimulationConfig(
+        users=20, teams=2, hours=2, step_minutes=15, profile="crunch", start=datetime(2024, 1, 1, 9, 0)
+    )))
+    history.close()
+
+    assert report.updates > 0
+    assert report.average_energy < 100
+    assert sum(report.energy_distribution.values()) == 20
+    assert len(registry) == users_before
+    assert rollups.get_org_status().member_count == org_before
+    assert not history_file.exists() or history_file.read_text() == ""
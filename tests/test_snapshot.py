@@ -0,0 +1,30 @@
+"""状态快照测试"""
+from app.models.data_input import GitHubData
+from app.services.aggregator import CognitiveLoadAggregator
+from app.services.registry import UserRegistry
+from app.services.scheduler import InterventionScheduler
+from app.services.snapshot import SnapshotService
+
+
+class _CorruptScheduler(InterventionScheduler):
+    """写出无法通过校验的 Webhook 配置"""
+
+    def dump_state(self) -> dict:
+        return {"webhooks": [{"name": "broken"}], "history": []}
+
+
+def test_invalid_scheduler_state_falls_back_without_losing_users(tmp_path):
+    users = UserRegistry(CognitiveLoadAggregator())
+    users.get_or_create("alice", "core").update_github_data(GitHubData(commits_count=5, period_hours=1))
+    users.commit("alice")
+    path = tmp_path / "state.snap"
+    path.write_bytes(SnapshotService(users, _CorruptScheduler(), str(path)).encode())
+
+    restored_users = UserRegistry(CognitiveLoadAggregator())
+    scheduler = InterventionScheduler()
+    service = SnapshotService(restored_users, scheduler, str(path))
+
+    assert service.restore() == 2
+    assert scheduler.dump_state() == {"webhooks": [], "history": []}
+    assert restored_users.get_state("alice") == users.get_state("alice")
+    assert restored_users.get("alice").score() == users.get("alice").score()
@@ -0,0 +1,43 @@
+"""用户等级索引测试"""
+from app.models.data_input import ScreenTimeData
+from app.models.energy import FatigueLevel
+from app.services.registry import registry
+from app.services.user_index import user_index
+
+TEAM = "index-test-team"
+
+
+def _submit(user_id: str, active_hours: float) -> None:
+    agg = registry.get_or_create(user_id, TEAM)
+    agg.update_screen_data(ScreenTimeData(
+        active_hours=active_hours, continuous_sessions=1, app_switches=0, period_hours=8
+    ))
+    registry.commit(user_id)
+
+
+def _listed(**filters) -> list:
+    return user_index.query(team_id=TEAM, limit=1000, **filters).users
+
+
+def test_index_follows_state_changes_and_reads_state_from_registry():
+    users = [f"index-test-{i}" for i in range(4)]
+    try:
+        for i, user_id in enumerate(users):
+            _submit(user_id, active_hours=i * 2.5)
+
+        listed = _listed()
+        assert [user_id for user_id, _ in listed] == users[::-1]
+        assert all(state is registry.get_state(user_id) for user_id, state in listed)
+
+        _submit(users[0], active_hours=8)
+        assert _listed()[0] == (users[0], registry.get_state(users[0]))
+        rested = {user_id for user_id, _ in _listed(fatigue_level=FatigueLevel.NONE)}
+        assert users[0] not in rested
+
+        registry.remove(users[1])
+        assert users[1] not in {user_id for user_id, _ in _listed()}
+        user_index.rebuild()
+        assert [user_id for user_id, _ in _listed()] == [users[0], users[3], users[2]]
+    finally:
+        for user_id in users:
+            registry.remove(user_id)